@@ -2,7 +2,7 @@
 API 라우트 정의
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from app.models.order import OrderData, OrderItem
 from app.models.user import UserData
 from app.core.database import Database
@@ -36,11 +36,22 @@ async def create_user(user: UserData):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def _etag_matches(if_none_match, etag):
+    """If-None-Match 헤더에 etag가 있는지 (약한 비교, "*" 포함)"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in [tag[2:] if tag.startswith("W/") else tag for tag in candidates]
+
 @router.get("/menu")
-async def get_menu():
-    """메뉴 목록 조회"""
+async def get_menu(request: Request):
+    """메뉴 목록 조회 - 메뉴가 바뀌지 않았으면 304 (ETag / If-None-Match)"""
     try:
-        menu_items = db.get_menu_items()
-        return {"menu": menu_items}
+        snapshot = db.menu_catalog.snapshot()
+        etag = f'"{snapshot.version}"'
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=snapshot.menu_json, media_type="application/json", headers=headers)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -19,21 +19,102 @@ CARD_IMG = os.path.join(ROOT_DIR, "app", "assets", "images", "Card.png")
 
 # 데이터베이스 경로
 DB_PATH = os.path.join(ROOT_DIR, "faces.db")
+MENU_DB_PATH = os.path.join(ROOT_DIR, "data", "Comfile_Coffee_DB.db")
+# 메뉴 카탈로그 변경 확인 주기 (초) - 확인은 PRAGMA data_version / ETag 비교만 함
+MENU_CHECK_INTERVAL = 2.0
+
+# 메뉴 이미지 (원본은 1~2MB PNG, 화면에는 build_menu_thumbnails.py로 만든 크기별 썸네일 사용)
+MENU_IMAGE_DIR = os.path.join(ROOT_DIR, "data", "menu_images_png")
+MENU_THUMB_DIR = os.path.join(ROOT_DIR, "data", "menu_thumbs")
+MENU_THUMB_SIZES = (96, 160, 320)
+# 메뉴 이미지 GPU 텍스처 캐시 최대 크기 (RGBA 기준)
+TEXTURE_CACHE_MAX_BYTES = 16 * 1024 * 1024
+# 스레드별 연결을 계속 열어두고 재사용 (WAL 모드, 쓰기는 전용 스레드 하나가 순서대로 처리)
+DB_BUSY_TIMEOUT = 5.0
+DB_STATEMENT_CACHE = 128
 
 # 얼굴 인식 설정
 FACE_RECOGNITION_TOLERANCE = 0.6
 FACE_RECOGNITION_MODEL = "hog"
+# 검출은 축소 영상에서 수행하고 인코딩은 원본 해상도에서 계산 (HOG 비용은 픽셀 수에 비례)
+FACE_DETECTION_SCALE = 0.5
+FACE_DETECTION_UPSAMPLE = 1
 SIMILARITY_THRESHOLD = 0.45
 REQUIRED_FRAMES = 7
 MAX_LOST_FRAMES = 2
 THRESHOLD = 0.8
 TRACKER_MAX_AGE = 90
 DELETE_TIMEOUT = 300
+# 추적 중 인코딩으로 본인 재확인 주기 (초) - 그 사이에는 DeepSORT 트랙 ID로만 확인
+TRACK_REVERIFY_INTERVAL = 10.0
 
 # 카메라 설정
 CAMERA_WIDTH = 640
 CAMERA_HEIGHT = 480
 CAMERA_FPS = 30
+# 카메라 소스: 장치 번호, 영상 파일 경로 또는 "synthetic" (카메라 없이 테스트)
+CAMERA_SOURCE = os.environ.get("KIOSK_CAMERA_SOURCE", "0")
+CAMERA_BUFFER_SIZE = 4
+# 화면별 프레임 구독 주기
+PREVIEW_FPS = 30
+TRACKING_FPS = 1
+
+# STT 설정
+# 스트리밍 모드: 말하는 도중 STT_STREAM_STEP초마다 구간을 인식해 중간 결과를 표시
+STT_STREAMING = True
+STT_STREAM_STEP = 1.0
+# 백엔드: "whisper"(openai-whisper), "faster-whisper"(CTranslate2 int8), "whisper-cpp"
+STT_BACKEND = os.environ.get("KIOSK_STT_BACKEND", "whisper")
+STT_MODEL_SIZE = os.environ.get("KIOSK_STT_MODEL_SIZE", "medium")
+STT_LANGUAGE = "ko"
+STT_CPU_THREADS = 4
+# 앱 시작 시 백그라운드에서 STT 모델 미리 로드
+STT_PRELOAD = True
+
+# TTS 설정
+# 합성된 음성은 (텍스트, 목소리, 속도, 백엔드) 키로 WAV 캐시에 저장해 재사용
+TTS_CACHE_DIR = os.path.join(ROOT_DIR, "app", "data", "tts_cache")
+TTS_CACHE_MAX_BYTES = 200 * 1024 * 1024
+# 긴 응답은 문장 단위로 나눠 합성/재생을 겹침 (짧은 문장은 다음 문장과 합침)
+TTS_CHUNK_MIN_CHARS = 4
+TTS_PREFETCH = 2
+# 공유 합성 워커 수 (모든 화면이 같은 풀 사용)
+TTS_SYNTH_WORKERS = 2
+# 합성 음성 샘플레이트 (Google LINEAR16 / gTTS 디코딩 결과)
+TTS_SAMPLE_RATE = 24000
+
+# API 서버 설정
+API_BASE = os.environ.get("KIOSK_API_BASE", "http://192.168.20.109:8080")
+API_POOL_SIZE = 4
+# 멱등 요청(GET/PUT/DELETE)과 연결 실패는 API_MAX_RETRIES번까지 재시도 (0.3초, 0.6초, ... 대기)
+API_MAX_RETRIES = 2
+API_RETRY_BACKOFF = 0.3
+# 엔드포인트별 (connect, read) 타임아웃 (초)
+API_TIMEOUTS = {
+    "default": (3.0, 10.0),
+    "users": (3.0, 10.0),
+    "chatbot_session": (3.0, 5.0),
+    "chatbot_chat": (3.0, 10.0),
+    "chatbot_stream": (3.0, 10.0),  # 스트리밍은 토큰 사이 최대 대기 시간
+    "tts": (3.0, 15.0),
+    "menu": (3.0, 5.0),
+    "orders": (3.0, 10.0),
+}
+# 스트리밍 응답을 말풍선에 반영하는 최소 간격 (초)
+CHAT_STREAM_UI_INTERVAL = 0.25
+# 사용자 등록/세션 저장/주문 업로드는 로컬 outbox 테이블(DB_PATH)에 먼저 저장하고 백그라운드로 전송
+OUTBOX_BATCH_SIZE = 20
+OUTBOX_RETRY_BACKOFF = 2.0
+OUTBOX_RETRY_BACKOFF_MAX = 300.0
+
+# 오디오 출력 설정 (앱 전체에서 OutputStream 하나를 열어두고 재생)
+AUDIO_OUTPUT_RATE = 24000
+AUDIO_OUTPUT_BLOCKSIZE = 512
+# 화면에서 재생하는 고정 안내 문구 (build_tts_cache.py로 미리 합성)
+TTS_PROMPTS = {
+    "waiting_guide": "녹색 사각형 안에서 정면을 바라보세요",
+    "order_greeting": "안녕하세요? 오랜만에 오셨네요? 잘 지내셨나요? 원하시는 메뉴가 있으시면 말씀해주세요.",
+}
 
 # UI 설정
 WINDOW_WIDTH = 540
@@ -45,4 +126,11 @@ SOURCE_DIR = os.path.join(ROOT_DIR, "Source")
 
 # 윈도우 크기 설정
 WINDOW_WIDTH = 540
-WINDOW_HEIGHT = 960 
\ No newline at end of file
+WINDOW_HEIGHT = 960 
+
+# 얼굴 ANN 인덱스 설정 (등록 인원이 FACE_INDEX_MIN_SIZE 이상일 때 사용, None이면 항상 전수 계산)
+FACE_INDEX_TYPE = "ivf"
+FACE_INDEX_MIN_SIZE = 20000
+FACE_INDEX_TOP_K = 32
+FACE_INDEX_NPROBE = 8
+FACE_INDEX_PATH = os.path.join(ROOT_DIR, "faces.index.npz")
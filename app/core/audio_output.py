@@ -0,0 +1,250 @@
+"""
+오디오 출력 모듈
+
+프로세스 전체에서 sounddevice OutputStream 하나를 열어두고 메모리의 PCM 클립을
+순서대로 이어서 재생. 재생할 때마다 장치를 열거나 파일을 읽지 않음.
+"""
+
+import io
+import time
+import wave
+import heapq
+import queue
+import threading
+import collections
+import numpy as np
+from app.config import AUDIO_OUTPUT_RATE, AUDIO_OUTPUT_BLOCKSIZE
+
+
+class AudioClip:
+    """메모리 PCM 오디오 (mono int16)"""
+
+    def __init__(self, samples, sample_rate):
+        self.samples = np.ascontiguousarray(samples, dtype=np.int16).reshape(-1)
+        self.sample_rate = sample_rate
+
+    @property
+    def duration(self):
+        return len(self.samples) / self.sample_rate
+
+    @classmethod
+    def from_wav_bytes(cls, data):
+        """WAV 바이트(16bit PCM)를 클립으로 변환 - 스테레오는 mono로 합침"""
+        with wave.open(io.BytesIO(data), "rb") as wf:
+            if wf.getsampwidth() != 2:
+                raise ValueError("16bit PCM WAV만 지원합니다.")
+            channels = wf.getnchannels()
+            sample_rate = wf.getframerate()
+            frames = wf.readframes(wf.getnframes())
+        samples = np.frombuffer(frames, dtype="<i2")
+        if channels > 1:
+            samples = samples.reshape(-1, channels).mean(axis=1).astype(np.int16)
+        return cls(samples, sample_rate)
+
+    @classmethod
+    def from_wav_file(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_wav_bytes(f.read())
+
+    def to_wav_bytes(self):
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(self.sample_rate)
+            wf.writeframes(self.samples.astype("<i2").tobytes())
+        return buffer.getvalue()
+
+    def resampled(self, sample_rate):
+        """선형 보간 리샘플링 (음성 안내용으로 충분한 품질)"""
+        if sample_rate == self.sample_rate or len(self.samples) == 0:
+            return self
+        count = int(round(len(self.samples) * sample_rate / self.sample_rate))
+        positions = np.arange(count) * (self.sample_rate / sample_rate)
+        samples = np.interp(positions, np.arange(len(self.samples)), self.samples)
+        return AudioClip(samples.astype(np.int16), sample_rate)
+
+
+# 재생 우선순위 (높을수록 먼저 재생)
+PRIORITY_LOW = 0
+PRIORITY_NORMAL = 1
+PRIORITY_HIGH = 2
+
+
+class Playback:
+    """재생 요청 하나 - 완료/취소를 기다리거나 on_finished(playback, completed)로 통보받음"""
+
+    def __init__(self, output, clip, priority=PRIORITY_NORMAL, on_finished=None):
+        self.output = output
+        self.clip = clip
+        self.priority = priority
+        self.on_finished = on_finished
+        self.position = 0
+        self.cancelled = False
+        self.completed = False
+        self.requested_at = time.time()
+        self.start_latency = None  # 요청부터 첫 샘플이 스피커로 나갈 때까지 (초)
+        self.done = threading.Event()
+
+    @property
+    def started(self):
+        return self.start_latency is not None
+
+    def cancel(self):
+        """재생 취소 (이미 끝났으면 무시)"""
+        self.cancelled = True
+        self.output._finish(self, completed=False)
+
+    def wait(self, timeout=None):
+        return self.done.wait(timeout)
+
+
+class AudioOutput:
+    """하나의 OutputStream을 앱 종료까지 열어두고 우선순위 대기열의 클립을 재생
+
+    같은 우선순위는 요청 순서대로 이어서 재생되고, 재생 중인 클립은 interrupt
+    요청이나 stop_all()(바지인)이 아니면 끊기지 않는다. 완료 콜백은 오디오
+    콜백 스레드를 막지 않도록 별도 알림 스레드에서 호출된다.
+    """
+
+    def __init__(self, sample_rate=AUDIO_OUTPUT_RATE, blocksize=AUDIO_OUTPUT_BLOCKSIZE):
+        self.sample_rate = sample_rate
+        self.blocksize = blocksize
+        self.lock = threading.Lock()
+        self.pending = []  # (-priority, seq, playback) 힙
+        self.current = None
+        self.seq = 0
+        self.stream = None
+        self.notifications = queue.Queue()
+        self.latencies = collections.deque(maxlen=100)
+        threading.Thread(target=self._notify_loop, daemon=True).start()
+
+    def start(self):
+        """출력 스트림 열기 (이미 열려 있으면 무시)"""
+        with self.lock:
+            if self.stream is not None:
+                return
+            import sounddevice as sd
+            self.stream = sd.OutputStream(samplerate=self.sample_rate, channels=1, dtype="int16",
+                                          blocksize=self.blocksize, callback=self._callback)
+            self.stream.start()
+        print(f"🔈 오디오 출력 스트림 시작 ({self.sample_rate}Hz)")
+
+    def close(self):
+        """출력 스트림 닫기 (앱 종료 시)"""
+        self.stop_all()
+        with self.lock:
+            stream, self.stream = self.stream, None
+        if stream is not None:
+            stream.stop()
+            stream.close()
+
+    def play(self, clip, priority=PRIORITY_NORMAL, interrupt=False, on_finished=None):
+        """클립을 재생 대기열에 추가하고 Playback 반환
+
+        interrupt=True이면 재생 중이거나 대기 중인 같은/낮은 우선순위 클립을 취소하고 바로 재생
+        """
+        self.start()
+        playback = Playback(self, clip.resampled(self.sample_rate), priority, on_finished)
+        with self.lock:
+            self.seq += 1
+            heapq.heappush(self.pending, (-priority, self.seq, playback))
+            interrupted = self._collect_interrupted(priority) if interrupt else []
+        for old in interrupted:
+            old.cancel()
+        return playback
+
+    def _collect_interrupted(self, priority):
+        """priority 이하의 재생 중/대기 중 클립 (lock 안에서 호출, 방금 추가한 클립은 제외)"""
+        newest = max(self.pending, key=lambda item: item[1])[2]
+        victims = [item[2] for item in self.pending if item[2] is not newest and item[2].priority <= priority]
+        if self.current is not None and self.current.priority <= priority:
+            victims.append(self.current)
+        return victims
+
+    def stop_all(self):
+        """재생 중이거나 대기 중인 클립 모두 취소 (바지인)"""
+        with self.lock:
+            playbacks = [item[2] for item in self.pending]
+            if self.current is not None:
+                playbacks.append(self.current)
+            self.pending = []
+            self.current = None
+        for playback in playbacks:
+            playback.cancel()
+
+    def is_busy(self):
+        with self.lock:
+            return self.current is not None or any(not item[2].cancelled for item in self.pending)
+
+    def latency_stats(self):
+        """최근 재생 시작 지연 (평균ms, 최대ms) - 측정값이 없으면 None"""
+        with self.lock:
+            latencies = list(self.latencies)
+        if not latencies:
+            return None
+        return sum(latencies) / len(latencies) * 1000, max(latencies) * 1000
+
+    def _finish(self, playback, completed):
+        """완료/취소 처리 - 한 번만 통보"""
+        with self.lock:
+            if playback.done.is_set():
+                return
+            playback.completed = completed
+            playback.done.set()
+        self.notifications.put(playback)
+
+    def _notify_loop(self):
+        """완료 로그와 on_finished 콜백 처리 (오디오 스레드 밖에서)"""
+        while True:
+            playback = self.notifications.get()
+            if playback.completed:
+                print(f"✅ 음성 재생 완료 ({playback.clip.duration:.1f}초, 시작 지연 {playback.start_latency * 1000:.0f}ms)")
+            if playback.on_finished is None:
+                continue
+            try:
+                playback.on_finished(playback, playback.completed)
+            except Exception as e:
+                print(f"❌ 재생 완료 콜백 오류: {str(e)}")
+
+    def _output_delay(self, time_info):
+        """이번 버퍼가 실제 스피커로 나가기까지 남은 시간 (장치가 알려주지 않으면 0)"""
+        try:
+            return max(0.0, time_info.outputBufferDacTime - time_info.currentTime)
+        except AttributeError:
+            return 0.0
+
+    def _callback(self, outdata, frames, time_info, status):
+        """오디오 스레드 - 우선순위 순서대로 frames만큼 채우고 나머지는 무음"""
+        out = outdata[:, 0]
+        filled = 0
+        finished = []
+        now = time.time()
+        with self.lock:
+            while filled < frames:
+                if self.current is None or self.current.cancelled:
+                    self.current = None
+                    if not self.pending:
+                        break
+                    self.current = heapq.heappop(self.pending)[2]
+                    continue
+                playback = self.current
+                samples = playback.clip.samples
+                if playback.start_latency is None:
+                    offset = filled / self.sample_rate
+                    playback.start_latency = now - playback.requested_at + self._output_delay(time_info) + offset
+                    self.latencies.append(playback.start_latency)
+                count = min(frames - filled, len(samples) - playback.position)
+                out[filled:filled + count] = samples[playback.position:playback.position + count]
+                playback.position += count
+                filled += count
+                if playback.position >= len(samples):
+                    self.current = None
+                    finished.append(playback)
+        out[filled:] = 0
+        for playback in finished:
+            self._finish(playback, completed=True)
+
+
+# 프로세스 전체 공유 인스턴스
+audio_output = AudioOutput()
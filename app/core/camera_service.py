@@ -0,0 +1,225 @@
+"""
+공유 카메라 캡처 서비스
+"""
+
+import os
+import time
+import threading
+import collections
+import cv2
+import numpy as np
+from app.config import CAMERA_SOURCE, CAMERA_WIDTH, CAMERA_HEIGHT, CAMERA_FPS, CAMERA_BUFFER_SIZE
+
+SYNTHETIC_SOURCE = "synthetic"
+
+
+class SyntheticSource:
+    """카메라 없이 테스트하기 위한 가상 프레임 소스"""
+
+    def __init__(self, width, height, fps):
+        self.width = width
+        self.height = height
+        self.interval = 1.0 / fps
+        self.index = 0
+        self.last_time = 0.0
+
+    def isOpened(self):
+        return True
+
+    def read(self):
+        # 실제 카메라처럼 fps에 맞춰 대기
+        wait = self.last_time + self.interval - time.time()
+        if wait > 0:
+            time.sleep(wait)
+        self.last_time = time.time()
+
+        frame = np.zeros((self.height, self.width, 3), dtype=np.uint8)
+        frame[:, :, 1] = np.linspace(0, 255, self.width, dtype=np.uint8)[None, :]
+        x = (self.index * 8) % self.width
+        frame[:, x:x + 16, 2] = 255
+        self.index += 1
+        return True, frame
+
+    def release(self):
+        pass
+
+
+class FileSource:
+    """녹화된 영상을 반복 재생하는 프레임 소스"""
+
+    def __init__(self, path, fps):
+        self.path = path
+        self.capture = cv2.VideoCapture(path)
+        source_fps = self.capture.get(cv2.CAP_PROP_FPS)
+        self.interval = 1.0 / (source_fps if source_fps and source_fps > 0 else fps)
+        self.last_time = 0.0
+
+    def isOpened(self):
+        return self.capture.isOpened()
+
+    def read(self):
+        wait = self.last_time + self.interval - time.time()
+        if wait > 0:
+            time.sleep(wait)
+        self.last_time = time.time()
+
+        ret, frame = self.capture.read()
+        if not ret:
+            # 영상 끝이면 처음부터 다시 재생
+            self.capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.capture.read()
+        return ret, frame
+
+    def release(self):
+        self.capture.release()
+
+
+def open_source(source, width=CAMERA_WIDTH, height=CAMERA_HEIGHT, fps=CAMERA_FPS):
+    """장치 번호, 영상 파일 경로, 'synthetic' 중 하나로 프레임 소스 생성"""
+    if source == SYNTHETIC_SOURCE:
+        return SyntheticSource(width, height, fps)
+    if isinstance(source, str) and not source.isdigit():
+        if not os.path.exists(source):
+            raise FileNotFoundError(f"카메라 소스 파일이 없습니다: {source}")
+        return FileSource(source, fps)
+
+    capture = cv2.VideoCapture(int(source))
+    capture.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+    capture.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+    return capture
+
+
+class CameraSubscription:
+    """화면별 프레임 구독 - Kivy Clock에서 지정한 fps로 최신 프레임 전달"""
+
+    def __init__(self, service, callback, fps):
+        self.service = service
+        self.callback = callback
+        self.fps = fps
+        self.last_seq = -1
+        self.event = None
+
+    def start(self):
+        from kivy.clock import Clock
+        self.event = Clock.schedule_interval(self._tick, 1.0 / self.fps)
+
+    def cancel(self):
+        """구독 해제 (카메라 장치는 계속 열려 있음)"""
+        if self.event is not None:
+            self.event.cancel()
+            self.event = None
+        self.service._unsubscribe(self)
+
+    def _tick(self, dt):
+        seq, frame = self.service.latest()
+        # 새 프레임이 없으면 같은 프레임을 다시 처리하지 않음
+        if frame is None or seq == self.last_seq:
+            return
+        self.last_seq = seq
+        self.callback(frame)
+
+
+class CameraService:
+    """프로세스 전체에서 카메라를 한 번만 열고 그랩 스레드로 링 버퍼를 채움"""
+
+    def __init__(self, source=CAMERA_SOURCE, width=CAMERA_WIDTH, height=CAMERA_HEIGHT,
+                 fps=CAMERA_FPS, buffer_size=CAMERA_BUFFER_SIZE):
+        self.source = source
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.lock = threading.Lock()
+        self.frames = collections.deque(maxlen=buffer_size)
+        self.seq = 0
+        self.capture = None
+        self.thread = None
+        self.running = False
+        self.subscriptions = []
+
+    def open(self):
+        """카메라 열기 및 그랩 스레드 시작 (이미 열려 있으면 무시)"""
+        with self.lock:
+            if self.running:
+                return
+            self.running = True
+        self.thread = threading.Thread(target=self._grab_loop, daemon=True)
+        self.thread.start()
+
+    def release(self):
+        """그랩 스레드 중지 및 장치 해제 (앱 종료 시)"""
+        with self.lock:
+            self.running = False
+            self.subscriptions = []
+        if self.thread is not None:
+            self.thread.join(timeout=2.0)
+            self.thread = None
+
+    def _open_capture(self):
+        start = time.time()
+        capture = open_source(self.source, self.width, self.height, self.fps)
+        if not capture.isOpened():
+            capture.release()
+            print(f"❌ 카메라 열기 실패: {self.source}")
+            return None
+        print(f"📷 카메라 열기 완료: {self.source} ({(time.time() - start) * 1000:.0f}ms)")
+        return capture
+
+    def _grab_loop(self):
+        failures = 0
+        while self.running:
+            if self.capture is None:
+                self.capture = self._open_capture()
+                if self.capture is None:
+                    time.sleep(1.0)
+                    continue
+
+            ret, frame = self.capture.read()
+            if not ret:
+                failures += 1
+                if failures >= 30:
+                    print("카메라 프레임 읽기 실패 - 장치 재연결")
+                    self.capture.release()
+                    self.capture = None
+                    failures = 0
+                time.sleep(0.01)
+                continue
+
+            failures = 0
+            with self.lock:
+                self.seq += 1
+                self.frames.append((self.seq, frame))
+
+        if self.capture is not None:
+            self.capture.release()
+            self.capture = None
+        print("📷 카메라 해제 완료")
+
+    def latest(self):
+        """가장 최근 프레임 (seq, frame) - 아직 없으면 (0, None)"""
+        with self.lock:
+            if not self.frames:
+                return 0, None
+            return self.frames[-1]
+
+    def read(self):
+        """cv2.VideoCapture.read()와 같은 형태로 최신 프레임 반환"""
+        seq, frame = self.latest()
+        return frame is not None, frame
+
+    def subscribe(self, callback, fps):
+        """fps 주기로 callback(frame)을 UI 스레드에서 호출하는 구독 생성"""
+        self.open()
+        subscription = CameraSubscription(self, callback, fps)
+        with self.lock:
+            self.subscriptions.append(subscription)
+        subscription.start()
+        return subscription
+
+    def _unsubscribe(self, subscription):
+        with self.lock:
+            if subscription in self.subscriptions:
+                self.subscriptions.remove(subscription)
+
+
+# 프로세스 전체 공유 인스턴스
+camera_service = CameraService()
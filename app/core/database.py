@@ -1,150 +1,145 @@
 """
 데이터베이스 관련 기능
+
+사용자/주문은 키오스크 로컬 DB(DB_PATH), 메뉴는 메뉴 DB(MENU_DB_PATH)를 읽어 둔
+메뉴 카탈로그(app/core/menu_catalog.py)에서 조회.
+테이블과 인덱스는 app/core/schema.py의 마이그레이션으로 관리한다.
 """
 
-import sqlite3
 import os
 import numpy as np
 from typing import List, Tuple, Optional
-from app.config import DB_PATH
+from app.config import DB_PATH, MENU_DB_PATH
+from app.core.db_pool import get_pool
+from app.core.schema import ensure_schema, ensure_menu_schema
+from app.core.face_encoding import encode_face, decode_face
+from app.core.menu_catalog import get_menu_catalog
 from app.models.user import UserData
 
+def _face_blob(face_encoding):
+    """저장용 인코딩 바이트 - 모든 쓰기는 encode_face의 버전 헤더 포맷으로 통일"""
+    if face_encoding is None:
+        return None
+    if isinstance(face_encoding, (bytes, bytearray, memoryview)):
+        face_encoding = decode_face(face_encoding)
+    return encode_face(face_encoding)
+
 class Database:
     def __init__(self):
         """데이터베이스 초기화"""
         self.db_path = DB_PATH
+        self.menu_db_path = MENU_DB_PATH
+        # 스레드별로 열어둔 연결 재사용 (쓰기는 풀의 쓰기 스레드에서 순서대로 처리)
+        self.pool = get_pool(self.db_path)
         self.create_tables()
+        # 메뉴는 한 번 읽어 두고 메뉴 DB가 바뀔 때만 다시 읽음
+        self.menu_catalog = get_menu_catalog()
     
     def create_tables(self):
-        """테이블 생성"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # 사용자 테이블
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                face_encoding BLOB NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
+        """테이블 생성 및 스키마 마이그레이션"""
+        ensure_schema(self.db_path)
+        ensure_menu_schema(self.menu_db_path)
     
     def get_menu_items(self, limit: Optional[int] = None) -> List[Tuple]:
-        """메뉴 아이템 조회"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        try:
-            if limit:
-                cursor.execute("SELECT item, price, image FROM menus LIMIT ?", (limit,))
-            else:
-                cursor.execute("SELECT item, price, image FROM menus")
-            rows = cursor.fetchall()
-            return rows
-        except sqlite3.OperationalError:
-            # 테이블 구조 확인
-            cursor.execute("PRAGMA table_info(menus)")
-            columns = cursor.fetchall()
-            print("현재 테이블 구조:", columns)
-            raise
-        finally:
-            conn.close()
+        """메뉴 아이템 조회 (menu_name, price, image)"""
+        items = self.menu_catalog.snapshot().items
+        if limit:
+            items = items[:limit]
+        return [(item.menu_name, item.price, item.image) for item in items]
+    
+    def get_menu_items_by_category(self, category: str) -> List[Tuple]:
+        """카테고리별 메뉴 조회 (menu_name, price, image)"""
+        return [(item.menu_name, item.price, item.image)
+                for item in self.menu_catalog.snapshot().category(category)]
     
     def get_menu_item_by_name(self, item_name: str) -> Optional[Tuple]:
         """메뉴 이름으로 상세 정보 조회"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT item, price, image FROM menus WHERE item = ?",
-            (item_name,)
-        )
-        row = cursor.fetchone()
-        conn.close()
-        return row if row else None
+        item = self.menu_catalog.snapshot().get(item_name)
+        return (item.menu_name, item.price, item.image) if item else None
     
     def get_user_by_face_encoding(self, face_encoding: bytes) -> Optional[UserData]:
-        """얼굴 인코딩으로 사용자 조회"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM users WHERE face_encoding = ?", (face_encoding,))
-        row = cursor.fetchone()
-        conn.close()
-        
+        """얼굴 인코딩으로 사용자 조회 (BLOB 비교 대신 메모리 갤러리 매칭)"""
+        from app.core.face_detection import find_best_match
+        user_id, _, _ = find_best_match(decode_face(face_encoding))
+        if user_id is None:
+            return None
+        row = self.get_user(user_id)
         if row:
             return UserData.from_db_row(row)
         return None
     
     def add_user(self, name, face_encoding):
-        """사용자 추가"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute(
+        """사용자 추가 - face_encoding은 numpy 배열 또는 인코딩 바이트"""
+        blob = _face_blob(face_encoding)
+        cursor = self.pool.write(
             "INSERT INTO users (name, face_encoding) VALUES (?, ?)",
-            (name, face_encoding)
+            (name, blob)
         )
-        user_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        return user_id
+        if blob is not None:
+            # save_face와 같이 메모리 갤러리에도 바로 반영
+            from app.core.face_detection import face_gallery
+            face_gallery.add(cursor.lastrowid, name, decode_face(blob))
+        return cursor.lastrowid
     
     def get_user(self, user_id):
         """사용자 정보 조회"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM users WHERE id = ?", (user_id,))
-        user = cursor.fetchone()
-        conn.close()
-        return user
+        return self.pool.query_one("SELECT * FROM users WHERE user_id = ?", (user_id,))
     
     def get_all_users(self):
         """모든 사용자 조회"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM users")
-        users = cursor.fetchall()
-        conn.close()
-        return users
+        return self.pool.query("SELECT * FROM users")
     
     def get_user_by_name(self, name):
         """이름으로 사용자 조회"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM users WHERE name = ?", (name,))
-        user = cursor.fetchone()
-        conn.close()
-        return user
+        return self.pool.query_one("SELECT * FROM users WHERE name = ?", (name,))
     
     def update_user(self, user_id, name=None, face_encoding=None):
         """사용자 정보 업데이트"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
+        face_encoding = _face_blob(face_encoding)
         if name and face_encoding:
-            cursor.execute(
-                "UPDATE users SET name = ?, face_encoding = ? WHERE id = ?",
+            self.pool.write(
+                "UPDATE users SET name = ?, face_encoding = ? WHERE user_id = ?",
                 (name, face_encoding, user_id)
             )
         elif name:
-            cursor.execute(
-                "UPDATE users SET name = ? WHERE id = ?",
+            self.pool.write(
+                "UPDATE users SET name = ? WHERE user_id = ?",
                 (name, user_id)
             )
         elif face_encoding:
-            cursor.execute(
-                "UPDATE users SET face_encoding = ? WHERE id = ?",
+            self.pool.write(
+                "UPDATE users SET face_encoding = ? WHERE user_id = ?",
                 (face_encoding, user_id)
             )
-        
-        conn.commit()
-        conn.close()
+        else:
+            return
+        row = self.get_user(user_id)
+        if row:
+            from app.core.face_detection import face_gallery
+            face_gallery.update(user_id, row[2], decode_face(face_encoding) if face_encoding else None)
     
     def delete_user(self, user_id):
         """사용자 삭제"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM users WHERE id = ?", (user_id,))
-        conn.commit()
-        conn.close() 
\ No newline at end of file
+        self.pool.write("DELETE FROM users WHERE user_id = ?", (user_id,))
+        from app.core.face_detection import face_gallery
+        face_gallery.remove(user_id)
+    
+    def add_order(self, user_id, total_price, ordered_menu, status="pending"):
+        """주문 추가 - ordered_menu는 주문 메뉴 JSON 문자열"""
+        cursor = self.pool.write(
+            "INSERT INTO orders (user_id, total_price, ordered_menu, status) VALUES (?, ?, ?, ?)",
+            (user_id, total_price, ordered_menu, status)
+        )
+        return cursor.lastrowid
+    
+    def get_orders_by_user(self, user_id, limit: Optional[int] = None):
+        """사용자의 주문 내역 (최근 주문부터)"""
+        if limit:
+            return self.pool.query(
+                "SELECT * FROM orders WHERE user_id = ? ORDER BY ordered_at DESC LIMIT ?",
+                (user_id, limit)
+            )
+        return self.pool.query(
+            "SELECT * FROM orders WHERE user_id = ? ORDER BY ordered_at DESC",
+            (user_id,)
+        )
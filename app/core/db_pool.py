@@ -0,0 +1,143 @@
+"""
+SQLite 연결 풀
+
+호출마다 sqlite3.connect를 열고 닫지 않도록 스레드마다 연결 하나를 계속 열어두고
+재사용한다. 연결을 재사용하므로 sqlite3의 statement 캐시(DB_STATEMENT_CACHE)로
+같은 SQL은 다시 파싱하지 않는다.
+
+- journal_mode=WAL, synchronous=NORMAL: 읽기가 쓰기를 기다리지 않고, 커밋마다 fsync하지 않음
+- 쓰기는 전용 스레드 하나가 요청 순서대로 실행 (쓰기끼리 database is locked로 부딪히지 않음)
+"""
+
+import queue
+import sqlite3
+import threading
+import weakref
+from concurrent.futures import Future
+from app.config import DB_PATH, DB_BUSY_TIMEOUT, DB_STATEMENT_CACHE
+
+
+class _ConnectionHolder:
+    """스레드별 연결 보관용 (스레드 종료 시 해제되는 것을 weakref.finalize로 감지)"""
+
+    __slots__ = ("conn", "__weakref__")
+
+    def __init__(self, conn):
+        self.conn = conn
+
+
+class DatabasePool:
+    """DB 파일 하나에 대한 스레드별 읽기 연결 + 단일 쓰기 큐"""
+
+    def __init__(self, db_path=DB_PATH):
+        self.db_path = db_path
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.connections = []  # close()에서 닫기 위해 모든 연결 보관
+        self.write_queue = queue.Queue()
+        self.writer = threading.Thread(target=self._write_loop, daemon=True)
+        self.writer.start()
+
+    def _connect(self):
+        # 연결은 만든 스레드에서만 사용하고, close()에서만 다른 스레드가 닫음
+        conn = sqlite3.connect(self.db_path, timeout=DB_BUSY_TIMEOUT,
+                               cached_statements=DB_STATEMENT_CACHE, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with self.lock:
+            self.connections.append(conn)
+        return conn
+
+    def connection(self):
+        """현재 스레드의 연결 (처음 호출 시 생성) - 스레드가 끝나면 자동으로 닫힘"""
+        holder = getattr(self.local, "holder", None)
+        if holder is None:
+            conn = self._connect()
+            holder = self.local.holder = _ConnectionHolder(conn)
+            # threading.local 값은 스레드가 끝나면 해제되므로 그때 연결도 닫음
+            weakref.finalize(holder, self._discard, conn)
+        return holder.conn
+
+    def _discard(self, conn):
+        """스레드가 끝난 읽기 연결 닫기"""
+        with self.lock:
+            if conn not in self.connections:
+                return
+            self.connections.remove(conn)
+        conn.close()
+
+    def query(self, sql, params=()):
+        """읽기 - 전체 결과 행 목록"""
+        return self.connection().execute(sql, params).fetchall()
+
+    def query_one(self, sql, params=()):
+        """읽기 - 첫 행 (없으면 None)"""
+        return self.connection().execute(sql, params).fetchone()
+
+    def transaction(self, fn, wait=True):
+        """fn(conn)을 쓰기 스레드에서 트랜잭션으로 실행
+
+        wait=True이면 커밋까지 기다려 fn의 반환값을 돌려주고(예외도 그대로 전달),
+        False이면 Future를 바로 반환
+        """
+        future = Future()
+        self.write_queue.put((fn, future))
+        return future.result() if wait else future
+
+    def write(self, sql, params=(), wait=True):
+        """쓰기 SQL 하나 실행 - 커서를 반환 (lastrowid, rowcount만 사용)"""
+        return self.transaction(lambda conn: conn.execute(sql, params), wait)
+
+    def write_many(self, sql, rows, wait=True):
+        return self.transaction(lambda conn: conn.executemany(sql, rows), wait)
+
+    def _write_loop(self):
+        conn = None
+        while True:
+            task = self.write_queue.get()
+            if task is None:
+                break
+            fn, future = task
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                if conn is None:
+                    conn = self._connect()
+                with conn:  # 성공하면 commit, 예외면 rollback
+                    result = fn(conn)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+    def close(self):
+        """쓰기 스레드 종료 후 모든 연결 닫기 (앱 종료 시)"""
+        self.write_queue.put(None)
+        self.writer.join(timeout=5)
+        with self.lock:
+            connections, self.connections = self.connections, []
+        for conn in connections:
+            conn.close()
+        self.local = threading.local()
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path=DB_PATH):
+    """DB 파일별 공유 연결 풀 (처음 요청 시 생성)"""
+    with _pools_lock:
+        pool = _pools.get(db_path)
+        if pool is None:
+            pool = _pools[db_path] = DatabasePool(db_path)
+        return pool
+
+
+def close_pools():
+    """열려 있는 모든 연결 풀 닫기"""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
@@ -7,10 +7,10 @@ class OrderData:
     def get_dummy_order_data():
         """더미 주문 데이터 반환"""
         return [
-                {"item": "아이스 아메리카노", "price": 5000, "image": "data/menu_images_png/menu_image21.png", "count": 1},
-                {"item": "아이스 라떼", "price": 5500, "image": "data/menu_images_png/menu_image24.png", "count": 1},
-                {"item": "생딸기주스", "price": 4300, "image": "data/menu_images_png/menu_image17.png", "count": 1},
-                {"item": "쫀득카노", "price": 5800, "image": "data/menu_images_png/menu_image1.png", "count": 1}
+                {"menu_id": 21, "item": "아이스 아메리카노", "price": 5000, "image": "data/menu_images_png/menu_image21.png", "count": 1},
+                {"menu_id": 24, "item": "아이스 라떼", "price": 5500, "image": "data/menu_images_png/menu_image24.png", "count": 1},
+                {"menu_id": 17, "item": "생딸기주스", "price": 4300, "image": "data/menu_images_png/menu_image17.png", "count": 1},
+                {"menu_id": 1, "item": "쫀득카노", "price": 5800, "image": "data/menu_images_png/menu_image1.png", "count": 1}
             ]
 
 class ChatDummy:
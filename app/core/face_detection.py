@@ -5,13 +5,16 @@
 import os
 import cv2
 import numpy as np
-import sqlite3
-import pickle
 import face_recognition
 from deep_sort_realtime.deepsort_tracker import DeepSort
 from PIL import ImageFont, ImageDraw, Image
 import time
-from app.config import ROOT_DIR
+from app.config import (ROOT_DIR, FACE_RECOGNITION_MODEL, FACE_DETECTION_SCALE, FACE_DETECTION_UPSAMPLE,
+                        TRACK_REVERIFY_INTERVAL)
+from app.core.face_gallery import FaceGallery
+from app.core.face_encoding import encode_face
+from app.core.db_pool import get_pool
+from app.core.schema import ensure_schema
 
 # 설정값
 SIMILARITY_THRESHOLD = 0.45
@@ -28,29 +31,24 @@ SYSTEM_FONT_PATH = os.path.join(ROOT_DIR, "app", "assets", "fonts", "NotoSansKR-
 # 전역 변수
 face_stable_count = 0
 temporary_encodings = []
+target_tracker = None
 
-# DeepSORT 초기화
+# 등록 얼굴 갤러리 (최초 매칭 시 한 번 로드)
+face_gallery = FaceGallery(DB_PATH)
+
+# DeepSORT 초기화 (추적 확인이 초 단위로 드물게 호출되므로 첫 검출에서 바로 트랙 확정)
+# 외형 특징은 mobilenet 대신 얼굴 영역 축소 이미지(_face_appearance)를 embeds로 넘김
 tracker = DeepSort(
     max_age=15,
-    embedder="mobilenet",
-    half=True
+    n_init=1,
+    embedder=None
 )
+APPEARANCE_SIZE = 16
 
 def initialize_database():
     """데이터베이스 초기화"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS users (
-            user_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            face_encoding BLOB,
-            name TEXT,
-            phone TEXT,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-    conn.commit()
-    conn.close()
+    # 테이블/인덱스는 app/core/schema.py의 마이그레이션으로 관리
+    ensure_schema(DB_PATH)
 
 def check_face_quality(face_img):
     """얼굴 이미지의 품질을 검사"""
@@ -68,74 +66,47 @@ def check_face_quality(face_img):
         
     return True
 
+def detect_faces(rgb_image, scale=FACE_DETECTION_SCALE, upsample=FACE_DETECTION_UPSAMPLE):
+    """축소 영상에서 얼굴 검출 후 원본 해상도 좌표 (top, right, bottom, left)로 변환"""
+    if scale == 1.0:
+        return face_recognition.face_locations(rgb_image, upsample, FACE_RECOGNITION_MODEL)
+
+    small = cv2.resize(rgb_image, (0, 0), fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    small_locations = face_recognition.face_locations(small, upsample, FACE_RECOGNITION_MODEL)
+
+    h, w = rgb_image.shape[:2]
+    locations = []
+    for top, right, bottom, left in small_locations:
+        locations.append((
+            max(0, int(top / scale)),
+            min(w, int(right / scale)),
+            min(h, int(bottom / scale)),
+            max(0, int(left / scale))
+        ))
+    return locations
+
 def save_face(name, encodings):
-    """얼굴 정보 저장"""
+    """얼굴 정보 저장 - 새로 저장된 로컬 user_id 반환"""
     print("DB 저장 시작 - 이름:", name)
     print("인코딩 형태:", encodings.shape)
     
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    
-    # 인코딩을 BLOB 형태로 변환
-    encoding_blob = pickle.dumps(encodings)
+    # 인코딩을 버전 헤더가 붙은 BLOB 형태로 변환
+    encoding_blob = encode_face(encodings)
     print("변환된 인코딩 길이:", len(encoding_blob))
     
     # created_at은 자동으로 현재 시간이 입력됨
-    c.execute('INSERT INTO users (face_encoding, name, phone) VALUES (?, ?, NULL)',
-              (encoding_blob, name))
-    conn.commit()
-    conn.close()
+    cursor = get_pool(DB_PATH).write('INSERT INTO users (face_encoding, name, phone) VALUES (?, ?, NULL)',
+                                     (encoding_blob, name))
+    user_id = cursor.lastrowid
+
+    # 메모리 갤러리에 증분 반영
+    face_gallery.add(user_id, name, encodings)
     print("DB 저장 완료")
+    return user_id
 
 def find_best_match(encoding, threshold=THRESHOLD):
     """얼굴 매칭 - 다중 메트릭 (전체 인코딩, 유클리드 거리, 압축 인코딩)을 40:30:30 비율로 조합"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("SELECT user_id, name, face_encoding FROM users WHERE face_encoding IS NOT NULL")
-    rows = cursor.fetchall()
-    conn.close()
-
-    best_match_id = None
-    best_match_name = None
-    best_similarity = 0
-
-    # Metric 2 (유클리드)에서 사용할 최대 기대값. 실험에 따라 조정 필요.
-    euclid_max = 0.6
-
-    # Metric 1: 전체 인코딩의 코사인 유사도를 계산하기 위해 정규화
-    norm_input = encoding / np.linalg.norm(encoding)
-    # Metric 3: 압축(짝수 인덱스) 인코딩 (128->64) 정규화
-    reduced_input = encoding[::2]
-    norm_reduced_input = reduced_input / np.linalg.norm(reduced_input)
-
-    for row in rows:
-        try:
-            # pickle로 저장된 데이터를 numpy 배열로 복원
-            stored_encoding = pickle.loads(row[2])
-            
-            # Metric 1: 전체 인코딩 코사인 유사도
-            norm_stored = stored_encoding / np.linalg.norm(stored_encoding)
-            cos_sim = np.dot(norm_input, norm_stored)
-            
-            # Metric 2: 유클리드 거리 기반 유사도
-            euclid_distance = np.linalg.norm(encoding - stored_encoding)
-            sim_euclid = max(0, 1 - (euclid_distance / euclid_max))
-            
-            # Metric 3: 압축 인코딩 (짝수 인덱스만) 코사인 유사도
-            reduced_stored = stored_encoding[::2]
-            norm_reduced_stored = reduced_stored / np.linalg.norm(reduced_stored)
-            cos_sim_reduced = np.dot(norm_reduced_input, norm_reduced_stored)
-            
-            # 40:30:30 비율로 종합 유사도 계산
-            overall_similarity = 0.4 * cos_sim + 0.3 * sim_euclid + 0.3 * cos_sim_reduced
-
-            if overall_similarity > best_similarity:
-                best_similarity = overall_similarity
-                best_match_id = row[0]
-                best_match_name = row[1]
-        except Exception as e:
-            print(f"얼굴 매칭 중 오류 발생: {e}")
-            continue
+    best_match_id, best_match_name, best_similarity = face_gallery.match(encoding)
 
     if best_similarity >= threshold:
         return best_match_id, best_match_name, best_similarity
@@ -155,7 +126,7 @@ def extract_face_embeddings(frame):
         return None, (x1, y1, x2, y2), 0, None
     
     rgb_face = cv2.cvtColor(face_crop, cv2.COLOR_BGR2RGB)
-    face_locations = face_recognition.face_locations(rgb_face)
+    face_locations = detect_faces(rgb_face)
     encodings = face_recognition.face_encodings(rgb_face, face_locations)
     
     if encodings:
@@ -203,19 +174,87 @@ def extract_face_embeddings(frame):
     temporary_encodings.clear()
     return None, (x1, y1, x2, y2), 0, None
 
+def _face_appearance(gray_frame, location):
+    """DeepSORT용 가벼운 외형 특징 - 얼굴 영역을 16x16 흑백으로 줄여 정규화한 벡터"""
+    top, right, bottom, left = location
+    crop = gray_frame[max(top, 0):max(bottom, 0), max(left, 0):max(right, 0)]
+    if crop.size == 0:
+        return np.full(APPEARANCE_SIZE * APPEARANCE_SIZE, 1.0 / APPEARANCE_SIZE, dtype=np.float32)
+    vector = cv2.resize(crop, (APPEARANCE_SIZE, APPEARANCE_SIZE), interpolation=cv2.INTER_AREA)
+    vector = vector.astype(np.float32).reshape(-1)
+    vector -= vector.mean()
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else np.full_like(vector, 1.0 / APPEARANCE_SIZE)
+
+def _cosine_similarity(a, b):
+    return np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b))
+
+class TargetFaceTracker:
+    """검출 후 추적 - 잠금 시에만 128차원 인코딩을 계산하고 이후엔 DeepSORT 트랙 ID로 추적
+
+    트랙 ID가 바뀌었거나 reverify_interval이 지나면 해당 얼굴만 인코딩해 본인 여부를 재확인
+    """
+
+    def __init__(self, target_embedding, reverify_interval=TRACK_REVERIFY_INTERVAL):
+        self.target_embedding = target_embedding
+        self.reverify_interval = reverify_interval
+        self.track_id = None
+        self.last_verified_time = 0
+        # 이전 손님의 트랙 정리
+        tracker.delete_all_tracks()
+
+    def is_target(self, target_embedding):
+        """같은 대상 인코딩으로 생성된 추적기인지 확인"""
+        return self.target_embedding is target_embedding or np.array_equal(self.target_embedding, target_embedding)
+
+    def update(self, frame):
+        """프레임에서 대상 얼굴이 보이는지 확인"""
+        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        face_locations = detect_faces(rgb_frame)
+        detections = [([left, top, right - left, bottom - top], 1.0, "face")
+                      for (top, right, bottom, left) in face_locations]
+        # 매 확인마다 CNN 임베딩을 돌리지 않도록 외형 특징은 직접 계산해서 전달
+        gray_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        embeds = [_face_appearance(gray_frame, location) for location in face_locations]
+        tracks = tracker.update_tracks(detections, embeds=embeds)
+        visible_tracks = {track.track_id: track for track in tracks if track.time_since_update == 0}
+
+        current_time = time.time()
+        if self.track_id in visible_tracks:
+            if current_time - self.last_verified_time < self.reverify_interval:
+                # 같은 트랙이 유지되는 동안은 인코딩 생략
+                return True
+            candidates = [visible_tracks[self.track_id]]
+        else:
+            # 최초 잠금 또는 트랙 ID 변경 - 보이는 얼굴 전체를 확인
+            candidates = list(visible_tracks.values())
+
+        if not candidates:
+            self.track_id = None
+            return False
+
+        boxes = []
+        for track in candidates:
+            left, top, right, bottom = track.to_ltrb(orig=True)
+            boxes.append((int(top), int(right), int(bottom), int(left)))
+        encodings = face_recognition.face_encodings(rgb_frame, boxes)
+
+        for track, encoding in zip(candidates, encodings):
+            if _cosine_similarity(encoding, self.target_embedding) >= SIMILARITY_THRESHOLD:
+                self.track_id = track.track_id
+                self.last_verified_time = current_time
+                return True
+
+        self.track_id = None
+        return False
+
 def track_target_face(frame, target_embedding):
     """얼굴 추적"""
-    rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    face_locations = face_recognition.face_locations(rgb_frame)
-    encodings = face_recognition.face_encodings(rgb_frame, face_locations)
-    
-    face_found = False
-    
-    for (top, right, bottom, left), encoding in zip(face_locations, encodings):
-        similarity = np.dot(encoding, target_embedding) / (np.linalg.norm(encoding) * np.linalg.norm(target_embedding))
-        if similarity >= SIMILARITY_THRESHOLD:
-            face_found = True
-            break
+    global target_tracker
+
+    if target_tracker is None or not target_tracker.is_target(target_embedding):
+        target_tracker = TargetFaceTracker(target_embedding)
+    face_found = target_tracker.update(frame)
     
     print(f"TRACKING:{face_found}")
     return face_found
@@ -0,0 +1,147 @@
+"""
+얼굴 인코딩 바이너리 포맷
+
+    [magic "FE" 2B][version 1B][dtype 1B][dim 2B][reserved 2B][little-endian float 배열]
+
+8바이트 헤더 뒤의 데이터는 np.frombuffer(offset=8)로 복사 없이 읽을 수 있음
+"""
+
+import io
+import pickle
+import sqlite3
+import struct
+import numpy as np
+
+MAGIC = b"FE"
+VERSION = 1
+HEADER = struct.Struct("<2sBBHH")
+
+# dtype 코드
+DTYPE_FLOAT32 = 1
+DTYPE_FLOAT64 = 2
+_DTYPES = {
+    DTYPE_FLOAT32: np.dtype("<f4"),
+    DTYPE_FLOAT64: np.dtype("<f8"),
+}
+_DTYPE_CODES = {dtype: code for code, dtype in _DTYPES.items()}
+
+ENCODING_DIM = 128
+
+
+def encode_face(encoding, dtype=np.float32):
+    """얼굴 인코딩을 버전 헤더가 붙은 바이트로 변환"""
+    dtype = np.dtype(dtype).newbyteorder("<")
+    if dtype not in _DTYPE_CODES:
+        raise ValueError(f"지원하지 않는 인코딩 dtype입니다: {dtype}")
+    vector = np.ascontiguousarray(np.asarray(encoding).reshape(-1), dtype=dtype)
+    header = HEADER.pack(MAGIC, VERSION, _DTYPE_CODES[dtype], vector.shape[0], 0)
+    return header + vector.tobytes()
+
+
+def is_encoded_face(blob):
+    """버전 헤더 포맷인지 확인"""
+    if blob is None or len(blob) < HEADER.size:
+        return False
+    magic, version, dtype_code, dim, _ = HEADER.unpack_from(blob)
+    return (magic == MAGIC and version == VERSION and dtype_code in _DTYPES
+            and len(blob) == HEADER.size + dim * _DTYPES[dtype_code].itemsize)
+
+
+def is_raw_face(blob):
+    """헤더 없는 기존 tobytes() 포맷인지 확인 (float64 1024B / float32 512B)"""
+    return blob is not None and len(blob) in (ENCODING_DIM * 8, ENCODING_DIM * 4)
+
+
+def is_legacy_pickle(blob):
+    """기존 pickle.dumps 포맷인지 확인
+
+    첫 바이트(0x80)만으로는 첫 값이 우연히 0x80으로 시작하는 raw 인코딩과 구분되지 않으므로
+    헤더/raw 길이가 아닌 BLOB 중 제한된 Unpickler로 실제로 복원되는 것만 pickle로 판단
+    """
+    if blob is None or len(blob) == 0 or blob[:1] != b"\x80":
+        return False
+    if is_encoded_face(blob) or is_raw_face(blob):
+        return False
+    try:
+        load_legacy_pickle(blob)
+    except Exception:
+        return False
+    return True
+
+
+def decode_face(blob):
+    """바이트를 numpy 배열로 복원 (읽기 전용, 복사 없음)
+
+    헤더가 없는 기존 tobytes() 포맷(float64 1024B / float32 512B)도 읽음.
+    pickle 포맷은 안전하지 않으므로 읽지 않고 ValueError 발생.
+    """
+    blob = bytes(blob) if isinstance(blob, (bytearray, memoryview)) else blob
+    if is_encoded_face(blob):
+        _, _, dtype_code, dim, _ = HEADER.unpack_from(blob)
+        return np.frombuffer(blob, dtype=_DTYPES[dtype_code], count=dim, offset=HEADER.size)
+    if is_raw_face(blob):
+        return np.frombuffer(blob, dtype="<f8" if len(blob) == ENCODING_DIM * 8 else "<f4")
+    if is_legacy_pickle(blob):
+        raise ValueError("pickle 포맷 인코딩입니다. db_migrate_encodings.py로 변환하세요.")
+    raise ValueError(f"알 수 없는 인코딩 포맷입니다 (길이: {len(blob)})")
+
+
+class _NumpyUnpickler(pickle.Unpickler):
+    """numpy 배열 복원에 필요한 클래스만 허용하는 Unpickler"""
+
+    ALLOWED = {
+        ("numpy.core.multiarray", "_reconstruct"),
+        ("numpy._core.multiarray", "_reconstruct"),
+        ("numpy", "ndarray"),
+        ("numpy", "dtype"),
+        # protocol 2: 배열 데이터를 latin-1 문자열로 담아 _codecs.encode로 bytes 복원
+        ("_codecs", "encode"),
+        # protocol 5: 배열을 PickleBuffer로 담아 _frombuffer로 복원
+        ("numpy.core.numeric", "_frombuffer"),
+        ("numpy._core.numeric", "_frombuffer"),
+    }
+
+    def find_class(self, module, name):
+        if (module, name) in self.ALLOWED:
+            return super().find_class(module, name)
+        raise pickle.UnpicklingError(f"허용되지 않은 클래스입니다: {module}.{name}")
+
+
+def load_legacy_pickle(blob):
+    """기존 pickle BLOB을 제한된 Unpickler로 복원 (128차원 float 배열이 아니면 ValueError)"""
+    encoding = np.asarray(_NumpyUnpickler(io.BytesIO(blob)).load())
+    if encoding.dtype.kind != "f" or encoding.size != ENCODING_DIM:
+        raise ValueError(f"얼굴 인코딩이 아닌 pickle입니다: {encoding.dtype} {encoding.shape}")
+    return encoding.reshape(-1)
+
+
+def migrate_encodings(db_path, dtype=np.float32):
+    """users.face_encoding의 pickle/헤더 없는 BLOB을 새 포맷으로 제자리 변환
+
+    Returns:
+        (변환된 행 수, 실패한 행 수)
+    """
+    conn = sqlite3.connect(db_path)
+    migrated = failed = 0
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT user_id, face_encoding FROM users WHERE face_encoding IS NOT NULL")
+        updates = []
+        for user_id, blob in cursor.fetchall():
+            if is_encoded_face(blob):
+                continue
+            try:
+                if is_legacy_pickle(blob):
+                    encoding = load_legacy_pickle(blob)
+                else:
+                    encoding = decode_face(blob)
+                updates.append((encode_face(encoding, dtype), user_id))
+                migrated += 1
+            except Exception as e:
+                print(f"인코딩 변환 실패 (ID:{user_id}): {e}")
+                failed += 1
+        cursor.executemany("UPDATE users SET face_encoding = ? WHERE user_id = ?", updates)
+        conn.commit()
+    finally:
+        conn.close()
+    return migrated, failed
@@ -0,0 +1,250 @@
+"""
+메모리 상주 얼굴 갤러리
+"""
+
+import threading
+import numpy as np
+from app.config import FACE_INDEX_TYPE, FACE_INDEX_MIN_SIZE, FACE_INDEX_TOP_K, FACE_INDEX_NPROBE, FACE_INDEX_PATH
+from app.core.face_index import create_face_index, INDEX_TYPES
+from app.core.face_encoding import decode_face, encode_face, is_legacy_pickle, load_legacy_pickle
+from app.core.db_pool import get_pool
+
+# 40:30:30 종합 유사도 가중치
+COSINE_WEIGHT = 0.4
+EUCLID_WEIGHT = 0.3
+REDUCED_WEIGHT = 0.3
+
+# Metric 2 (유클리드)에서 사용할 최대 기대값. 실험에 따라 조정 필요.
+EUCLID_MAX = 0.6
+
+ENCODING_DIM = 128
+
+
+class FaceGallery:
+    """등록된 얼굴 인코딩을 (N×128) float32 행렬로 보관하고 한 번에 매칭"""
+
+    def __init__(self, db_path, index_type=FACE_INDEX_TYPE, index_min_size=FACE_INDEX_MIN_SIZE,
+                 index_path=FACE_INDEX_PATH, top_k=FACE_INDEX_TOP_K, nprobe=FACE_INDEX_NPROBE):
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self.loaded = False
+        # ANN 인덱스 설정 - 인원이 index_min_size 미만이면 전수 계산이 더 빠름
+        self.index_type = index_type
+        self.index_min_size = index_min_size
+        self.index_path = index_path
+        self.top_k = top_k
+        self.nprobe = nprobe
+        self.index = None
+        self._reset(capacity=0)
+
+    def _reset(self, capacity):
+        """버퍼 초기화"""
+        self.size = 0
+        self.user_ids = np.empty(capacity, dtype=np.int64)
+        self.names = []
+        self.matrix = np.empty((capacity, ENCODING_DIM), dtype=np.float32)
+        self.norms = np.empty(capacity, dtype=np.float32)
+        self.reduced_norms = np.empty(capacity, dtype=np.float32)
+
+    def _grow(self, needed):
+        """용량이 부족하면 두 배씩 확장"""
+        capacity = len(self.user_ids)
+        if needed <= capacity:
+            return
+        new_capacity = max(needed, capacity * 2, 64)
+        self.user_ids = np.resize(self.user_ids, new_capacity)
+        self.norms = np.resize(self.norms, new_capacity)
+        self.reduced_norms = np.resize(self.reduced_norms, new_capacity)
+        matrix = np.empty((new_capacity, ENCODING_DIM), dtype=np.float32)
+        matrix[:self.size] = self.matrix[:self.size]
+        self.matrix = matrix
+
+    def _append(self, user_id, name, encoding):
+        """한 행 추가 (lock 보유 상태에서 호출)"""
+        vector = np.asarray(encoding, dtype=np.float32).reshape(-1)
+        if vector.shape[0] != ENCODING_DIM:
+            raise ValueError(f"인코딩 차원이 올바르지 않습니다: {vector.shape}")
+        self._grow(self.size + 1)
+        row = self.size
+        self.matrix[row] = vector
+        self.norms[row] = np.linalg.norm(vector)
+        self.reduced_norms[row] = np.linalg.norm(vector[::2])
+        self.user_ids[row] = user_id
+        self.names.append(name)
+        self.size += 1
+
+    def load(self):
+        """DB에서 전체 사용자 인코딩을 한 번 읽어 행렬 구성"""
+        rows = get_pool(self.db_path).query(
+            "SELECT user_id, name, face_encoding FROM users WHERE face_encoding IS NOT NULL")
+
+        entries = []
+        upgrades = []
+        for user_id, name, blob in rows:
+            try:
+                if is_legacy_pickle(blob):
+                    # 예전 pickle 행은 제한된 Unpickler로 읽어 새 포맷으로 다시 저장
+                    encoding = load_legacy_pickle(blob)
+                    upgrades.append((encode_face(encoding), user_id))
+                else:
+                    encoding = decode_face(blob)
+                entries.append((user_id, name, encoding))
+            except Exception as e:
+                print(f"얼굴 인코딩 로드 중 오류 발생 (ID:{user_id}): {e}")
+        if upgrades:
+            get_pool(self.db_path).write_many("UPDATE users SET face_encoding = ? WHERE user_id = ?", upgrades)
+            print(f"🛠️ pickle 포맷 인코딩 {len(upgrades)}건을 새 포맷으로 변환")
+        self.build(entries)
+        print(f"얼굴 갤러리 로드 완료: {self.size}명")
+
+    def build(self, entries):
+        """(user_id, name, encoding) 목록으로 갤러리와 인덱스 구성"""
+        with self.lock:
+            self._reset(capacity=len(entries))
+            for user_id, name, encoding in entries:
+                try:
+                    self._append(user_id, name, encoding)
+                except Exception as e:
+                    print(f"얼굴 인코딩 로드 중 오류 발생 (ID:{user_id}): {e}")
+            self._build_index()
+            self.loaded = True
+
+    def _build_index(self, load_saved=True):
+        """디스크 인덱스를 불러오거나 새로 학습 (lock 보유 상태에서 호출)
+
+        load_saved=False이면 기존 행의 인코딩이 바뀐 경우이므로 저장된 인덱스를 쓰지 않고 다시 학습
+        """
+        self.index = None
+        if self.index_type not in INDEX_TYPES or self.size < self.index_min_size:
+            return
+        user_ids = self.user_ids[:self.size]
+        index_class = INDEX_TYPES[self.index_type]
+        index = None
+        if load_saved and self.index_path:
+            index = index_class.load(self.index_path, user_ids, nprobe=self.nprobe)
+        if index is None:
+            print(f"얼굴 인덱스 학습 시작: {self.index_type}, {self.size}명")
+            index = create_face_index(self.index_type, nprobe=self.nprobe)
+            index.train(self.matrix[:self.size])
+            index.add(self.matrix[:self.size])
+            self._save_index(index)
+        self.index = index
+
+    def _save_index(self, index):
+        """인덱스를 faces.db 옆에 저장"""
+        if not self.index_path:
+            return
+        try:
+            index.save(self.index_path, self.user_ids[:self.size])
+        except Exception as e:
+            print(f"얼굴 인덱스 저장 중 오류 발생: {e}")
+
+    def ensure_loaded(self):
+        """최초 매칭 시점에 한 번만 로드"""
+        if not self.loaded:
+            self.load()
+
+    def add(self, user_id, name, encoding):
+        """save_face 이후 신규 사용자 증분 반영"""
+        if not self.loaded:
+            # 아직 로드 전이면 다음 load()에서 DB로부터 함께 읽힘
+            return
+        with self.lock:
+            self._append(user_id, name, encoding)
+            if self.index is not None:
+                self.index.add(self.matrix[self.size - 1:self.size])
+                self._save_index(self.index)
+            elif self.index_type in INDEX_TYPES and self.size >= self.index_min_size:
+                self._build_index()
+
+    def update(self, user_id, name, encoding=None):
+        """사용자 이름/인코딩 수정 반영 (인코딩이 없던 사용자면 새로 추가)"""
+        if not self.loaded:
+            return
+        with self.lock:
+            rows = np.flatnonzero(self.user_ids[:self.size] == user_id)
+            if len(rows) == 0:
+                if encoding is None:
+                    return
+                self._append(user_id, name, encoding)
+                self._build_index(load_saved=False)
+                return
+            for row in rows:
+                self.names[row] = name
+                if encoding is not None:
+                    vector = np.asarray(encoding, dtype=np.float32).reshape(-1)
+                    self.matrix[row] = vector
+                    self.norms[row] = np.linalg.norm(vector)
+                    self.reduced_norms[row] = np.linalg.norm(vector[::2])
+            if encoding is not None:
+                self._build_index(load_saved=False)
+
+    def remove(self, user_id):
+        """삭제된 사용자를 매칭 대상에서 제외"""
+        if not self.loaded:
+            return
+        with self.lock:
+            keep = self.user_ids[:self.size] != user_id
+            if keep.all():
+                return
+            n = int(keep.sum())
+            self.matrix[:n] = self.matrix[:self.size][keep]
+            self.norms[:n] = self.norms[:self.size][keep]
+            self.reduced_norms[:n] = self.reduced_norms[:self.size][keep]
+            self.user_ids[:n] = self.user_ids[:self.size][keep]
+            self.names = [name for name, kept in zip(self.names, keep) if kept]
+            self.size = n
+            self._build_index(load_saved=False)
+
+    def match(self, encoding):
+        """40:30:30 종합 유사도를 한 번에 계산 (인덱스가 있으면 상위 K 후보만 재계산)
+
+        Returns:
+            (user_id, name, similarity) - 사용자가 없으면 (None, None, 0)
+        """
+        self.ensure_loaded()
+        query = np.asarray(encoding, dtype=np.float32).reshape(-1)
+        query_norm = np.linalg.norm(query)
+        reduced_query = query[::2]
+        reduced_query_norm = np.linalg.norm(reduced_query)
+
+        with self.lock:
+            n = self.size
+            if n == 0 or query_norm == 0 or reduced_query_norm == 0:
+                return None, None, 0
+            if self.index is not None:
+                rows = self.index.search(query, self.top_k, self.matrix[:n])
+                if len(rows) == 0:
+                    return None, None, 0
+                matrix = self.matrix[rows]
+                norms = self.norms[rows]
+                reduced_norms = self.reduced_norms[rows]
+            else:
+                rows = None
+                matrix = self.matrix[:n]
+                norms = self.norms[:n]
+                reduced_norms = self.reduced_norms[:n]
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                # Metric 1: 전체 인코딩 코사인 유사도
+                dots = matrix @ query
+                cos_sim = dots / (norms * query_norm)
+
+                # Metric 2: 유클리드 거리 기반 유사도 (|a-b|² = |a|² + |b|² - 2a·b)
+                squared = np.maximum(norms * norms + query_norm * query_norm - 2.0 * dots, 0.0)
+                sim_euclid = np.maximum(0.0, 1.0 - np.sqrt(squared) / EUCLID_MAX)
+
+                # Metric 3: 압축 인코딩 (짝수 인덱스만) 코사인 유사도
+                cos_sim_reduced = (matrix[:, ::2] @ reduced_query) / (reduced_norms * reduced_query_norm)
+
+                overall = COSINE_WEIGHT * cos_sim + EUCLID_WEIGHT * sim_euclid + REDUCED_WEIGHT * cos_sim_reduced
+
+            # 노름이 0인 손상된 인코딩은 후보에서 제외
+            overall = np.where(np.isfinite(overall), overall, -np.inf)
+            best = int(np.argmax(overall))
+            best_similarity = float(overall[best])
+            if not best_similarity > 0:
+                return None, None, 0
+            if rows is not None:
+                best = int(rows[best])
+            return int(self.user_ids[best]), self.names[best], best_similarity
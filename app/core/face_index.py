@@ -0,0 +1,146 @@
+"""
+얼굴 인코딩 근사 최근접 이웃(ANN) 인덱스
+"""
+
+import os
+import numpy as np
+
+# 중심점과의 거리 계산 시 한 번에 처리할 행 수 (메모리 제한)
+_CHUNK_ROWS = 8192
+
+
+def _squared_distances(vectors, centroids, centroid_sq):
+    """각 벡터와 중심점 사이의 제곱 L2 거리"""
+    vector_sq = np.einsum('ij,ij->i', vectors, vectors)
+    return vector_sq[:, None] - 2.0 * (vectors @ centroids.T) + centroid_sq[None, :]
+
+
+def _nearest_centroid(vectors, centroids):
+    """각 벡터가 속할 중심점 인덱스"""
+    centroid_sq = np.einsum('ij,ij->i', centroids, centroids)
+    assignments = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), _CHUNK_ROWS):
+        chunk = vectors[start:start + _CHUNK_ROWS]
+        assignments[start:start + len(chunk)] = np.argmin(_squared_distances(chunk, centroids, centroid_sq), axis=1)
+    return assignments
+
+
+def _kmeans(vectors, k, iterations=10, max_samples_per_list=64, seed=0):
+    """학습 샘플에 대한 Lloyd k-means"""
+    rng = np.random.default_rng(seed)
+    n = len(vectors)
+    sample_size = min(n, k * max_samples_per_list)
+    sample = vectors[rng.choice(n, sample_size, replace=False)] if sample_size < n else vectors
+    centroids = sample[rng.choice(len(sample), k, replace=False)].copy()
+
+    for _ in range(iterations):
+        assignments = _nearest_centroid(sample, centroids)
+        counts = np.bincount(assignments, minlength=k)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, sample)
+        filled = counts > 0
+        centroids[filled] = sums[filled] / counts[filled, None]
+        # 비어 있는 리스트는 임의의 샘플로 다시 시작
+        empty = np.flatnonzero(~filled)
+        if len(empty):
+            centroids[empty] = sample[rng.choice(len(sample), len(empty), replace=False)]
+    return centroids
+
+
+class IVFIndex:
+    """Inverted File 인덱스 - k-means 중심점으로 분할 후 가까운 nprobe개 리스트만 탐색"""
+
+    kind = "ivf"
+
+    def __init__(self, nlist=None, nprobe=8):
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.centroids = None
+        self.assignments = np.empty(0, dtype=np.int32)
+        self.ntotal = 0
+        self._order = None
+        self._offsets = None
+
+    @property
+    def is_trained(self):
+        return self.centroids is not None
+
+    def train(self, vectors):
+        """중심점 학습 (nlist 미지정 시 sqrt(N))"""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        nlist = self.nlist or int(np.clip(np.sqrt(len(vectors)), 16, 4096))
+        nlist = min(nlist, len(vectors))
+        self.centroids = _kmeans(vectors, nlist)
+        self.nlist = nlist
+
+    def add(self, vectors):
+        """벡터를 가장 가까운 리스트에 추가 (행 순서는 갤러리와 동일)"""
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.centroids.shape[1])
+        new_assignments = _nearest_centroid(vectors, self.centroids)
+        self.assignments = np.concatenate([self.assignments[:self.ntotal], new_assignments])
+        self.ntotal += len(vectors)
+        self._order = None
+
+    def _build_lists(self):
+        """리스트별로 행 번호를 정렬해 두고 오프셋 계산"""
+        assignments = self.assignments[:self.ntotal]
+        self._order = np.argsort(assignments, kind='stable')
+        self._offsets = np.concatenate([[0], np.cumsum(np.bincount(assignments, minlength=self.nlist))])
+
+    def search(self, query, k, vectors):
+        """가까운 nprobe개 리스트에서 L2 기준 상위 k개 행 번호 반환"""
+        if self._order is None:
+            self._build_lists()
+        query = np.asarray(query, dtype=np.float32).reshape(1, -1)
+        centroid_sq = np.einsum('ij,ij->i', self.centroids, self.centroids)
+        centroid_dist = _squared_distances(query, self.centroids, centroid_sq)[0]
+        nprobe = min(self.nprobe, self.nlist)
+        probes = np.argpartition(centroid_dist, nprobe - 1)[:nprobe]
+
+        candidates = np.concatenate([self._order[self._offsets[p]:self._offsets[p + 1]] for p in probes])
+        if len(candidates) <= k:
+            return candidates
+        diff = vectors[candidates] - query
+        distances = np.einsum('ij,ij->i', diff, diff)
+        return candidates[np.argpartition(distances, k - 1)[:k]]
+
+    def save(self, path, user_ids):
+        """faces.db 옆에 인덱스 저장 (user_ids로 DB와의 일치 여부 확인)"""
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                centroids=self.centroids,
+                assignments=self.assignments[:self.ntotal],
+                user_ids=np.asarray(user_ids, dtype=np.int64),
+                nprobe=np.int64(self.nprobe)
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, user_ids, nprobe=None):
+        """저장된 인덱스 로드 - DB 사용자 목록과 다르면 None"""
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            if not np.array_equal(data["user_ids"], np.asarray(user_ids, dtype=np.int64)):
+                return None
+            index = cls(nlist=len(data["centroids"]), nprobe=nprobe or int(data["nprobe"]))
+            index.centroids = data["centroids"].astype(np.float32)
+            index.assignments = data["assignments"].astype(np.int32)
+        index.ntotal = len(index.assignments)
+        return index
+
+
+# 인덱스 종류 등록 (HNSW 등 추가 시 여기에 등록)
+INDEX_TYPES = {
+    IVFIndex.kind: IVFIndex,
+}
+
+
+def create_face_index(kind, **kwargs):
+    """인덱스 종류 이름으로 생성"""
+    index_class = INDEX_TYPES.get(kind)
+    if index_class is None:
+        raise ValueError(f"지원하지 않는 얼굴 인덱스입니다: {kind}")
+    return index_class(**kwargs)
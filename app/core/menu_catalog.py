@@ -0,0 +1,152 @@
+"""
+메뉴 카탈로그
+
+메뉴는 영업 중에 거의 바뀌지 않으므로 한 번 읽어 변경 불가능한 스냅샷(이름/카테고리
+인덱스 포함)으로 들고 있다가, 버전 표시(메뉴 DB의 PRAGMA data_version + 파일
+mtime/inode)가 바뀔 때만 다시 읽는다. 서버 /menu 의 ETag 캐시는 api_client.get_all_menus 참고.
+
+스냅샷은 통째로 교체되므로 읽는 쪽은 락 없이 사용한다.
+"""
+
+import collections
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from types import MappingProxyType
+from app.config import MENU_DB_PATH, MENU_CHECK_INTERVAL
+from app.core.schema import ensure_menu_schema
+
+MenuItem = collections.namedtuple("MenuItem", "menu_id menu_name category info price image")
+
+
+class MenuSnapshot:
+    """특정 시점의 메뉴 전체 (변경 불가)"""
+
+    def __init__(self, items):
+        self.items = tuple(items)
+        self.by_name = MappingProxyType({item.menu_name: item for item in self.items})
+        categories = collections.OrderedDict()
+        for item in self.items:
+            categories.setdefault(item.category, []).append(item)
+        self.by_category = MappingProxyType({name: tuple(items) for name, items in categories.items()})
+        # /menu 응답 본문 (기존 형식: [menu_name, price, image] 목록) - 요청마다 직렬화하지 않음
+        self.menu_json = json.dumps({"menu": [[item.menu_name, item.price, item.image] for item in self.items]},
+                                    ensure_ascii=False).encode("utf-8")
+        # 내용 해시 - 재시작해도 같은 메뉴면 같은 값 (HTTP ETag로 사용)
+        self.version = hashlib.sha1(json.dumps(self.items, ensure_ascii=False).encode("utf-8")).hexdigest()[:16]
+
+    def __len__(self):
+        return len(self.items)
+
+    def get(self, menu_name):
+        return self.by_name.get(menu_name)
+
+    def category(self, category):
+        return self.by_category.get(category, ())
+
+    @property
+    def categories(self):
+        return tuple(self.by_category)
+
+
+class MenuCatalog:
+    """버전 표시가 바뀔 때만 다시 읽는 메뉴 카탈로그 (하위 클래스가 _stamp/_load 구현)"""
+
+    def __init__(self, check_interval=MENU_CHECK_INTERVAL):
+        self.check_interval = check_interval
+        self.lock = threading.Lock()
+        self.stamp = None
+        self.checked_at = 0.0
+        self._snapshot = None
+
+    def snapshot(self):
+        """현재 메뉴 스냅샷 - check_interval마다 한 번만 변경 여부 확인"""
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - self.checked_at < self.check_interval:
+            return snapshot
+        with self.lock:
+            if self._snapshot is None or time.monotonic() - self.checked_at >= self.check_interval:
+                self._refresh()
+            return self._snapshot
+
+    def refresh(self):
+        """즉시 변경 여부 확인"""
+        with self.lock:
+            self._refresh()
+        return self._snapshot
+
+    def _refresh(self):
+        """lock 안에서 호출 - 버전이 바뀌었으면 다시 읽음"""
+        self.checked_at = time.monotonic()
+        stamp = self._stamp()
+        if self._snapshot is not None and stamp == self.stamp:
+            return
+        items = self._load()
+        if items is None:
+            # 읽기 실패 - 이전 스냅샷 유지
+            return
+        snapshot = MenuSnapshot(items)
+        if self._snapshot is None or snapshot.version != self._snapshot.version:
+            self._snapshot = snapshot
+            print(f"📋 메뉴 카탈로그 로드: {len(snapshot)}개 (버전 {snapshot.version})")
+        self.stamp = stamp
+
+    def _stamp(self):
+        raise NotImplementedError
+
+    def _load(self):
+        raise NotImplementedError
+
+
+class LocalMenuCatalog(MenuCatalog):
+    """로컬 메뉴 DB 기반 카탈로그"""
+
+    def __init__(self, db_path=MENU_DB_PATH, **kwargs):
+        super().__init__(**kwargs)
+        self.db_path = db_path
+        self.conn = None
+
+    def _connection(self):
+        # data_version은 연결마다 따로 세므로 항상 같은 연결로 확인 (lock 안에서만 사용)
+        if self.conn is None:
+            ensure_menu_schema(self.db_path)
+            self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        return self.conn
+
+    def _stamp(self):
+        """다른 연결(다른 프로세스 포함)이 커밋하면 data_version이 바뀜, 파일 교체는 inode/mtime으로 감지"""
+        # 메뉴 DB가 없으면 빈 메뉴로 만들지 않고 오류 (FileNotFoundError)
+        stat = os.stat(self.db_path)
+        file_stamp = (stat.st_ino, stat.st_mtime_ns)
+        if self.stamp is not None and self.stamp[0] != file_stamp:
+            # 파일이 바뀌었으면 열려 있던 연결은 예전 파일을 보고 있음
+            self.close()
+        data_version = self._connection().execute("PRAGMA data_version").fetchone()[0]
+        return file_stamp, data_version
+
+    def _load(self):
+        rows = self._connection().execute(
+            "SELECT menu_id, menu_name, category, info, price, image FROM menus ORDER BY menu_id").fetchall()
+        return [MenuItem(*row) for row in rows]
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def get_menu_catalog():
+    """프로세스 전체 공유 로컬 메뉴 카탈로그 (처음 호출 시 로드)"""
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = LocalMenuCatalog()
+            _catalog.snapshot()
+        return _catalog
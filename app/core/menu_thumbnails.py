@@ -0,0 +1,52 @@
+"""
+메뉴 썸네일 경로/생성
+
+원본 메뉴 이미지(1515x2083 RGBA PNG, 약 1MB)를 MENU_THUMB_SIZES 크기별로 줄여
+MENU_THUMB_DIR/<크기>/<menu_id>.png 에 저장한다. 화면은 요청 크기 이상인 가장 작은
+썸네일을 읽으므로 장바구니 항목 하나에 수십 KB만 디코딩한다.
+"""
+
+import os
+from app.config import MENU_IMAGE_DIR, MENU_THUMB_DIR, MENU_THUMB_SIZES
+
+
+def thumbnail_bucket(size):
+    """size(px) 이상인 가장 작은 썸네일 크기 (없으면 가장 큰 크기)"""
+    for bucket in sorted(MENU_THUMB_SIZES):
+        if bucket >= size:
+            return bucket
+    return max(MENU_THUMB_SIZES)
+
+
+def thumbnail_path(menu_id, bucket):
+    # menu_id는 정수만 허용 (이미지 경로 등이 들어와 하위 폴더가 생기지 않도록)
+    return os.path.join(MENU_THUMB_DIR, str(int(bucket)), f"{int(menu_id)}.png")
+
+
+def source_image_path(image):
+    """menus.image 값(data/menu_images/menu_imageN.png)에 해당하는 원본 PNG 경로"""
+    return os.path.join(MENU_IMAGE_DIR, os.path.basename(image))
+
+
+def build_thumbnail(source, menu_id, sizes=MENU_THUMB_SIZES):
+    """원본 하나로 크기별 썸네일 생성 - 생성한 (경로, 바이트) 목록 반환"""
+    from PIL import Image as PILImage
+
+    with PILImage.open(source) as image:
+        image = image.convert("RGBA")
+        # 투명한 여백을 잘라내서 같은 크기에 메뉴가 더 크게 보이도록
+        bbox = image.getchannel("A").getbbox()
+        if bbox:
+            image = image.crop(bbox)
+        results = []
+        for size in sizes:
+            thumb = image.copy()
+            # 긴 변을 size에 맞춤
+            thumb.thumbnail((size, size), PILImage.LANCZOS)
+            path = thumbnail_path(menu_id, size)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            thumb.save(tmp_path, format="PNG", optimize=True)
+            os.replace(tmp_path, path)
+            results.append((path, os.path.getsize(path)))
+    return results
@@ -0,0 +1,96 @@
+"""
+얼굴 인식 백그라운드 워커
+"""
+
+import threading
+import traceback
+
+
+class RecognitionWorker:
+    """최신 프레임 한 장만 보관하고 별도 스레드에서 인식 처리
+
+    UI 스레드는 submit()으로 프레임만 넘기고 바로 반환한다. 처리 중에 들어온
+    프레임은 마지막 한 장만 남기고 버리며, 결과는 Clock.schedule_once로
+    UI 스레드에 전달한다.
+    """
+
+    def __init__(self, process_fn, on_result):
+        self.process_fn = process_fn
+        self.on_result = on_result
+        self.condition = threading.Condition()
+        self.process_lock = threading.Lock()
+        self.latest_frame = None
+        self.running = False
+        self.generation = 0
+        self.thread = None
+        self.dropped_frames = 0
+
+    def start(self):
+        """워커 스레드 시작 - UI 스레드를 막지 않도록 이전 스레드는 기다리지 않음"""
+        with self.condition:
+            if self.running:
+                return
+            self.running = True
+            self.generation += 1
+            self.latest_frame = None
+            self.thread = threading.Thread(target=self._run, args=(self.generation,), daemon=True)
+            self.thread.start()
+        print("▶️ 얼굴 인식 워커 시작")
+
+    def stop(self):
+        """워커 스레드 중지 (진행 중인 결과는 폐기) - 처리 중인 프레임은 워커 스레드에서 마저 끝남"""
+        with self.condition:
+            if not self.running:
+                return
+            self.running = False
+            self.latest_frame = None
+            self.condition.notify_all()
+        print("⏹️ 얼굴 인식 워커 중지")
+
+    def submit(self, frame):
+        """최신 프레임 교체 - 아직 처리되지 않은 이전 프레임은 버림"""
+        with self.condition:
+            if not self.running:
+                return
+            if self.latest_frame is not None:
+                self.dropped_frames += 1
+            self.latest_frame = frame
+            self.condition.notify()
+
+    def _run(self, generation):
+        while True:
+            with self.condition:
+                while self.running and generation == self.generation and self.latest_frame is None:
+                    self.condition.wait()
+                if not self.running or generation != self.generation:
+                    return
+                frame = self.latest_frame
+                self.latest_frame = None
+
+            # 재시작 직후에는 이전 스레드가 아직 process_fn 안에 있을 수 있으므로 한 번에 하나만 실행
+            # (face_detection의 모듈 전역 상태를 두 스레드가 동시에 바꾸지 않도록)
+            with self.process_lock:
+                if generation != self.generation:
+                    return
+                try:
+                    result = self.process_fn(frame)
+                except Exception as e:
+                    print(f"얼굴 인식 처리 중 오류 발생: {e}")
+                    print(traceback.format_exc())
+                    continue
+
+            if generation != self.generation:
+                # 처리 중에 중지/재시작됨 - 이전 실행의 결과는 버림
+                return
+            self._post_result(generation, result)
+
+    def _post_result(self, generation, result):
+        """UI 스레드에서 결과 콜백 실행"""
+        from kivy.clock import Clock
+
+        def deliver(dt):
+            # 중지 또는 재시작된 뒤 도착한 결과는 무시
+            if self.running and generation == self.generation:
+                self.on_result(result)
+
+        Clock.schedule_once(deliver)
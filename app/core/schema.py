@@ -0,0 +1,183 @@
+"""
+데이터베이스 스키마와 마이그레이션
+
+DB 파일마다 자기 마이그레이션 목록을 가진다.
+
+- KIOSK_MIGRATIONS: 키오스크 로컬 DB(DB_PATH) - users, orders, outbox
+- MENU_MIGRATIONS: 메뉴 DB(MENU_DB_PATH) - menus
+
+PRAGMA user_version에 적용된 버전을 기록하고, 앱이 DB를 처음 열 때 그 뒤의
+마이그레이션만 순서대로 하나의 트랜잭션씩 적용한다. 이미 최신이면 파일에 쓰지 않는다.
+
+새 변경은 기존 함수를 고치지 말고 해당 목록 끝에 함수를 추가할 것.
+"""
+
+import os
+import sqlite3
+import threading
+from app.core.db_pool import get_pool
+
+# 테이블별 컬럼 정의 (CREATE TABLE 본문)
+TABLES = {
+    "users": """
+        user_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        face_encoding BLOB,
+        name TEXT NOT NULL,
+        phone TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP""",
+    "menus": """
+        menu_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        menu_name TEXT NOT NULL,
+        category TEXT NOT NULL,
+        info TEXT,
+        price REAL DEFAULT 3000,
+        image TEXT""",
+    "orders": """
+        order_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER,
+        total_price REAL,
+        ordered_menu TEXT,
+        status TEXT CHECK(status IN ('complete','cancel','refund','pending')),
+        ordered_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE SET NULL""",
+    "outbox": """
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        idempotency_key TEXT NOT NULL UNIQUE,
+        kind TEXT NOT NULL,
+        payload TEXT NOT NULL,
+        status TEXT NOT NULL DEFAULT 'pending',
+        attempts INTEGER NOT NULL DEFAULT 0,
+        next_attempt_at REAL NOT NULL DEFAULT 0,
+        last_error TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP""",
+}
+
+
+def _create(conn, table, name=None):
+    conn.execute(f"CREATE TABLE IF NOT EXISTS {name or table} ({TABLES[table]})")
+
+
+def _columns(conn, table):
+    """테이블 컬럼 이름 목록 (테이블이 없으면 빈 목록)"""
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def _rebuild(conn, table, columns, select_sql):
+    """예전 구조의 테이블을 새 구조로 다시 만들고 데이터 복사
+
+    새 테이블을 만들어 복사한 뒤 이름을 바꿈 (기존 테이블 이름을 바꾸면 다른
+    테이블의 외래 키가 바뀐 이름을 따라가므로)
+    """
+    _create(conn, table, f"{table}_new")
+    conn.execute(f"INSERT INTO {table}_new ({columns}) {select_sql}")
+    conn.execute(f"DROP TABLE {table}")
+    conn.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+    print(f"🛠️ {table} 테이블을 현재 스키마로 변환")
+
+
+def _v1_tables(conn):
+    """기본 테이블 생성 + 예전 Database.create_tables의 users 구조 변환"""
+    users = _columns(conn, "users")
+    if users and "user_id" not in users:
+        # users(id, name, face_encoding, created_at)
+        _rebuild(conn, "users", "user_id, face_encoding, name, created_at",
+                 "SELECT id, face_encoding, name, created_at FROM users")
+    _create(conn, "users")
+    _create(conn, "orders")
+
+
+def _v2_indexes(conn):
+    """자주 쓰는 조회용 인덱스"""
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_users_name ON users (name)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_orders_user_ordered_at ON orders (user_id, ordered_at)")
+
+
+def _v3_outbox(conn):
+    """서버 전송 outbox 테이블 (app/service/outbox.py)"""
+    _create(conn, "outbox")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_outbox_status ON outbox (status, id)")
+
+
+def _menu_v1_tables(conn):
+    """menus 테이블 생성 + 예전 Database.create_tables 구조 변환"""
+    menus = _columns(conn, "menus")
+    if menus and "menu_name" not in menus:
+        # menus(item, price, image)
+        _rebuild(conn, "menus", "menu_name, category, price, image",
+                 "SELECT item, '기타', price, image FROM menus")
+    _create(conn, "menus")
+
+
+def _menu_v2_indexes(conn):
+    """메뉴 이름/카테고리 조회용 인덱스"""
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_menus_menu_name ON menus (menu_name)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_menus_category ON menus (category)")
+
+
+# 순서대로 적용되는 마이그레이션 - 인덱스 + 1이 적용 후 user_version
+KIOSK_MIGRATIONS = [
+    _v1_tables,
+    _v2_indexes,
+    _v3_outbox,
+]
+MENU_MIGRATIONS = [
+    _menu_v1_tables,
+    _menu_v2_indexes,
+]
+
+
+def schema_version(db_path):
+    """db_path의 user_version (읽기 전용으로 열어 확인, 파일이 없으면 FileNotFoundError)"""
+    if not os.path.exists(db_path):
+        raise FileNotFoundError(f"DB 파일이 없습니다: {db_path}")
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def migrate(conn, migrations=KIOSK_MIGRATIONS):
+    """아직 적용하지 않은 마이그레이션을 하나씩 트랜잭션으로 적용하고 최종 버전 반환"""
+    latest = len(migrations)
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version > latest:
+        raise RuntimeError(f"DB 스키마 버전({version})이 앱({latest})보다 높습니다.")
+    for target in range(version + 1, latest + 1):
+        # sqlite3 모듈은 DDL에 트랜잭션을 자동으로 열지 않으므로 직접 시작
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            migrations[target - 1](conn)
+            conn.execute(f"PRAGMA user_version = {target}")
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        print(f"🛠️ DB 스키마 v{target} 적용")
+    return latest
+
+
+_migrated = set()
+_migrated_lock = threading.Lock()
+
+
+def ensure_schema(db_path, migrations=KIOSK_MIGRATIONS, create=True):
+    """db_path를 migrations 기준 최신 스키마로 맞춤 (프로세스에서 파일별로 한 번만 확인)
+
+    create=False이면 파일이 없을 때 새로 만들지 않고 FileNotFoundError 발생
+    """
+    with _migrated_lock:
+        if db_path in _migrated:
+            return
+        if not create or os.path.exists(db_path):
+            # 이미 최신이면 쓰기 연결(WAL 전환 포함)을 열지 않음
+            if schema_version(db_path) == len(migrations):
+                _migrated.add(db_path)
+                return
+        get_pool(db_path).transaction(lambda conn: migrate(conn, migrations))
+        _migrated.add(db_path)
+
+
+def ensure_menu_schema(db_path):
+    """메뉴 DB 스키마 확인 - 메뉴 DB는 배포되는 파일이므로 없으면 오류"""
+    ensure_schema(db_path, MENU_MIGRATIONS, create=False)
@@ -0,0 +1,156 @@
+"""
+STT 백엔드 모듈
+
+모든 백엔드는 16kHz mono float32 배열을 받아 같은 형태로 결과를 돌려줌
+    transcribe(audio) -> str
+    transcribe_segments(audio) -> [(start초, end초, text), ...]
+"""
+
+import threading
+import time
+from app.config import STT_BACKEND, STT_MODEL_SIZE, STT_LANGUAGE, STT_CPU_THREADS
+
+
+class STTBackend:
+    """STT 백엔드 기본 클래스"""
+
+    name = None
+
+    def __init__(self, model_size=STT_MODEL_SIZE, language=STT_LANGUAGE):
+        self.model_size = model_size
+        self.language = language
+        # 여러 루프가 같은 모델을 공유하므로 추론은 한 번에 하나씩
+        self.lock = threading.Lock()
+
+    def transcribe_segments(self, audio):
+        raise NotImplementedError
+
+    def transcribe(self, audio):
+        """오디오 전체를 텍스트로 변환"""
+        return " ".join(text for _, _, text in self.transcribe_segments(audio) if text).strip()
+
+
+class WhisperBackend(STTBackend):
+    """openai-whisper (PyTorch, CPU에서는 fp32)"""
+
+    name = "whisper"
+
+    def __init__(self, model_size=STT_MODEL_SIZE, language=STT_LANGUAGE):
+        super().__init__(model_size, language)
+        import whisper
+        self.model = whisper.load_model(model_size)
+
+    def _run(self, audio):
+        with self.lock:
+            return self.model.transcribe(
+                audio,
+                fp16=False,
+                language=self.language,
+                task="transcribe",
+                condition_on_previous_text=False,  # 이전 텍스트에 의존하지 않음
+                temperature=0.0,  # 낮은 temperature로 더 정확한 인식
+                no_speech_threshold=0.6,  # 음성이 없을 가능성이 높은 경우 무시
+                logprob_threshold=-1.0,  # 낮은 확률의 인식 결과 무시
+                compression_ratio_threshold=2.4,  # 압축률이 높은 경우 무시
+            )
+
+    def transcribe_segments(self, audio):
+        result = self._run(audio)
+        return [(seg["start"], seg["end"], seg["text"].strip()) for seg in result.get("segments", [])]
+
+    def transcribe(self, audio):
+        return self._run(audio).get("text", "").strip()
+
+
+class FasterWhisperBackend(STTBackend):
+    """faster-whisper (CTranslate2, int8 양자화)"""
+
+    name = "faster-whisper"
+
+    def __init__(self, model_size=STT_MODEL_SIZE, language=STT_LANGUAGE, compute_type="int8"):
+        super().__init__(model_size, language)
+        from faster_whisper import WhisperModel
+        self.model = WhisperModel(model_size, device="cpu", compute_type=compute_type, cpu_threads=STT_CPU_THREADS)
+
+    def transcribe_segments(self, audio):
+        with self.lock:
+            segments, _ = self.model.transcribe(
+                audio,
+                language=self.language,
+                task="transcribe",
+                beam_size=1,
+                temperature=0.0,
+                condition_on_previous_text=False,
+                no_speech_threshold=0.6,
+                log_prob_threshold=-1.0,
+                compression_ratio_threshold=2.4,
+            )
+            # segments는 제너레이터라 lock 안에서 끝까지 디코딩
+            return [(seg.start, seg.end, seg.text.strip()) for seg in segments]
+
+
+class WhisperCppBackend(STTBackend):
+    """whisper.cpp (pywhispercpp 바인딩, ggml 양자화 모델)"""
+
+    name = "whisper-cpp"
+
+    def __init__(self, model_size=STT_MODEL_SIZE, language=STT_LANGUAGE):
+        super().__init__(model_size, language)
+        from pywhispercpp.model import Model
+        self.model = Model(model_size, n_threads=STT_CPU_THREADS, print_progress=False, print_realtime=False)
+
+    def transcribe_segments(self, audio):
+        with self.lock:
+            segments = self.model.transcribe(audio, language=self.language)
+        # whisper.cpp 타임스탬프는 10ms 단위
+        return [(seg.t0 / 100.0, seg.t1 / 100.0, seg.text.strip()) for seg in segments]
+
+
+STT_BACKENDS = {
+    WhisperBackend.name: WhisperBackend,
+    FasterWhisperBackend.name: FasterWhisperBackend,
+    WhisperCppBackend.name: WhisperCppBackend,
+}
+
+
+def create_stt_backend(name=None, model_size=None):
+    """config의 STT_BACKEND / STT_MODEL_SIZE (또는 인자)로 백엔드 생성"""
+    name = name or STT_BACKEND
+    model_size = model_size or STT_MODEL_SIZE
+    backend_class = STT_BACKENDS.get(name)
+    if backend_class is None:
+        raise ValueError(f"지원하지 않는 STT 백엔드입니다: {name}")
+    print(f"🔧 STT 백엔드 로드: {name} ({model_size})")
+    return backend_class(model_size)
+
+
+# 프로세스 전체 공유 모델 (backend 이름, 모델 크기) -> 인스턴스
+_backends = {}
+_backends_lock = threading.Lock()
+
+
+def get_stt_backend(name=None, model_size=None):
+    """공유 STT 백엔드 반환 - 처음 요청될 때 한 번만 로드
+
+    다른 스레드가 로드 중이면 끝날 때까지 기다렸다가 같은 인스턴스를 받음
+    """
+    key = (name or STT_BACKEND, model_size or STT_MODEL_SIZE)
+    with _backends_lock:
+        backend = _backends.get(key)
+        if backend is None:
+            start = time.time()
+            backend = create_stt_backend(*key)
+            _backends[key] = backend
+            print(f"✅ STT 모델 로드 완료 ({time.time() - start:.1f}초)")
+        return backend
+
+
+def preload_stt_backend(name=None, model_size=None):
+    """백그라운드 스레드에서 공유 STT 모델 미리 로드"""
+    def load():
+        try:
+            get_stt_backend(name, model_size)
+        except Exception as e:
+            print(f"❌ STT 모델 미리 로드 실패: {e}")
+
+    threading.Thread(target=load, daemon=True).start()
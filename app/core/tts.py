@@ -2,14 +2,18 @@
 텍스트를 음성으로 변환하는 TTS 모듈
 """
 
+import io
 import os
+import re
+import queue
 import threading
-import tempfile
 import glob
 import time
-import subprocess
-from pydub import AudioSegment
-import pygame
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from app.core.tts_cache import tts_cache, cache_key
+from app.core.audio_output import AudioClip, audio_output, PRIORITY_NORMAL
+from app.config import TTS_CHUNK_MIN_CHARS, TTS_PREFETCH, TTS_SAMPLE_RATE, TTS_SYNTH_WORKERS
 
 # Google Cloud TTS 대신 gTTS 사용
 try:
@@ -20,6 +24,16 @@ except ImportError:
     USE_GTTS = False
     print("⚠️ gTTS 라이브러리를 찾을 수 없습니다. pip install gTTS로 설치하세요.")
     
+# gTTS의 MP3 응답은 libsndfile(1.1 이상, MP3 지원)로 프로세스 안에서 디코딩
+try:
+    import soundfile
+    USE_SOUNDFILE_MP3 = "MP3" in soundfile.available_formats()
+    if not USE_SOUNDFILE_MP3:
+        print("⚠️ libsndfile이 MP3를 지원하지 않습니다. pip install -U soundfile로 업데이트하세요.")
+except ImportError:
+    USE_SOUNDFILE_MP3 = False
+    print("⚠️ soundfile 라이브러리를 찾을 수 없습니다. gTTS 음성을 디코딩하려면 pip install soundfile로 설치하세요.")
+
 # Google Cloud TTS는 선택적으로 사용
 try:
     from google.cloud import texttospeech
@@ -29,8 +43,57 @@ except ImportError:
     USE_GOOGLE_CLOUD = False
     print("⚠️ Google Cloud TTS 라이브러리를 찾을 수 없습니다.")
 
+class SpeechRequest:
+    """speak() 요청 하나 - 합성이 끝나기 전에도 취소/대기 가능
+
+    on_finished(completed)는 재생이 끝나거나 취소/실패했을 때 한 번 호출된다
+    (UI 갱신은 호출하는 쪽에서 Clock.schedule_once로 넘길 것).
+    """
+
+    def __init__(self, priority=PRIORITY_NORMAL, interrupt=False, on_finished=None):
+        self.priority = priority
+        self.interrupt = interrupt
+        self.on_finished = on_finished
+        self.playback = None
+        self.cancelled = False
+        self.completed = False
+        self.queued = threading.Event()  # 출력 대기열에 넣었거나 포기함
+        self.done = threading.Event()
+        self.lock = threading.Lock()
+
+    def cancel(self):
+        """합성 중이면 재생하지 않고, 재생 중이면 중단"""
+        with self.lock:
+            self.cancelled = True
+            playback = self.playback
+        if playback is not None:
+            playback.cancel()
+        else:
+            self._finish(False)
+
+    def wait(self, timeout=None):
+        return self.done.wait(timeout)
+
+    def _finish(self, completed):
+        with self.lock:
+            if self.done.is_set():
+                return
+            self.completed = completed
+            self.done.set()
+        self.queued.set()
+        if self.on_finished is not None:
+            try:
+                self.on_finished(completed)
+            except Exception as e:
+                print(f"❌ 음성 완료 콜백 오류: {str(e)}")
+
+
 class TTSManager:
-    """TTS 관리 클래스"""
+    """TTS 관리 클래스 - get_tts_manager()로 공유 인스턴스를 받아 사용
+
+    합성은 공유 워커 풀에서, 재생은 공유 오디오 출력 대기열에서 처리하므로
+    여러 화면에서 동시에 요청해도 음성이 겹치지 않고 요청 순서대로 재생된다.
+    """
     
     def __init__(self):
         """TTS 초기화"""
@@ -47,9 +110,11 @@ class TTSManager:
             os.makedirs(self.audio_dir)
             print(f"✅ 오디오 디렉토리 생성: {self.audio_dir}")
             
-        self.temp_dir = self.audio_dir  # 임시 디렉토리 대신 오디오 디렉토리 사용
-        self.play_lock = threading.Lock()
-        self.is_playing = False
+        self.cache = tts_cache
+        self.output = audio_output
+        self.synth_pool = ThreadPoolExecutor(max_workers=TTS_SYNTH_WORKERS, thread_name_prefix="tts")
+        self.request_lock = threading.Lock()
+        self.last_request = None
         
         # Google Cloud TTS 초기화 (선택적)
         if USE_GOOGLE_CLOUD:
@@ -84,7 +149,8 @@ class TTSManager:
                 ssml_gender=texttospeech.SsmlVoiceGender.MALE  # 성별 설정 (남성)
             )
             self.audio_config = texttospeech.AudioConfig(
-                audio_encoding=texttospeech.AudioEncoding.MP3,  # MP3 포맷으로 음성 출력
+                audio_encoding=texttospeech.AudioEncoding.LINEAR16,  # 디코딩 없이 바로 재생 가능한 PCM
+                sample_rate_hertz=TTS_SAMPLE_RATE,
                 speaking_rate=1.5  # 말하기 속도 증가 (1.0이 기본, 1.5는 50% 빠름)
             )
         except Exception as e:
@@ -93,6 +159,12 @@ class TTSManager:
             self.voice = None
             self.audio_config = None
             
+    def _cache_params(self):
+        """현재 사용하는 백엔드의 (목소리, 속도, 백엔드) - 캐시 키에 사용"""
+        if USE_GOOGLE_CLOUD and self.client:
+            return "ko-KR-MALE", 1.5, "google-cloud-linear16"
+        return "ko", 1.0, "gtts"
+
     def _find_credentials_file(self, config_dir):
         """인증 파일 찾기"""
         # 가능한 파일 이름 목록
@@ -122,166 +194,264 @@ class TTSManager:
         try:
             print("🔊 TTS 기능 테스트 시작")
             test_text = "안녕하세요. TTS 테스트입니다."
-            test_file_mp3 = os.path.join(self.temp_dir, "tts_test.mp3")
-            test_file_wav = os.path.join(self.temp_dir, "tts_test.wav")
-            
-            # 음성 합성
-            if USE_GOOGLE_CLOUD and self.client:
-                # Google Cloud TTS 사용
-                input_text = texttospeech.SynthesisInput(text=test_text)
-                response = self.client.synthesize_speech(
-                    input=input_text, 
-                    voice=self.voice, 
-                    audio_config=self.audio_config
-                )
-                
-                # 파일 저장
-                with open(test_file_mp3, "wb") as out:
-                    out.write(response.audio_content)
-            elif USE_GTTS:
-                # gTTS 사용
-                tts = gTTS(text=test_text, lang='ko')
-                tts.save(test_file_mp3)
-            else:
-                print("❌ 사용 가능한 TTS 라이브러리가 없습니다.")
+            clip = self.synthesize(test_text)
+            if clip is None:
                 return
-                
-            # MP3를 WAV로 변환
-            audio = AudioSegment.from_mp3(test_file_mp3)
-            audio.export(test_file_wav, format="wav")
-                
-            print(f"✅ 테스트 음성 파일 생성 완료: {test_file_wav}")
-            
-            # 음성 재생 (별도 스레드에서)
-            threading.Thread(target=self._play_test_audio, args=(test_file_wav,)).start()
-            
+            print(f"✅ 테스트 음성 생성 완료 ({clip.duration:.1f}초)")
+            self.output.play(clip)
         except Exception as e:
             print(f"❌ TTS 테스트 중 오류: {str(e)}")
-            
-    def _play_test_audio(self, audio_file):
-        """테스트 음성 재생"""
-        try:
-            time.sleep(1)  # 잠시 대기
-            print(f"▶️ 테스트 음성 재생 시작: {audio_file}")
-            
-            # pygame으로 오디오 재생
-            pygame.mixer.init()
-            pygame.mixer.music.load(audio_file)
-            pygame.mixer.music.play()
-            while pygame.mixer.music.get_busy():
-                pygame.time.Clock().tick(10)
-            pygame.mixer.quit()
-                
-            print("✅ 테스트 음성 재생 완료")
-        except Exception as e:
-            print(f"❌ 테스트 음성 재생 중 오류: {str(e)}")
-        
+
+    def _decode_mp3(self, mp3_bytes):
+        """MP3 바이트를 libsndfile로 메모리에서 디코딩 (ffmpeg 프로세스/임시 파일 없음)"""
+        if not USE_SOUNDFILE_MP3:
+            raise RuntimeError("MP3 디코딩에 필요한 soundfile(libsndfile 1.1 이상)이 없습니다.")
+        samples, sample_rate = soundfile.read(io.BytesIO(mp3_bytes), dtype="int16", always_2d=True)
+        if samples.shape[1] > 1:
+            samples = samples.mean(axis=1).astype(np.int16)
+        # 출력 스트림 샘플레이트와 다르면 재생 시 AudioOutput에서 리샘플링
+        return AudioClip(samples.reshape(-1), sample_rate)
+
+    def _fetch(self, text):
+        """TTS 백엔드에서 음성을 받아 메모리 PCM 클립으로 변환"""
+        # Google Cloud TTS 사용 (가능한 경우) - LINEAR16 응답은 WAV 헤더가 붙은 PCM
+        if USE_GOOGLE_CLOUD and self.client:
+            print("🔊 Google Cloud TTS 사용")
+            input_text = texttospeech.SynthesisInput(text=text)
+            response = self.client.synthesize_speech(
+                input=input_text,
+                voice=self.voice,
+                audio_config=self.audio_config
+            )
+            return AudioClip.from_wav_bytes(response.audio_content)
+        # gTTS 사용 (대체 방법) - MP3만 제공하므로 메모리에서 디코딩
+        if USE_GTTS:
+            print("🔊 gTTS 사용")
+            buffer = io.BytesIO()
+            tts = gTTS(text=text, lang='ko', slow=False)  # slow=False로 설정하여 최대 속도 사용
+            tts.write_to_fp(buffer)
+            return self._decode_mp3(buffer.getvalue())
+        print("❌ 사용 가능한 TTS 라이브러리가 없습니다.")
+        return None
+
     def synthesize(self, text, save_path=None):
-        """텍스트를 음성으로 변환"""
+        """텍스트를 음성으로 변환 - AudioClip 반환 (save_path를 주면 WAV로도 저장)"""
         try:
             print(f"🔊 음성 합성 시작: {text[:20]}...")
-            
-            # 임시 파일 경로 설정
-            if save_path is None:
-                save_path_mp3 = os.path.join(self.temp_dir, "tts_output.mp3")
-                save_path_wav = os.path.join(self.temp_dir, "tts_output.wav")
+
+            # 캐시에 있으면 네트워크 요청과 디코딩 없이 바로 사용
+            voice, rate, backend = self._cache_params()
+            key = cache_key(text, voice, rate, backend)
+            clip = self.cache.get(key)
+            if clip is not None:
+                print("✅ TTS 캐시 사용")
             else:
-                save_path_mp3 = save_path.replace(".wav", ".mp3")
-                save_path_wav = save_path
-                
-            # Google Cloud TTS 사용 (가능한 경우)
-            if USE_GOOGLE_CLOUD and self.client:
-                print("🔊 Google Cloud TTS 사용")
-                input_text = texttospeech.SynthesisInput(text=text)
-                response = self.client.synthesize_speech(
-                    input=input_text, 
-                    voice=self.voice, 
-                    audio_config=self.audio_config
-                )
-                
-                # 파일 저장
-                with open(save_path_mp3, "wb") as out:
-                    out.write(response.audio_content)
-            # gTTS 사용 (대체 방법)
-            elif USE_GTTS:
-                print("🔊 gTTS 사용")
-                try:
-                    # gTTS는 속도 조절이 직접적으로 지원되지 않으므로 텍스트를 줄여서 속도 효과를 냄
-                    tts = gTTS(text=text, lang='ko', slow=False)  # slow=False로 설정하여 최대 속도 사용
-                    tts.save(save_path_mp3)
-                    print("✅ gTTS 음성 생성 완료")
-                except Exception as e:
-                    print(f"❌ gTTS 사용 중 오류: {str(e)}")
+                clip = self._fetch(text)
+                if clip is None:
                     return None
-            else:
-                print("❌ 사용 가능한 TTS 라이브러리가 없습니다.")
-                return None
-                
-            # MP3를 WAV로 변환
-            try:
-                audio = AudioSegment.from_mp3(save_path_mp3)
-                audio.export(save_path_wav, format="wav")
-                print("✅ MP3를 WAV로 변환 완료")
-            except Exception as e:
-                print(f"❌ MP3를 WAV로 변환 중 오류: {str(e)}")
-                return None
-                
-            print(f"✅ 음성 파일 저장 완료: {save_path_wav}")
-            return save_path_wav
-            
+                self.cache.put(key, clip)
+                print(f"✅ 음성 합성 완료 ({clip.duration:.1f}초)")
+
+            if save_path:
+                with open(save_path, "wb") as f:
+                    f.write(clip.to_wav_bytes())
+                print(f"✅ 음성 파일 저장 완료: {save_path}")
+            return clip
+
         except Exception as e:
             print(f"❌ 음성 합성 중 오류: {str(e)}")
             return None
-            
-    def play_audio(self, audio_path=None, text=None):
-        """음성 재생"""
+
+    def speak(self, text=None, audio_path=None, priority=PRIORITY_NORMAL, interrupt=False, on_finished=None):
+        """텍스트 또는 WAV 파일을 비동기로 재생하고 SpeechRequest 반환
+
+        합성은 워커 풀에서 병렬로 진행되지만 재생 대기열에는 요청 순서대로 들어감
+        """
+        request = SpeechRequest(priority, interrupt, on_finished)
+        with self.request_lock:
+            previous, self.last_request = self.last_request, request
+        self.synth_pool.submit(self._run_request, request, previous, text, audio_path)
+        return request
+
+    def _run_request(self, request, previous, text, audio_path):
+        clip = None
         try:
-            with self.play_lock:
-                if self.is_playing:
-                    print("⏳ 이미 재생 중입니다.")
+            if request.cancelled:
+                return
+            # 텍스트가 제공된 경우 음성 합성 후 재생
+            if text:
+                clip = self.synthesize(text)
+            elif audio_path and os.path.exists(audio_path):
+                clip = AudioClip.from_wav_file(audio_path)
+            if clip is None:
+                print("❌ 재생할 음성이 없습니다.")
+                return
+
+            # 앞선 요청이 먼저 대기열에 들어간 뒤에 추가
+            if previous is not None:
+                previous.queued.wait()
+            with request.lock:
+                if request.cancelled:
                     return
-                    
-                self.is_playing = True
-                
-                # 텍스트가 제공된 경우 음성 합성 후 재생
-                if text:
-                    audio_path = self.synthesize(text)
-                    
-                if audio_path and os.path.exists(audio_path):
-                    print(f"▶️ 음성 재생 시작: {audio_path}")
-                    
-                    # pygame으로 오디오 재생
-                    pygame.mixer.init()
-                    pygame.mixer.music.load(audio_path)
-                    pygame.mixer.music.play()
-                    while pygame.mixer.music.get_busy():
-                        pygame.time.Clock().tick(10)
-                    pygame.mixer.quit()
-                        
-                    print("✅ 음성 재생 완료")
-                else:
-                    print("❌ 재생할 음성 파일이 없습니다.")
-                    
+                print(f"▶️ 음성 재생 시작 ({clip.duration:.1f}초)")
+                request.playback = self.output.play(
+                    clip, request.priority, request.interrupt,
+                    on_finished=lambda playback, completed: request._finish(completed)
+                )
+            request.queued.set()
         except Exception as e:
             print(f"❌ 음성 재생 중 오류: {str(e)}")
         finally:
-            self.is_playing = False
-            
-    def play_async(self, text):
+            if request.playback is None:
+                request._finish(False)
+
+    def play_audio(self, audio_path=None, text=None):
+        """음성 재생 (WAV 파일 경로 또는 텍스트) - 재생이 끝날 때까지 대기"""
+        self.speak(text=text, audio_path=audio_path).wait()
+
+    def play_async(self, text, **kwargs):
         """비동기로 음성 재생"""
-        threading.Thread(target=self.play_audio, args=(None, text)).start()
-        
-# 싱글톤 인스턴스 생성
-tts_manager = TTSManager()
+        return self.speak(text=text, **kwargs)
+
+    def play_stream(self, text=None):
+        """문장 단위 파이프라인 재생 - 첫 문장만 합성되면 바로 재생 시작
+
+        text를 주면 전체를 넣고 바로 finish(), 없으면 반환된 스트림에 feed()로 이어서 넣음
+        """
+        stream = SpeechStream(self)
+        if text:
+            stream.feed(text)
+            stream.finish()
+        return stream
+
+
+# 문장 경계: 문장부호 뒤 공백 또는 줄바꿈 ("4.5" 같은 숫자는 나누지 않음)
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?。！？])\s+|\n+")
+
+
+class SpeechStream:
+    """문장 N을 재생하는 동안 문장 N+1을 합성하는 재생 스트림
+
+    합성 스레드가 문장을 PCM 클립으로 만들어 넘기면 재생 스레드가 공유 출력
+    스트림 대기열에 이어서 넣으므로 문장 사이에 끊김 없이 하나의 음성처럼 재생된다.
+    """
+
+    def __init__(self, manager, min_chars=TTS_CHUNK_MIN_CHARS, prefetch=TTS_PREFETCH):
+        self.manager = manager
+        self.min_chars = min_chars
+        self.text_queue = queue.Queue()
+        # 재생보다 너무 앞서 합성하지 않도록 제한
+        self.audio_queue = queue.Queue(maxsize=prefetch)
+        self.buffer = ""
+        self.carry = ""
+        self.stopped = False
+        self.finished = threading.Event()
+        self.start_time = time.time()
+        self.first_audio_time = None
+        self.playbacks = []
+        threading.Thread(target=self._synth_loop, daemon=True).start()
+        threading.Thread(target=self._play_loop, daemon=True).start()
+
+    def feed(self, text):
+        """텍스트 추가 - 완성된 문장부터 합성 대기열에 넣음"""
+        if self.stopped:
+            return
+        self.buffer += text
+        parts = SENTENCE_BOUNDARY.split(self.buffer)
+        # 마지막 조각은 아직 끝나지 않은 문장일 수 있으므로 남겨둠
+        self.buffer = parts.pop()
+        for part in parts:
+            self._put_sentence(part)
+
+    def finish(self):
+        """남은 텍스트까지 합성하고 재생이 끝나면 종료"""
+        if self.stopped:
+            return
+        sentence = f"{self.carry} {self.buffer.strip()}".strip()
+        self.buffer = self.carry = ""
+        if sentence:
+            self.text_queue.put(sentence)
+        self.text_queue.put(None)
+
+    def stop(self):
+        """재생 중단 및 남은 문장 폐기"""
+        self.stopped = True
+        self.text_queue.put(None)
+        # 대기 중인 합성 결과를 비우고 재생 스레드를 깨움
+        while True:
+            try:
+                self.audio_queue.get_nowait()
+            except queue.Empty:
+                break
+        self.audio_queue.put_nowait(None)
+        for playback in self.playbacks:
+            playback.cancel()
+
+    def wait(self, timeout=None):
+        """재생이 끝날 때까지 대기"""
+        return self.finished.wait(timeout)
+
+    def _put_sentence(self, part):
+        self.carry = f"{self.carry} {part.strip()}".strip()
+        if len(self.carry) >= self.min_chars:
+            self.text_queue.put(self.carry)
+            self.carry = ""
+
+    def _synth_loop(self):
+        while not self.stopped:
+            text = self.text_queue.get()
+            if text is None or self.stopped:
+                break
+            # 합성은 공유 워커 풀에서 (동시 합성 수 제한)
+            clip = self.manager.synth_pool.submit(self.manager.synthesize, text).result()
+            if clip is not None and not self.stopped:
+                self.audio_queue.put(clip)
+        if not self.stopped:
+            self.audio_queue.put(None)
+
+    def _play_loop(self):
+        try:
+            while not self.stopped:
+                clip = self.audio_queue.get()
+                if clip is None or self.stopped:
+                    break
+                if self.first_audio_time is None:
+                    self.first_audio_time = time.time()
+                    print(f"▶️ 첫 문장 재생 시작 ({(self.first_audio_time - self.start_time) * 1000:.0f}ms)")
+                # 앞 문장이 끝나는 즉시 이어서 재생되도록 출력 대기열에 추가
+                self.playbacks.append(self.manager.output.play(clip))
+                # 출력 대기열에는 재생 중인 문장과 다음 문장까지만 넣음
+                if len(self.playbacks) >= 2:
+                    self.playbacks[-2].wait()
+            if self.playbacks:
+                self.playbacks[-1].wait()
+            print("✅ 스트리밍 음성 재생 완료")
+        except Exception as e:
+            print(f"❌ 스트리밍 음성 재생 중 오류: {str(e)}")
+        finally:
+            self.finished.set()
+
+# 프로세스 전체 공유 인스턴스 (처음 사용할 때 생성)
+_tts_manager = None
+_tts_manager_lock = threading.Lock()
+
+
+def get_tts_manager():
+    """공유 TTSManager 반환 - 화면에서는 TTSManager()를 직접 만들지 말 것"""
+    global _tts_manager
+    with _tts_manager_lock:
+        if _tts_manager is None:
+            _tts_manager = TTSManager()
+        return _tts_manager
 
 # 편의 함수
 def synthesize_text(text, save_path=None):
     """텍스트를 음성으로 변환"""
-    return tts_manager.synthesize(text, save_path)
+    return get_tts_manager().synthesize(text, save_path)
     
 def play_text(text):
     """텍스트를 음성으로 재생"""
-    tts_manager.play_async(text)
+    return get_tts_manager().play_async(text)
     
 # 직접 실행 시 테스트
 if __name__ == "__main__":
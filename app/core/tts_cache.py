@@ -0,0 +1,109 @@
+"""
+TTS 음성 디스크 캐시
+
+(텍스트, 목소리, 속도, 백엔드)의 sha256을 키로 바로 재생 가능한 PCM WAV를 저장.
+전체 크기가 TTS_CACHE_MAX_BYTES를 넘으면 가장 오래 사용하지 않은 파일부터 삭제.
+"""
+
+import os
+import hashlib
+import threading
+import time
+from app.config import TTS_CACHE_DIR, TTS_CACHE_MAX_BYTES
+from app.core.audio_output import AudioClip
+
+
+def cache_key(text, voice, rate, backend):
+    """캐시 키 - 같은 문장이라도 목소리/속도/백엔드가 다르면 다른 파일"""
+    raw = "\x1f".join([backend, voice, f"{rate:.3f}", text.strip()])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class TTSCache:
+    """content-addressed WAV 캐시 (LRU, 크기 제한)"""
+
+    def __init__(self, cache_dir=TTS_CACHE_DIR, max_bytes=TTS_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        # key -> [크기, 마지막 사용 시각]
+        self.entries = {}
+        self.total_bytes = 0
+        self._scan()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + ".wav")
+
+    def _scan(self):
+        """기존 캐시 파일 목록 읽기 (파일 mtime을 마지막 사용 시각으로 사용)"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        for filename in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, filename)
+            if filename.endswith(".tmp"):
+                # 쓰다가 중단된 파일
+                os.remove(path)
+                continue
+            if not filename.endswith(".wav"):
+                continue
+            stat = os.stat(path)
+            self.entries[filename[:-4]] = [stat.st_size, stat.st_mtime]
+            self.total_bytes += stat.st_size
+
+    def get(self, key):
+        """캐시된 음성 AudioClip (없으면 None)"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            path = self._path(key)
+            if not os.path.exists(path):
+                # 외부에서 지워진 경우
+                self.total_bytes -= entry[0]
+                del self.entries[key]
+                return None
+            entry[1] = time.time()
+            # 재시작 후에도 사용 순서가 유지되도록 mtime 갱신
+            os.utime(path, (entry[1], entry[1]))
+        try:
+            return AudioClip.from_wav_file(path)
+        except FileNotFoundError:
+            # 읽기 직전에 다른 스레드가 삭제한 경우
+            return None
+
+    def put(self, key, clip):
+        """합성된 AudioClip을 WAV로 저장"""
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(clip.to_wav_bytes())
+        os.replace(tmp_path, path)
+        size = os.path.getsize(path)
+
+        with self.lock:
+            old = self.entries.get(key)
+            if old is not None:
+                self.total_bytes -= old[0]
+            self.entries[key] = [size, time.time()]
+            self.total_bytes += size
+            self._evict(keep=key)
+
+    def _evict(self, keep=None):
+        """최대 크기를 넘으면 오래된 항목부터 삭제 (lock 안에서 호출)"""
+        if self.total_bytes <= self.max_bytes:
+            return
+        for key, (size, _) in sorted(self.entries.items(), key=lambda item: item[1][1]):
+            if self.total_bytes <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+            self.total_bytes -= size
+            del self.entries[key]
+            print(f"🗑️ TTS 캐시 삭제: {key[:12]}")
+
+
+# 프로세스 전체 공유 인스턴스
+tts_cache = TTSCache()
@@ -1,14 +1,23 @@
 class VADWhisperLoop:
-    def __init__(self, callback, model_size="medium", sample_rate=16000):
-        import whisper
+    def __init__(self, callback, model_size=None, sample_rate=16000, partial_callback=None, streaming=None,
+                 backend=None):
         import webrtcvad
         import numpy as np
         import sounddevice as sd
         import collections
         import threading
+        import queue
+        from app.config import STT_STREAMING, STT_STREAM_STEP
+        from app.core.stt_backends import get_stt_backend
 
         self.callback = callback
-        self.model = whisper.load_model(model_size)
+        self.partial_callback = partial_callback
+        # backend 이름/모델 크기를 지정하지 않으면 config의 STT_BACKEND / STT_MODEL_SIZE 사용
+        # 모델은 프로세스 전체에서 공유하며, UI 스레드를 막지 않도록 _run 스레드에서 가져옴
+        self.get_stt_backend = get_stt_backend
+        self.backend_name = backend
+        self.model_size = model_size
+        self.backend = None
         self.vad = webrtcvad.Vad(1)
         self.sd = sd
         self.np = np
@@ -30,20 +39,38 @@ class VADWhisperLoop:
         self.is_callback_processing = False
         self.api_request_in_progress = False
         self.api_request_complete = threading.Event()  # API 요청 완료 이벤트 추가
+
+        # 스트리밍 모드: 발화 중 일정 간격으로 구간 인식, 확정된 앞부분은 다시 인식하지 않음
+        self.streaming = STT_STREAMING if streaming is None else streaming
+        self.stream_step_frames = int(STT_STREAM_STEP * 1000 / self.frame_duration)
+        self.stream_jobs = queue.Queue()
+        self.utterance_id = 0
+        self.frames_since_partial = 0
+        self.partial_pending = False
+        self.committed_text = ""
+        self.committed_frames = 0
         print("🔧 VADWhisperLoop 초기화 완료")
 
     def start(self):
         print("▶️ VADWhisperLoop 시작")
         self.running = True
         self.threading.Thread(target=self._run, daemon=True).start()
+        if self.streaming:
+            self.threading.Thread(target=self._stream_worker, daemon=True).start()
 
     def stop(self):
         print("⏹️ VADWhisperLoop 중지")
         self.running = False
+        if self.streaming:
+            self.stream_jobs.put(None)
 
     def _run(self):
         print("🎤 VAD STT 루프 시작")
         try:
+            # 미리 로드 중이면 끝날 때까지 대기, 이미 로드됐으면 즉시 반환
+            self.backend = self.get_stt_backend(self.backend_name, self.model_size)
+            if not self.running:
+                return
             with self.sd.InputStream(channels=1, samplerate=self.sample_rate, dtype='int16',
                                      blocksize=self.frame_size, callback=self._audio_callback):
                 while self.running:
@@ -71,16 +98,33 @@ class VADWhisperLoop:
                 print("🎙 음성 감지 시작")
             self.audio_data.append(indata.copy())
             self.silence_counter = 0
+            if self.streaming:
+                self._request_partial()
         else:
             if self.triggered:
                 self.silence_counter += 1
                 if self.silence_counter > self.max_silence:
                     self.triggered = False
                     print("🔇 음성 종료 - 추론 시작")
-                    self._process_audio()
+                    if self.streaming:
+                        self._request_final()
+                    else:
+                        self._process_audio()
                     self.audio_data.clear()
                     self.silence_counter = 0
 
+    def _transcribe(self, audio_np):
+        """STT 추론 - 인식된 텍스트 반환"""
+        return self.backend.transcribe(audio_np)
+
+    def _transcribe_segments(self, audio_np):
+        """STT 추론 - [(start초, end초, text), ...] 반환"""
+        return self.backend.transcribe_segments(audio_np)
+
+    def _frames_to_audio(self, frames):
+        """int16 프레임 목록을 float32 [-1, 1] 배열로 변환"""
+        return self.np.concatenate(frames, axis=0).flatten().astype(self.np.float32) / 32768.0
+
     def _process_audio(self):
         print("🔊 오디오 처리 시작")
         if len(self.audio_data) < self.min_voice_frames:
@@ -95,23 +139,8 @@ class VADWhisperLoop:
             self.is_processing = True
             try:
                 print("🎯 STT 추론 시작")
-                audio_np = self.np.concatenate(self.audio_data, axis=0).flatten().astype(self.np.float32) / 32768.0
-                
-                # 한국어와 영어만 처리하도록 설정
-                result = self.model.transcribe(
-                    audio_np,
-                    fp16=False,
-                    language="ko",  # 기본 언어를 한국어로 설정
-                    task="transcribe",
-                    # 한국어와 영어만 인식하도록 설정
-                    condition_on_previous_text=False,  # 이전 텍스트에 의존하지 않음
-                    temperature=0.0,  # 낮은 temperature로 더 정확한 인식
-                    no_speech_threshold=0.6,  # 음성이 없을 가능성이 높은 경우 무시
-                    logprob_threshold=-1.0,  # 낮은 확률의 인식 결과 무시
-                    compression_ratio_threshold=2.4,  # 압축률이 높은 경우 무시
-                )
-                
-                text = result.get("text", "").strip()
+                audio_np = self._frames_to_audio(self.audio_data)
+                text = self._transcribe(audio_np)
                 print(f"📝 인식된 텍스트: {text}")
                 
                 if text and self.callback:
@@ -124,6 +153,92 @@ class VADWhisperLoop:
                 self.is_processing = False
                 print("✅ 오디오 처리 완료")
 
+    def _request_partial(self):
+        """발화 중 STT_STREAM_STEP마다 중간 인식 요청 (처리 대기 중이면 생략)"""
+        self.frames_since_partial += 1
+        if self.frames_since_partial < self.stream_step_frames or self.partial_pending:
+            return
+        self.frames_since_partial = 0
+        self.partial_pending = True
+        self.stream_jobs.put(("partial", self.utterance_id, list(self.audio_data)))
+
+    def _request_final(self):
+        """발화 종료 - 확정되지 않은 마지막 구간만 인식하도록 요청"""
+        frames = list(self.audio_data)
+        utterance_id = self.utterance_id
+        # 이후 도착하는 이전 발화의 중간 요청은 무시됨
+        self.utterance_id += 1
+        self.frames_since_partial = 0
+        if len(frames) < self.min_voice_frames:
+            print("🛑 무시할 정도로 짧은 음성")
+            self.stream_jobs.put(("reset", utterance_id, None))
+            return
+        # 마지막 구간 인식이 끝날 때까지 음성 감지 중단
+        self.is_processing = True
+        self.stream_jobs.put(("final", utterance_id, frames))
+
+    def _stream_worker(self):
+        """스트리밍 인식 작업 처리 (오디오 콜백 스레드를 막지 않도록 별도 스레드)"""
+        while self.running:
+            job = self.stream_jobs.get()
+            if job is None:
+                break
+            kind, utterance_id, frames = job
+            try:
+                if kind == "partial":
+                    if utterance_id == self.utterance_id:
+                        self._process_partial(frames)
+                elif kind == "final":
+                    self._process_final(frames)
+            except Exception as e:
+                print(f"❌ 스트리밍 음성 처리 중 오류: {str(e)}")
+            finally:
+                if kind == "partial":
+                    self.partial_pending = False
+                else:
+                    # 발화 종료 - 확정 상태 초기화
+                    self.committed_text = ""
+                    self.committed_frames = 0
+                    self.is_processing = False
+
+    def _join_text(self, *parts):
+        return " ".join(part.strip() for part in parts if part and part.strip())
+
+    def _process_partial(self, frames):
+        """확정되지 않은 구간만 인식하고, 마지막 세그먼트 앞부분은 확정"""
+        pending = frames[self.committed_frames:]
+        if len(pending) < self.min_voice_frames:
+            return
+        segments = self._transcribe_segments(self._frames_to_audio(pending))
+        if not segments:
+            return
+
+        if len(segments) > 1:
+            # 뒤에 세그먼트가 이어진 앞부분은 더 이상 바뀌지 않는 것으로 보고 확정
+            stable = segments[:-1]
+            self.committed_text = self._join_text(self.committed_text, *(text for _, _, text in stable))
+            self.committed_frames += int(stable[-1][1] * 1000 / self.frame_duration)
+        partial_text = self._join_text(self.committed_text, segments[-1][2])
+        print(f"📝 중간 인식: {partial_text}")
+
+        if partial_text and self.partial_callback:
+            from kivy.clock import Clock
+            Clock.schedule_once(lambda dt: self.partial_callback(partial_text))
+
+    def _process_final(self, frames):
+        """마지막 구간만 인식해 확정 텍스트와 합친 최종 결과 전달"""
+        print("🎯 STT 최종 추론 시작")
+        pending = frames[self.committed_frames:]
+        tail_text = ""
+        if pending:
+            tail_text = self._transcribe(self._frames_to_audio(pending))
+        text = self._join_text(self.committed_text, tail_text)
+        print(f"📝 인식된 텍스트: {text}")
+
+        if text and self.callback:
+            print("🔄 콜백 호출 시작")
+            self.threading.Thread(target=self._safe_callback, args=(text,), daemon=True).start()
+
     def _safe_callback(self, text):
         """안전한 콜백 실행"""
         print("🔄 _safe_callback 시작")
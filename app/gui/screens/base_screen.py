@@ -10,12 +10,15 @@ from kivy.uix.image import Image
 from kivy.core.text import LabelBase
 from kivy.clock import Clock
 from kivy.graphics import Color, RoundedRectangle
-from app.config import BOLD_FONT_PATH, LIGHT_FONT_PATH, BACK_IMG
-import cv2
+from app.config import BOLD_FONT_PATH, LIGHT_FONT_PATH, BACK_IMG, TRACKING_FPS
 import time
 from app.core.face_detection import track_target_face, MAX_LOST_FRAMES
+from app.core.camera_service import camera_service
 
 class BaseScreen(Screen):
+    # 카메라 프레임 구독 주기 (화면별로 재정의)
+    camera_fps = TRACKING_FPS
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.layout = FloatLayout()
@@ -44,19 +47,17 @@ class BaseScreen(Screen):
         self.add_widget(self.layout)
     
     def start_camera(self):
-        """카메라 시작"""
+        """공유 카메라 구독 시작 (장치는 camera_service가 한 번만 엶)"""
         if self.camera is None:
-            self.camera = cv2.VideoCapture(0)
-            Clock.schedule_interval(self.update_camera, 1.0/30.0)  # 30 FPS
+            self.camera = camera_service.subscribe(self.update_camera, self.camera_fps)
     
     def stop_camera(self):
-        """카메라 중지"""
+        """카메라 구독 해제"""
         if self.camera is not None:
-            Clock.unschedule(self.update_camera)
-            self.camera.release()
+            self.camera.cancel()
             self.camera = None
     
-    def update_camera(self, dt):
+    def update_camera(self, frame):
         pass
     
     def check_face_tracking(self, frame):
@@ -22,9 +22,8 @@ from app.config import BOLD_FONT_PATH, LIGHT_FONT_PATH, BACK_IMG, LOGO_IMG, CHAR
 from app.gui.widgets.touch_keyboard import TouchKeyboard
 from app.core.face_detection import track_target_face, MAX_LOST_FRAMES
 from .base_screen import BaseScreen
-from app.core.tts import TTSManager
+from app.core.tts import get_tts_manager
 import os
-from kivy.uix.scrollview import ScrollView
 
 class NewUserScreen(BaseScreen):
     def __init__(self, **kwargs):
@@ -41,6 +40,7 @@ class NewUserScreen(BaseScreen):
         
         # STT 초기화
         self.vad_loop = None
+        self.welcome_request = None  # 재생 중인 안내 메시지
         self.is_listening = False
         
         # 배경 이미지
@@ -133,14 +133,15 @@ class NewUserScreen(BaseScreen):
         """화면 이탈 시 호출"""
         super(NewUserScreen, self).on_leave()
         self.stop_camera()
+        self.stop_welcome_message()
         # STT 종료
         self.stop_stt()
 
     def play_welcome_message(self):
-        """TTS로 안내 메시지 재생"""
+        """TTS로 안내 메시지 재생 - 재생이 끝나는 즉시 STT 시작 (UI 스레드는 막지 않음)"""
         try:
             # TTS 매니저 가져오기
-            tts_manager = TTSManager()
+            tts_manager = get_tts_manager()
             
             # 안내 메시지 재생
             # 올바른 경로로 수정
@@ -150,20 +151,13 @@ class NewUserScreen(BaseScreen):
             # 파일 존재 확인
             if os.path.exists(welcome_path):
                 print(f"✅ 오디오 파일 존재: {welcome_path}")
-                # 스크롤뷰 생성 및 설정
-                scroll_view = ScrollView(
-                    do_scroll_x=False,
-                    do_scroll_y=False,
-                    size_hint=(1, 1)
+                # TTS 재생 (완료 콜백은 오디오 스레드에서 오므로 UI 스레드로 넘김)
+                request = tts_manager.speak(
+                    audio_path=welcome_path,
+                    on_finished=lambda completed: Clock.schedule_once(
+                        lambda dt: self.on_welcome_finished(request, completed))
                 )
-                self.add_widget(scroll_view)
-                
-                # TTS 재생
-                tts_manager.play_audio(welcome_path)
-                
-                # 3초 후에 스크롤뷰 제거 및 STT 시작
-                Clock.schedule_once(lambda dt: self.remove_widget(scroll_view), 3)
-                Clock.schedule_once(lambda dt: self.start_stt(), 3)
+                self.welcome_request = request
             else:
                 print(f"❌ 오디오 파일 없음: {welcome_path}")
                 # 파일이 없으면 바로 STT 시작
@@ -173,11 +167,26 @@ class NewUserScreen(BaseScreen):
             # 오류 발생 시 바로 STT 시작
             self.start_stt()
 
+    def on_welcome_finished(self, request, completed):
+        """안내 메시지 재생 종료 - 화면을 떠나 취소된 요청이면 무시"""
+        if request is not self.welcome_request:
+            return
+        self.welcome_request = None  # 재생 중인 안내 메시지
+        if not completed:
+            print("⚠️ 안내 메시지 재생 실패 - 바로 STT 시작")
+        self.start_stt()
+
+    def stop_welcome_message(self):
+        """재생 중인 안내 메시지 취소"""
+        if self.welcome_request:
+            request, self.welcome_request = self.welcome_request, None
+            request.cancel()
+
     def start_stt(self):
         """STT 시작"""
         if not self.vad_loop:
             from app.core.vad_whisper_loop import VADWhisperLoop
-            self.vad_loop = VADWhisperLoop(callback=self.handle_stt_input)
+            self.vad_loop = VADWhisperLoop(callback=self.handle_stt_input, partial_callback=self.handle_stt_partial)
             self.vad_loop.start()
             self.is_listening = True
             # 안내 메시지 추가
@@ -190,6 +199,11 @@ class NewUserScreen(BaseScreen):
             self.vad_loop = None
         self.is_listening = False
 
+    def handle_stt_partial(self, text):
+        """STT 중간 결과를 이름 입력란에 미리 표시"""
+        if self.is_listening:
+            self.name_input.text = text.strip()
+
     def handle_stt_input(self, text):
         """STT 입력 처리"""
         if self.is_listening:
@@ -223,17 +237,3 @@ class NewUserScreen(BaseScreen):
             waiting_screen.save_face(name)
             # order 화면으로 전환
             self.manager.current = 'order'
-    
-    def start_camera(self):
-        if not self.camera:
-            self.camera = cv2.VideoCapture(0)
-            Clock.schedule_interval(self.update_camera, 1.0/30.0)
-                
-    def stop_camera(self):
-        if self.camera:
-            self.camera.release()
-            self.camera = None
-            Clock.unschedule(self.update_camera)
-    
-    def update_camera(self, dt):
-        pass
\ No newline at end of file
@@ -17,7 +17,9 @@ from app.config import BOLD_FONT_PATH, BACK_IMG, LOGO_IMG, CHARACTER_IMG
 from app.gui.widgets import RoundedButton
 from .base_screen import BaseScreen
 from app.core.face_detection import track_target_face, MAX_LOST_FRAMES
+from app.service.outbox import enqueue_order
 import time
+import datetime
 
 # 전역 주문번호 변수
 order_number = 0
@@ -114,49 +116,30 @@ class OrderIssuanceScreen(BaseScreen):
         # 주문 번호 증가
         self.order_number += 1
         self.order_label.text = f"주문번호: {self.order_number}"
+        self.upload_order()
+
+    def upload_order(self):
+        """주문 내역을 outbox에 기록 - 서버 전송은 백그라운드에서 재시도"""
+        try:
+            cart_items = self.manager.get_screen('order').cart_items
+            items = [{"menu_name": item["item"], "price": item["price"], "count": item["count"]}
+                     for item in cart_items]
+            enqueue_order({
+                "order_number": self.order_number,
+                "user_id": self.manager.get_screen('waiting').current_user_id,
+                "items": items,
+                "total_price": sum(item["price"] * item["count"] for item in items),
+                "ordered_at": datetime.datetime.now().isoformat(timespec="seconds"),
+            })
+        except Exception as e:
+            print(f"❌ 주문 업로드 예약 중 오류: {str(e)}")
 
     def on_leave(self):
         """화면 이탈 시 호출"""
         self.stop_camera()
 
-    def start_camera(self):
-        """카메라 시작"""
-        try:
-            if self.camera is None:
-                self.camera = cv2.VideoCapture(0)
-                if not self.camera.isOpened():
-                    return
-                
-                # 카메라 해상도 설정 (4:3 비율)
-                self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-                self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-                
-                # 카메라 프레임 업데이트 스케줄러 시작 (1초 간격)
-                Clock.schedule_interval(self.update_camera, 1.0)  # 1 FPS
-        except Exception:
-            pass
-
-    def stop_camera(self):
-        """카메라 중지"""
-        try:
-            if self.camera is not None:
-                # 카메라 프레임 업데이트 스케줄러 중지
-                Clock.unschedule(self.update_camera)
-                # 카메라 해제
-                self.camera.release()
-                self.camera = None
-        except Exception:
-            pass
-
-    def update_camera(self, dt):
+    def update_camera(self, frame):
         """카메라 프레임 업데이트"""
-        if self.camera is None:
-            return
-            
-        ret, frame = self.camera.read()
-        if not ret:
-            return
-            
         try:
             # 얼굴 추적 확인
             self.check_face_tracking(frame)
@@ -17,19 +17,21 @@ import cv2
 import numpy as np
 from kivy.core.image import Texture
 from kivy.graphics.texture import Texture
-from app.config import BOLD_FONT_PATH, BACK_IMG, LOGO_IMG, CHARACTER_IMG
+from app.config import BOLD_FONT_PATH, BACK_IMG, LOGO_IMG, CHARACTER_IMG, CHAT_STREAM_UI_INTERVAL
 from app.core.dummy_data import OrderData, ChatDummy
 from app.gui.widgets import RoundedButton, CartItemWidget, DividerLine, ChatBubble
 from .base_screen import BaseScreen
 from app.core.face_detection import extract_face_embeddings, track_target_face, find_best_match, initialize_database, MAX_LOST_FRAMES
 from app.core.vad_whisper_loop import VADWhisperLoop
-from app.service.api_client import chatbot_session_init, chatbot_reply, chatbot_session_clear, chatbot_session_save
+from app.service.api_client import chatbot_session_init, chatbot_reply_stream
+from app.service.outbox import enqueue_session_save, enqueue_session_clear
 from PIL import Image as PILImage, ImageDraw, ImageFont
 import sqlite3
 import time
+import uuid
 from pydub import AudioSegment
 from pydub.playback import play
-from app.core.tts import TTSManager
+from app.core.tts import get_tts_manager
 
 class OrderScreen(BaseScreen):
     def __init__(self, **kwargs):
@@ -37,6 +39,9 @@ class OrderScreen(BaseScreen):
         
         # 다음 화면 설정
         self.next_screen = "payment"
+
+        # 방문(화면 진입)마다 새로 만드는 ID - 세션 저장/삭제 요청의 Idempotency-Key로 사용
+        self.visit_id = None
         
         # 메인 레이아웃
         self.layout = FloatLayout()
@@ -180,6 +185,12 @@ class OrderScreen(BaseScreen):
         self.chat_messages = ChatDummy.get_chat_sequence()
         self.chat_index = 0
         self.chat_event = None
+        
+        # STT 중간 결과 말풍선
+        self.partial_bubble = None
+        # 문장 단위로 재생 중인 LLM 응답 음성
+        self.speech_stream = None
+        self.llm_bubble = None  # 스트리밍 중인 LLM 응답 말풍선
 
     def refresh_cart_view(self):
         """장바구니 목록 새로고침"""
@@ -214,8 +225,8 @@ class OrderScreen(BaseScreen):
         """결제 화면으로 이동"""
         ## TODO : LLM 과 결제 확인 후 결제 화면으로 이동
         self.session_id = self.manager.get_screen('waiting').target_embedding
-        chatbot_session_save(self.session_id)
-        chatbot_session_clear(self.session_id)
+        # 저장은 outbox로 백그라운드 전송 (세션 삭제는 on_leave에서 저장 뒤에 쌓임)
+        enqueue_session_save(self.session_id, self.visit_id)
         self.manager.current = "payment"
 
     def clear_cart(self):
@@ -225,6 +236,7 @@ class OrderScreen(BaseScreen):
 
     def on_enter(self):
         """화면 진입 시 호출"""
+        self.visit_id = uuid.uuid4().hex
         self.start_camera()
         # 스케줄러를 시작해서 3초마다 하나씩 대화 추가
         # self.chat_index = 0
@@ -241,9 +253,9 @@ class OrderScreen(BaseScreen):
     def play_greeting_message(self):
         """TTS로 인사 메시지 재생"""
         try:
-            from app.core.tts import TTSManager
-            tts_manager = TTSManager()
-            greeting = "안녕하세요? 오랜만에 오셨네요? 잘 지내셨나요? 원하시는 메뉴가 있으시면 말씀해주세요."
+            from app.config import TTS_PROMPTS
+            tts_manager = get_tts_manager()
+            greeting = TTS_PROMPTS["order_greeting"]
             tts_manager.play_async(greeting)
             
             # 인사 메시지를 채팅창에 추가
@@ -271,10 +283,18 @@ class OrderScreen(BaseScreen):
             self.chat_event.cancel()
         ## 채팅 버퍼 클리어 
         self.session_id = self.manager.get_screen('waiting').target_embedding
-        chatbot_session_clear(self.session_id)
+        enqueue_session_clear(self.session_id, self.visit_id)
         # STT 종료
         if hasattr(self, 'vad_loop'):
             self.vad_loop.stop()
+        self._remove_partial_bubble()
+        self._stop_speech()
+
+    def _stop_speech(self):
+        """재생 중인 LLM 응답 음성 중단"""
+        if self.speech_stream:
+            self.speech_stream.stop()
+            self.speech_stream = None
 
     def add_next_chat_message(self, dt):
         """다음 채팅 메시지 추가"""
@@ -290,44 +310,8 @@ class OrderScreen(BaseScreen):
             if self.chat_event:
                 self.chat_event.cancel()
 
-    def start_camera(self):
-        """카메라 시작"""
-        try:
-            if self.camera is None:
-                self.camera = cv2.VideoCapture(0)
-                if not self.camera.isOpened():
-                    return
-                
-                # 카메라 해상도 설정 (4:3 비율)
-                self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-                self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-                
-                # 카메라 프레임 업데이트 스케줄러 시작 (1초 간격)
-                Clock.schedule_interval(self.update_camera, 1.0)  # 1 FPS
-        except Exception:
-            pass
-
-    def stop_camera(self):
-        """카메라 중지"""
-        try:
-            if self.camera is not None:
-                # 카메라 프레임 업데이트 스케줄러 중지
-                Clock.unschedule(self.update_camera)
-                # 카메라 해제
-                self.camera.release()
-                self.camera = None
-        except Exception:
-            pass
-
-    def update_camera(self, dt):
+    def update_camera(self, frame):
         """카메라 프레임 업데이트"""
-        if self.camera is None:
-            return
-            
-        ret, frame = self.camera.read()
-        if not ret:
-            return
-            
         try:
             # 얼굴 추적 확인
             self.check_face_tracking(frame)
@@ -364,9 +348,25 @@ class OrderScreen(BaseScreen):
         self.manager.current = self.next_screen
         return True 
     
+    def handle_partial_input(self, text):
+        """STT 중간 결과를 사용자 말풍선에 미리 표시"""
+        if self.partial_bubble is None:
+            self.partial_bubble = ChatBubble("USER", text)
+            self.chat_box.add_widget(self.partial_bubble)
+            self.chat_scroll.scroll_y = 0
+        else:
+            self.partial_bubble.label.text = text
+
+    def _remove_partial_bubble(self):
+        """중간 결과 말풍선 제거"""
+        if self.partial_bubble is not None:
+            self.chat_box.remove_widget(self.partial_bubble)
+            self.partial_bubble = None
+
     def handle_user_input(self, text):
         """사용자 입력을 처리하는 메인 함수"""
         print("🎯 handle_user_input 시작")
+        self._remove_partial_bubble()
         # 재귀 호출 방지를 위한 간단한 락 메커니즘
         if not hasattr(self, '_input_lock'):
             self._input_lock = False
@@ -398,31 +398,53 @@ class OrderScreen(BaseScreen):
                 
             print(f"✅ 세션 ID 획득: {type(session_id)}")
             
-            # LLM 응답 요청을 별도 스레드에서 처리
+            # 응답 음성은 첫 문장이 도착하는 대로 합성/재생 (이전 응답 음성은 중단)
+            self._stop_speech()
+            self.llm_bubble = None
+            speech_stream = get_tts_manager().play_stream()
+            self.speech_stream = speech_stream
+
+            # LLM 응답을 별도 스레드에서 스트리밍으로 수신
             def process_response():
                 print("🔄 process_response 시작")
+                stream = chatbot_reply_stream(session_id, text)
                 try:
-                    print("🤖 chatbot_reply 호출")
-                    response = chatbot_reply(session_id, text)
-                    print(f"📝 chatbot_reply 응답: {response[:50]}...")
-                    if response:
-                        # 메인 스레드에서 UI 업데이트
-                        from kivy.clock import Clock
-                        print("⏰ UI 업데이트 스케줄")
-                        Clock.schedule_once(lambda dt: self._update_chat_ui(response))
-                        
-                        # "결제 수단"이 포함된 경우 결제 버튼 활성화
-                        ok_list = ["결제 수단", "주문이 확인되었습니다", "결제 방법을"]
-                        if ok_list in response:
-                            print("💰 결제 수단 관련 응답 감지")
-                            # STT 종료
-                            if hasattr(self, 'vad_loop'):
-                                self.vad_loop.stop()
-                            Clock.schedule_once(lambda dt: self._activate_payment_button())
+                    print("🤖 chatbot_reply_stream 호출")
+                    chunks = []
+                    pending = ""
+                    last_flush = time.time()
+                    for token in stream:
+                        if speech_stream.stopped:
+                            # 화면을 떠났거나 새 입력이 들어옴 - 수신 중단
+                            break
+                        chunks.append(token)
+                        speech_stream.feed(token)
+                        pending += token
+                        # 말풍선 갱신은 초당 몇 번으로 제한
+                        if time.time() - last_flush >= CHAT_STREAM_UI_INTERVAL:
+                            Clock.schedule_once(lambda dt, t=pending: self._append_llm_text(t, speech_stream))
+                            pending = ""
+                            last_flush = time.time()
+                    if pending:
+                        Clock.schedule_once(lambda dt, t=pending: self._append_llm_text(t, speech_stream))
+
+                    response = "".join(chunks)
+                    print(f"📝 chatbot_reply_stream 응답: {response[:50]}...")
+                    # "결제 수단"이 포함된 경우 결제 버튼 활성화
+                    ok_list = ["결제 수단", "주문이 확인되었습니다", "결제 방법을"]
+                    if not speech_stream.stopped and any(ok in response for ok in ok_list):
+                        print("💰 결제 수단 관련 응답 감지")
+                        # STT 종료
+                        if hasattr(self, 'vad_loop'):
+                            self.vad_loop.stop()
+                        Clock.schedule_once(lambda dt: self._activate_payment_button())
                             
                 except Exception as e:
                     print(f"❌ LLM 응답 처리 중 오류: {str(e)}")
                 finally:
+                    # 중간에 멈춰도 응답 연결/세션 락을 바로 놓고, 합성 스레드는 남은 문장까지 처리 후 종료
+                    stream.close()
+                    speech_stream.finish()
                     self._input_lock = False
                     print("🔓 _input_lock 해제")
                     
@@ -435,22 +457,21 @@ class OrderScreen(BaseScreen):
             self._input_lock = False
             print("🔓 _input_lock 해제 (오류)")
 
-    def _update_chat_ui(self, response):
-        """채팅 UI 업데이트 (메인 스레드에서 실행)"""
-        print("🎨 UI 업데이트 시작")
+    def _append_llm_text(self, text, speech_stream):
+        """스트리밍 응답 조각을 LLM 말풍선에 이어 붙임 (메인 스레드에서 실행)"""
+        if speech_stream is not self.speech_stream:
+            # 이미 끝난(중단된) 응답의 늦은 조각
+            return
         try:
-            llm_bubble = ChatBubble("LLM", response)
-            self.chat_box.add_widget(llm_bubble)
+            if self.llm_bubble is None:
+                self.llm_bubble = ChatBubble("LLM", text)
+                self.chat_box.add_widget(self.llm_bubble)
+            else:
+                self.llm_bubble.append_text(text)
             # 스크롤 애니메이션 제거
             self.chat_scroll.scroll_y = 0
             # 스크롤 위치 고정
             self.chat_scroll.do_scroll_y = False
-            
-            # TTS로 LLM 응답 재생
-            tts_manager = TTSManager()
-            tts_manager.play_async(response)
-            
-            print("✅ UI 업데이트 완료")
         except Exception as e:
             print(f"❌ UI 업데이트 중 오류: {str(e)}")
 
@@ -481,7 +502,7 @@ class OrderScreen(BaseScreen):
     def start_vad_loop(self, dt):
         """VADWhisperLoop 시작"""
         print("🎤 VADWhisperLoop 시작")
-        self.vad_loop = VADWhisperLoop(callback=self.handle_user_input)
+        self.vad_loop = VADWhisperLoop(callback=self.handle_user_input, partial_callback=self.handle_partial_input)
         self.vad_loop.start()
 
     
@@ -112,7 +112,6 @@ class PaymentScreen(BaseScreen):
         
         # 카메라 관련 변수
         self.camera = None
-        self.camera_event = None
         self.last_tracking_time = 0
         self.lost_frame_count = 0
     
@@ -126,39 +125,8 @@ class PaymentScreen(BaseScreen):
         Window.unbind(on_key_down=self._on_keyboard_down)
         self.stop_camera()
     
-    def start_camera(self):
-        """카메라 시작"""
-        try:
-            if self.camera is None:
-                self.camera = cv2.VideoCapture(0)
-                if not self.camera.isOpened():
-                    return
-                
-                # 카메라 해상도 설정 (4:3 비율)
-                self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-                self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-                
-                # 카메라 프레임 업데이트 스케줄러 시작 (1초 간격)
-                Clock.schedule_interval(self.update_camera, 1.0)  # 1 FPS
-        except Exception:
-            pass
-    
-    def stop_camera(self):
-        """카메라 정지"""
-        if self.camera_event:
-            self.camera_event.cancel()
-        if self.camera:
-            self.camera.release()
-    
-    def update_camera(self, dt):
+    def update_camera(self, frame):
         """카메라 프레임 업데이트"""
-        if self.camera is None:
-            return
-            
-        ret, frame = self.camera.read()
-        if not ret:
-            return
-            
         try:
             # 얼굴 추적 확인
             self.check_face_tracking(frame)
@@ -14,17 +14,20 @@ from kivy.core.window import Window
 from kivy.graphics import Color, Rectangle, RoundedRectangle
 from kivy.clock import Clock
 from kivy.graphics.texture import Texture
-from app.config import BOLD_FONT_PATH, LIGHT_FONT_PATH, BACK_IMG, LOGO_IMG, CHARACTER_IMG
+from app.config import BOLD_FONT_PATH, LIGHT_FONT_PATH, BACK_IMG, LOGO_IMG, CHARACTER_IMG, PREVIEW_FPS, TTS_PROMPTS
 from app.core.face_detection import extract_face_embeddings, track_target_face, find_best_match, initialize_database, MAX_LOST_FRAMES, save_face
 from .base_screen import BaseScreen
-from app.service.api_client import register_user
-from app.core.tts import TTSManager
+from app.service.outbox import enqueue_register_user
+from app.core.tts import get_tts_manager
+from app.core.recognition_worker import RecognitionWorker
 
 # 설정값
 SIMILARITY_THRESHOLD = 0.45
 CAMERA_SCALE = 1.5  # 카메라 화면 크기 확대 비율
 
 class WaitingScreen(BaseScreen):
+    camera_fps = PREVIEW_FPS
+
     def __init__(self, **kwargs):
         super(WaitingScreen, self).__init__(**kwargs)
         
@@ -103,11 +106,17 @@ class WaitingScreen(BaseScreen):
         )
         self.layout.add_widget(self.label)
         # TTS 초기화
-        self.tts = TTSManager()
-        self.tts.play_async("녹색 사각형 안에서 정면을 바라보세요")
+        self.tts = get_tts_manager()
+        self.tts.play_async(TTS_PROMPTS["waiting_guide"])
         
         self.target_embedding = None
         self.current_encoding = None
+        self.current_user_id = None  # 인식/등록된 로컬 사용자 ID (주문 업로드용)
+        
+        # 얼굴 인식은 별도 워커에서 수행하고 UI는 최근 진행률만 표시
+        self.recognition_worker = RecognitionWorker(extract_face_embeddings, self.on_recognition_result)
+        self.progress = 0
+        self.progress_font = ImageFont.truetype(BOLD_FONT_PATH, 30)
         
         self.add_widget(self.layout)
     
@@ -122,54 +131,21 @@ class WaitingScreen(BaseScreen):
     
     def start_camera(self):
         """카메라 시작"""
-        self.camera = cv2.VideoCapture(0)
-        # 카메라 해상도 설정 (4:3 비율)
-        self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-        self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-        Clock.schedule_interval(self.update_camera, 1.0/30.0)
+        self.progress = 0
+        self.recognition_worker.start()
+        super(WaitingScreen, self).start_camera()
     
     def stop_camera(self):
         """카메라 중지"""
-        if self.camera is not None:
-            self.camera.release()
-            self.camera = None
-        Clock.unschedule(self.update_camera)
+        self.recognition_worker.stop()
+        super(WaitingScreen, self).stop_camera()
     
-    def update_camera(self, dt):
+    def update_camera(self, frame):
         """카메라 프레임 업데이트"""
-        if self.camera is None:
-            return
-            
-        ret, frame = self.camera.read()
-        if not ret:
-            print("카메라 프레임 읽기 실패")
-            return
+        # 인식은 워커로 넘기고 화면 갱신만 수행
+        self.recognition_worker.submit(frame)
             
         try:
-            # 얼굴 검출
-            face_encoding, face_location, progress, match_result = extract_face_embeddings(frame)
-            
-            # 얼굴이 검출된 경우
-            if face_encoding is not None:
-                self.current_encoding = face_encoding
-                
-                # 매칭 결과가 있는 경우
-                if match_result is not None and match_result[0] is not None:
-                    print(f"기존 사용자 발견: ID:{match_result[0]}, NAME:{match_result[1]}")
-                    self.target_embedding = face_encoding
-                    self.manager.current = "order"
-                elif progress >= 100:
-                    print("신규 사용자 발견")
-                    self.target_embedding = face_encoding
-                    self.manager.current = "new_user"
-            else:
-                self.lost_frame_count += 1
-                if self.lost_frame_count >= MAX_LOST_FRAMES:
-                    print("얼굴 인식 실패 - 대기화면으로 전환")
-                    self.manager.current = "waiting"
-                else:
-                    self.lost_frame_count = 0
-            
             # 프레임 표시
             frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
             frame = cv2.flip(frame, 1)  # 좌우 반전
@@ -191,8 +167,7 @@ class WaitingScreen(BaseScreen):
             # 진행률 표시
             frame_pil = PILImage.fromarray(frame)
             draw = ImageDraw.Draw(frame_pil)
-            font = ImageFont.truetype(BOLD_FONT_PATH, 30)
-            draw.text((10, 30), f"인식 진행률: {progress}%", font=font, fill=(0, 255, 0))
+            draw.text((10, 30), f"인식 진행률: {self.progress}%", font=self.progress_font, fill=(0, 255, 0))
             frame = np.array(frame_pil)
             
             # OpenCV 프레임을 Kivy 텍스처로 변환
@@ -206,14 +181,46 @@ class WaitingScreen(BaseScreen):
             import traceback
             print(traceback.format_exc())
     
+    def on_recognition_result(self, result):
+        """워커의 얼굴 인식 결과 처리 (UI 스레드)"""
+        if self.manager is None or self.manager.current != self.name:
+            return
+            
+        face_encoding, face_location, progress, match_result = result
+        self.progress = progress
+        
+        # 얼굴이 검출된 경우
+        if face_encoding is not None:
+            self.current_encoding = face_encoding
+            
+            # 매칭 결과가 있는 경우
+            if match_result is not None and match_result[0] is not None:
+                print(f"기존 사용자 발견: ID:{match_result[0]}, NAME:{match_result[1]}")
+                self.target_embedding = face_encoding
+                self.current_user_id = match_result[0]
+                self.manager.current = "order"
+            elif progress >= 100:
+                print("신규 사용자 발견")
+                self.target_embedding = face_encoding
+                self.current_user_id = None
+                self.manager.current = "new_user"
+        else:
+            self.lost_frame_count += 1
+            if self.lost_frame_count >= MAX_LOST_FRAMES:
+                print("얼굴 인식 실패 - 대기화면으로 전환")
+                self.manager.current = "waiting"
+            else:
+                self.lost_frame_count = 0
+    
     def save_face(self, name):
         """얼굴 정보 저장"""
         if self.current_encoding is not None:
             # 얼굴 정보를 프론트 데이터베이스에 저장
-            save_face(name, self.current_encoding)
-            # 서버 신규 사용자 등록 
+            user_id = save_face(name, self.current_encoding)
+            self.current_user_id = user_id
+            # 서버 신규 사용자 등록은 outbox에 기록 후 백그라운드 전송 (오프라인이어도 유실되지 않음)
             dummy_number = "010-0000-0000"
-            register_user(name,dummy_number,self.current_encoding)
+            enqueue_register_user(name, dummy_number, self.current_encoding, local_user_id=user_id)
             # waiting 화면으로 돌아가기
             self.manager.current = 'waiting'
         else:
@@ -0,0 +1,73 @@
+"""
+메뉴 이미지 텍스처 캐시
+
+(menu_id, 썸네일 크기)별로 GPU 텍스처를 한 번만 만들고, 전체 크기가
+TEXTURE_CACHE_MAX_BYTES를 넘으면 가장 오래 쓰지 않은 텍스처부터 놓아준다.
+장바구니에 같은 메뉴가 여러 번 담겨도 텍스처는 하나만 사용한다.
+
+Kivy 텍스처는 UI 스레드에서만 만들 수 있으므로 UI 스레드에서만 호출할 것.
+"""
+
+import collections
+import os
+from kivy.core.image import Image as CoreImage
+from app.config import TEXTURE_CACHE_MAX_BYTES
+from app.core.menu_thumbnails import thumbnail_bucket, thumbnail_path, build_thumbnail
+
+
+class TextureCache:
+    """LRU 텍스처 캐시 (RGBA 기준 바이트 수로 제한)"""
+
+    def __init__(self, max_bytes=TEXTURE_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = collections.OrderedDict()  # (menu_id, 크기) -> 텍스처
+        self.total_bytes = 0
+        self.missing_warned = False
+
+    def get(self, menu_id, size, source=None):
+        """menu_id의 size(px)용 텍스처 - 썸네일이 없으면 source 원본으로 만듦 (둘 다 없으면 None)"""
+        key = (menu_id, thumbnail_bucket(size))
+        texture = self.entries.get(key)
+        if texture is not None:
+            self.entries.move_to_end(key)
+            return texture
+
+        path = thumbnail_path(*key)
+        if not os.path.exists(path):
+            if not source or not os.path.exists(source):
+                return None
+            if not self.missing_warned:
+                print("⚠️ 메뉴 썸네일 없음 - 원본에서 필요한 크기만 생성 (python build_menu_thumbnails.py 실행 필요)")
+                self.missing_warned = True
+            try:
+                # 원본(약 12MB RGBA)을 그대로 캐시하면 한두 개로 캐시가 가득 차므로 이 크기의 썸네일만 만들어 읽음
+                build_thumbnail(source, menu_id, sizes=(key[1],))
+            except Exception as e:
+                # 썸네일을 만들 수 없으면 원본을 보여주되 캐시에는 넣지 않음
+                print(f"❌ 메뉴 썸네일 생성 실패 (menu_id:{menu_id}) - 원본 사용, 캐시 안 함: {str(e)}")
+                return CoreImage(source, nocache=True).texture
+
+        # Kivy 내부 이미지 캐시에는 넣지 않음 (여기서 크기를 관리)
+        texture = CoreImage(path, nocache=True).texture
+        self.entries[key] = texture
+        self.total_bytes += self._texture_bytes(texture)
+        self._evict()
+        return texture
+
+    def clear(self):
+        self.entries.clear()
+        self.total_bytes = 0
+
+    def _texture_bytes(self, texture):
+        return texture.width * texture.height * 4
+
+    def _evict(self):
+        """최대 크기를 넘으면 오래된 텍스처부터 제거 (방금 넣은 것은 유지)"""
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            _, texture = self.entries.popitem(last=False)
+            # 아직 화면에 있는 위젯이 참조하면 그 위젯이 사라질 때 해제됨
+            self.total_bytes -= self._texture_bytes(texture)
+
+
+# 프로세스 전체 공유 인스턴스
+texture_cache = TextureCache()
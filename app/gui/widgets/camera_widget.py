@@ -8,7 +8,8 @@ from kivy.uix.image import Image
 from kivy.graphics.texture import Texture
 from kivy.clock import Clock
 from kivy.core.window import Window
-from app.config import CAMERA_WIDTH, CAMERA_HEIGHT
+from app.config import PREVIEW_FPS
+from app.core.camera_service import camera_service
 from app.core.face_detection import (
     check_face_quality,
     save_face,
@@ -21,13 +22,8 @@ class CameraWidget(Image):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         
-        # 카메라 초기화
-        self.capture = cv2.VideoCapture(0)
-        self.capture.set(cv2.CAP_PROP_FRAME_WIDTH, CAMERA_WIDTH)
-        self.capture.set(cv2.CAP_PROP_FRAME_HEIGHT, CAMERA_HEIGHT)
-        
-        # 프레임 업데이트 이벤트
-        self.update_event = Clock.schedule_interval(self.update, 1.0/30.0)
+        # 공유 카메라 구독 (프레임 업데이트 이벤트)
+        self.subscription = camera_service.subscribe(self.update, PREVIEW_FPS)
         
         # 얼굴 추적 상태
         self.tracking = False
@@ -39,11 +35,7 @@ class CameraWidget(Image):
         self.on_face_lost = None
         self.on_face_quality_checked = None
         
-    def update(self, dt):
-        ret, frame = self.capture.read()
-        if not ret:
-            return
-            
+    def update(self, frame):
         # 프레임 처리
         if self.tracking and self.target_face_embeddings is not None:
             # 얼굴 추적
@@ -89,5 +81,4 @@ class CameraWidget(Image):
         
     def on_leave(self):
         """위젯이 제거될 때 정리"""
-        self.update_event.cancel()
-        self.capture.release() 
\ No newline at end of file
+        self.subscription.cancel() 
\ No newline at end of file
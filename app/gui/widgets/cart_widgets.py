@@ -9,6 +9,7 @@ from kivy.uix.label import Label
 from kivy.graphics import Color, Rectangle
 from app.config import BOLD_FONT_PATH, LIGHT_FONT_PATH
 from .touch_keyboard import RoundedButton
+from app.gui.texture_cache import texture_cache
 
 # ----- 얇은 구분선 위젯 (가로길이 50%, 가운데 정렬) -----
 class DividerLine(BoxLayout):
@@ -45,12 +46,16 @@ class CartItemWidget(BoxLayout):
             anchor_y='center',
             padding=(10, 5, 10, 5)
         )
+        # 원본(1MB PNG) 대신 캐시된 썸네일 텍스처 사용 (장바구니 항목에는 menu_id가 필수)
+        image_size = 145
+        texture = texture_cache.get(cart_item["menu_id"], image_size, cart_item["image"])
+        image_args = {"texture": texture} if texture is not None else {"source": cart_item["image"]}
         self.image = Image(
-            source=cart_item["image"],
             size_hint=(None, None),
-            size=(145, 145),
+            size=(image_size, image_size),
             allow_stretch=True,
-            keep_ratio=True
+            keep_ratio=True,
+            **image_args
         )
         self.image_container.add_widget(self.image)
         self.add_widget(self.image_container)
@@ -73,6 +73,10 @@ class ChatBubble(BoxLayout):
         # (5) 새로 생성될 때 높이를 0으로 시작 -> 애니메이션으로 자연스럽게 확대
         self.height = 0
 
+    def append_text(self, text):
+        """스트리밍 응답 이어 붙이기 - 말풍선 크기는 texture_size 바인딩으로 갱신됨"""
+        self.label.text += text
+
     def update_label_size(self, instance, texture_size):
         """Label의 실제 텍스트 크기에 따라 말풍선 크기 갱신"""
         new_width = texture_size[0] + 20
@@ -4,12 +4,17 @@
 
 from kivy.app import App
 from kivy.uix.screenmanager import ScreenManager, Screen
-from app.config import WINDOW_WIDTH, WINDOW_HEIGHT, WINDOW_TITLE
+from app.config import WINDOW_WIDTH, WINDOW_HEIGHT, WINDOW_TITLE, STT_PRELOAD
 from app.gui.screens.waiting_screen import WaitingScreen
 from app.gui.screens.new_user_screen import NewUserScreen
 from app.gui.screens.order_screen import OrderScreen
 from app.gui.screens.payment_screen import PaymentScreen
 from app.gui.screens.order_issuance_screen import OrderIssuanceScreen
+from app.core.camera_service import camera_service
+from app.core.stt_backends import preload_stt_backend
+from app.core.audio_output import audio_output
+from app.service.outbox import outbox
+from app.core.db_pool import close_pools
 import kivy
 kivy.logger.Logger.setLevel("DEBUG")
 
@@ -19,6 +24,19 @@ class KioskApp(App):
         # 윈도우 설정
         self.title = WINDOW_TITLE
         self.icon = None  # TODO: 아이콘 추가
+
+        # 첫 손님이 주문 화면에 들어가기 전에 STT 모델 로드
+        if STT_PRELOAD:
+            preload_stt_backend()
+
+        # 오디오 출력 장치는 앱 종료까지 열어둠 (안내 음성마다 장치를 열지 않도록)
+        try:
+            audio_output.start()
+        except Exception as e:
+            print(f"❌ 오디오 출력 장치 열기 실패: {str(e)}")
+
+        # 지난 실행에서 보내지 못한 사용자 등록/세션/주문 요청부터 이어서 전송
+        outbox.start()
         
         # 화면 관리자 생성
         sm = ScreenManager()
@@ -32,5 +50,12 @@ class KioskApp(App):
         
         return sm
 
+    def on_stop(self):
+        """앱 종료 시 공유 카메라/오디오 장치 해제 (outbox의 남은 요청은 다음 실행 때 전송)"""
+        camera_service.release()
+        audio_output.close()
+        outbox.stop()
+        close_pools()
+
 if __name__ == '__main__':
     KioskApp().run() 
\ No newline at end of file
@@ -5,6 +5,7 @@
 from pydantic import BaseModel
 from typing import Optional
 import numpy as np
+from app.core.face_encoding import decode_face
 
 class UserData(BaseModel):
     user_id: Optional[int] = None
@@ -25,5 +26,5 @@ class UserData(BaseModel):
     def get_face_encoding_array(self) -> Optional[np.ndarray]:
         """face_encoding 바이트를 numpy 배열로 변환"""
         if self.face_encoding:
-            return np.frombuffer(self.face_encoding)
+            return decode_face(self.face_encoding)
         return None 
\ No newline at end of file
@@ -3,14 +3,103 @@ FastAPI 서버와 통신
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import base64
 import threading
 import numpy as np
 import hashlib
 import json
+from contextlib import contextmanager
+from app.config import API_BASE, API_POOL_SIZE, API_MAX_RETRIES, API_RETRY_BACKOFF, API_TIMEOUTS
 
-API_BASE = "http://192.168.20.109:8080"
-session_lock = threading.Lock()  # 전역 락 추가
+class SessionLocks:
+    """챗봇 세션 ID별 락
+
+    같은 세션의 대화/저장/삭제는 요청한 순서대로 하나씩 실행하고, 다른 세션끼리는
+    서로 기다리지 않는다. 기다리는 요청이 없어진 세션의 락은 바로 정리된다.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries = {}  # 세션 키 -> [Condition, 다음 번호표, 실행 중인 번호표, 대기+실행 수]
+
+    @contextmanager
+    def hold(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                entry = self.entries[key] = [threading.Condition(self.lock), 0, 0, 0]
+            ticket = entry[1]
+            entry[1] += 1
+            entry[3] += 1
+            # 번호표 순서대로 실행 (threading.Lock은 획득 순서를 보장하지 않음)
+            while entry[2] != ticket:
+                entry[0].wait()
+        try:
+            yield
+        finally:
+            with self.lock:
+                entry[2] += 1
+                entry[3] -= 1
+                if entry[3] == 0:
+                    del self.entries[key]
+                else:
+                    entry[0].notify_all()
+
+
+session_locks = SessionLocks()
+
+
+class ApiClient:
+    """keep-alive 연결을 재사용하는 API 클라이언트
+
+    요청마다 TCP 연결을 새로 맺지 않도록 requests.Session 하나를 공유한다.
+    연결 실패는 모든 메서드에서, 읽기 실패와 502/503/504는 멱등 메서드
+    (GET/PUT/DELETE)에서만 지수 백오프로 재시도한다.
+    """
+
+    IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE", "OPTIONS"})
+
+    def __init__(self, base_url=API_BASE, pool_size=API_POOL_SIZE, max_retries=API_MAX_RETRIES,
+                 backoff=API_RETRY_BACKOFF, timeouts=API_TIMEOUTS):
+        self.base_url = base_url.rstrip("/")
+        self.timeouts = timeouts
+        retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=max_retries,
+            status=max_retries,
+            backoff_factor=backoff,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=self.IDEMPOTENT_METHODS,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def request(self, method, path, endpoint="default", **kwargs):
+        """endpoint 이름으로 API_TIMEOUTS의 (connect, read) 타임아웃 적용"""
+        kwargs.setdefault("timeout", self.timeouts.get(endpoint, self.timeouts["default"]))
+        return self.session.request(method, f"{self.base_url}{path}", **kwargs)
+
+    def get(self, path, endpoint="default", **kwargs):
+        return self.request("GET", path, endpoint, **kwargs)
+
+    def post(self, path, endpoint="default", **kwargs):
+        return self.request("POST", path, endpoint, **kwargs)
+
+    def delete(self, path, endpoint="default", **kwargs):
+        return self.request("DELETE", path, endpoint, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+
+# 프로세스 전체 공유 인스턴스
+api_client = ApiClient()
 
 def _encode_session_id(session_id):
     """세션 ID를 안전하게 인코딩"""
@@ -31,17 +120,39 @@ def _encode_session_id(session_id):
         print(f"[_encode_session_id ERROR] {e}")
         return ""
 
+def _idempotency_headers(idempotency_key):
+    """서버가 재전송 요청을 중복 처리하지 않도록 Idempotency-Key 헤더 추가"""
+    return {"Idempotency-Key": idempotency_key} if idempotency_key else {}
+
+def _face_encoding_b64(face_encoding) -> str:
+    """서버 전송용 얼굴 인코딩 - 서버 형식(헤더 없는 float64 tobytes) 그대로 유지, 버전 헤더는 로컬 저장에만 사용"""
+    return base64.b64encode(np.asarray(face_encoding, dtype="<f8").reshape(-1).tobytes()).decode("utf-8")
+
+def user_payload(name: str, phone: str, face_encoding) -> dict:
+    """사용자 등록 요청 본문 (JSON 직렬화 가능)"""
+    return {
+        "name": name,
+        "phone": phone,
+        "face_encoding": _face_encoding_b64(face_encoding)
+    }
+
+### 사용자 등록/주문 요청 (실패 시 예외 발생 - outbox에서 재시도)
+def register_user_request(data: dict, idempotency_key: str = None) -> dict:
+    res = api_client.post("/users/", "users", json=data, headers=_idempotency_headers(idempotency_key))
+    res.raise_for_status()
+    return res.json()
+
+def create_order_request(order: dict, idempotency_key: str = None) -> dict:
+    res = api_client.post("/orders", "orders", json=order, headers=_idempotency_headers(idempotency_key))
+    res.raise_for_status()
+    return res.json()
+
 ### 신규 사용자 등록
 def register_user(name: str, phone: str, face_encoding: str) -> dict:
     """신규 사용자 등록"""
     try:
-        b64_encoding_face = base64.b64encode(face_encoding.tobytes()).decode("utf-8")
-        data = {
-            "name": name,
-            "phone": phone,
-            "face_encoding": b64_encoding_face
-        }
-        res = requests.post(f"{API_BASE}/users/", json=data)
+        data = user_payload(name, phone, face_encoding)
+        res = api_client.post("/users/", "users", json=data)
         return res.json()
     except Exception as e:
         print(f"[register_user ERROR] {e}")
@@ -51,13 +162,13 @@ def register_user(name: str, phone: str, face_encoding: str) -> dict:
 def update_user(user_id:int, name: str, phone: str, face_encoding: str) -> dict:
     """TODO : 사용자 업데이트 추후 개선"""
     try:
-        b64_encoding_face = base64.b64encode(face_encoding.tobytes()).decode("utf-8")
+        b64_encoding_face = _face_encoding_b64(face_encoding)
         data = {
             "name": name,
             "phone": phone,
             "face_encoding": b64_encoding_face
         }
-        res = requests.post(f"{API_BASE}/users/{user_id}", json=data)
+        res = api_client.post(f"/users/{user_id}", "users", json=data)
         return res.json()
     except Exception as e:
         print(f"[register_user ERROR] {e}")
@@ -69,28 +180,29 @@ def chatbot_session_init(session_id: str) -> str :
     """ 챗봇 시작 전 세션 초기화 """
     try: 
         b64_encoding_id = _encode_session_id(session_id)
-        res = requests.get(f"{API_BASE}/chatbot/initialize-session?session_id={b64_encoding_id}")
+        res = api_client.get("/chatbot/initialize-session", "chatbot_session", params={"session_id": b64_encoding_id})
         return res.json().get("reply", "")
     except Exception as e:
         print(f"[chatbot_session_init ERROR] {e}")
         return "죄송합니다. 서버 응답에 문제가 있습니다."
 
+def _encode_chat_session_id(session_id):
+    """대화 API용 세션 ID - numpy 배열은 해시값으로 바꾼 뒤 인코딩"""
+    if isinstance(session_id, np.ndarray):
+        hash_input = str(session_id[:10].tolist()).encode('utf-8')
+        session_id = hashlib.md5(hash_input).hexdigest()
+    return _encode_session_id(session_id)
+
 ### 챗봇 대화
 def chatbot_reply(session_id: str, user_input: str) -> str:
     """LLM 기반 챗봇 응답"""
     print("🤖 chatbot_reply 시작")
     print("text : ", user_input)
-    with session_lock:
-        print("🔒 session_lock 획득")
+    with session_locks.hold(_encode_session_id(session_id)):
+        print("🔒 세션 락 획득")
         try:
             print(f"🔍 세션 ID 타입: {type(session_id)}")
-            # numpy 배열인 경우 해시값으로 변환
-            if isinstance(session_id, np.ndarray):
-                hash_input = str(session_id[:10].tolist()).encode('utf-8')
-                session_id = hashlib.md5(hash_input).hexdigest()
-                print("🔧 numpy 배열을 해시값으로 변환")
-                
-            b64_encoding_id = _encode_session_id(session_id)
+            b64_encoding_id = _encode_chat_session_id(session_id)
             if not b64_encoding_id:
                 print("❌ 세션 ID 인코딩 실패")
                 return "죄송합니다. 세션 ID 처리에 문제가 발생했습니다."
@@ -101,13 +213,13 @@ def chatbot_reply(session_id: str, user_input: str) -> str:
             
             # 타임아웃 설정 추가
             try:
-                print(f"🌐 서버 URL: {API_BASE}/chatbot/chat")
+                print(f"🌐 서버 URL: {api_client.base_url}/chatbot/chat")
                 print("🔄 API 요청 시도 중...")
                 
-                res = requests.post(
-                    f"{API_BASE}/chatbot/chat", 
+                res = api_client.post(
+                    "/chatbot/chat",
+                    "chatbot_chat",
                     json=data,
-                    timeout=10,
                     headers={'Content-Type': 'application/json'}
                 )
                 
@@ -148,44 +260,145 @@ def chatbot_reply(session_id: str, user_input: str) -> str:
             print(f"❌ chatbot_reply 오류: {str(e)}")
             return "죄송합니다. 다시 말씀해 주세요."
         finally:
-            print("�� session_lock 해제")
+            print("🔓 세션 락 해제")
+
+def _iter_stream_tokens(res):
+    """스트리밍 응답에서 토큰 추출
+
+    - text/event-stream: "data: {...}" 또는 "data: 토큰" 줄, "data: [DONE]"이면 종료
+    - 그 밖(application/x-ndjson 등): 한 줄에 JSON 하나 ({"token": ...}, {"done": true})
+    - application/json: 스트리밍하지 않는 서버 - 전체 응답을 한 번에
+    """
+    content_type = res.headers.get("content-type", "")
+    if content_type.startswith("application/json"):
+        yield res.json().get("response", "")
+        return
+
+    sse = content_type.startswith("text/event-stream")
+    res.encoding = res.encoding or "utf-8"
+    done = False
+    # chunk_size=None: 청크가 도착하는 대로 바로 처리 (버퍼가 찰 때까지 기다리지 않음)
+    # 종료 표시 뒤에도 return하지 않고 본문 끝까지 읽음 - 중간에 빠져나오면 urllib3가 연결을
+    # 닫아 keep-alive 연결이 풀로 돌아가지 않음
+    for line in res.iter_lines(chunk_size=None, decode_unicode=True):
+        if not line or done:
+            continue
+        if sse:
+            if not line.startswith("data:"):
+                continue
+            line = line[5:]
+            if line.startswith(" "):
+                line = line[1:]
+            if line == "[DONE]":
+                done = True
+                continue
+        try:
+            item = json.loads(line)
+        except json.JSONDecodeError:
+            if sse:
+                yield line
+            continue
+        if not isinstance(item, dict):
+            yield str(item)
+            continue
+        if item.get("done"):
+            done = True
+            continue
+        token = item.get("token") or item.get("delta") or ""
+        if token:
+            yield token
+
+### 챗봇 대화 (스트리밍)
+def chatbot_reply_stream(session_id, user_input: str):
+    """LLM 응답을 도착하는 대로 조각(토큰) 단위로 yield
+
+    chatbot_reply처럼 예외를 던지지 않고 오류 안내 문구를 yield한다.
+    서버에 스트리밍 엔드포인트가 없으면(404) chatbot_reply 응답을 한 번에 yield.
+    """
+    b64_encoding_id = _encode_chat_session_id(session_id)
+    if not b64_encoding_id:
+        yield "죄송합니다. 세션 ID 처리에 문제가 발생했습니다."
+        return
+
+    data = {"session_id": b64_encoding_id, "user_input": user_input}
+    received = False
+    fallback = False
+    with session_locks.hold(_encode_session_id(session_id)):
+        try:
+            with api_client.post("/chatbot/chat-stream", "chatbot_stream", json=data, stream=True,
+                                 headers={"Accept": "text/event-stream, application/x-ndjson"}) as res:
+                if res.status_code == 404:
+                    fallback = True
+                elif res.status_code != 200:
+                    print(f"❌ 서버 오류: {res.status_code}")
+                    yield "죄송합니다. 서버에서 오류가 발생했습니다."
+                else:
+                    for token in _iter_stream_tokens(res):
+                        received = True
+                        yield token
+                if res.status_code != 200:
+                    # 오류 본문까지 읽어야 연결이 풀로 돌아감 (중간에 그만두면 with가 연결을 닫음)
+                    res.content
+        except requests.exceptions.RequestException as e:
+            print(f"❌ 스트리밍 응답 수신 실패: {str(e)}")
+            # 이미 받은 내용이 있으면 거기까지만 사용
+            if not received:
+                if isinstance(e, requests.exceptions.Timeout):
+                    yield "죄송합니다. 서버 응답이 지연되고 있습니다."
+                else:
+                    yield "죄송합니다. 서버와의 통신에 문제가 발생했습니다."
+
+    if fallback:
+        # 세션 락을 놓은 뒤 호출 (chatbot_reply가 같은 락을 잡음)
+        yield chatbot_reply(session_id, user_input)
+
+### 세션 저장/삭제 요청 (실패 시 예외 발생 - 재시도하는 쪽에서 사용)
+def save_session_request(b64_encoding_id: str, idempotency_key: str = None) -> str:
+    data = {"session_id": b64_encoding_id}
+    with session_locks.hold(b64_encoding_id):
+        res = api_client.post("/chatbot/save-session", "chatbot_session", json=data,
+                              headers=_idempotency_headers(idempotency_key))
+    res.raise_for_status()
+    return res.json().get("reply", "")
+
+def clear_session_request(b64_encoding_id: str, idempotency_key: str = None) -> str:
+    with session_locks.hold(b64_encoding_id):
+        res = api_client.delete("/chatbot/clear-session", "chatbot_session", params={"session_id": b64_encoding_id},
+                                headers=_idempotency_headers(idempotency_key))
+    res.raise_for_status()
+    return res.json().get("reply", "")
 
 ### 챗봇 세션 저장 
 def chatbot_session_save(session_id: str) -> str:
     """현재 세션의 대화 내용을 벡터 DB에 저장"""
-    with session_lock:
-        try:
-            b64_encoding_id = _encode_session_id(session_id)
-            if not b64_encoding_id:
-                return "죄송합니다. 세션 ID 처리에 문제가 발생했습니다."
-                
-            data = {"session_id": b64_encoding_id}
-            res = requests.post(f"{API_BASE}/chatbot/save-session", json=data)
-            return res.json().get("reply", "")
-        except Exception as e:
-            print(f"[chatbot_session_save ERROR] {e}")
-            return "죄송합니다. 서버 응답에 문제가 있습니다."
+    try:
+        b64_encoding_id = _encode_session_id(session_id)
+        if not b64_encoding_id:
+            return "죄송합니다. 세션 ID 처리에 문제가 발생했습니다."
+            
+        return save_session_request(b64_encoding_id)
+    except Exception as e:
+        print(f"[chatbot_session_save ERROR] {e}")
+        return "죄송합니다. 서버 응답에 문제가 있습니다."
     
 ### 챗봇 세션(버퍼) 클리어 
 def chatbot_session_clear(session_id: str) -> str:
     """챗봇 세션 내 대화 이력 초기화 및 삭제"""
-    with session_lock:
-        try:
-            b64_encoding_id = _encode_session_id(session_id)
-            if not b64_encoding_id:
-                return "죄송합니다. 세션 ID 처리에 문제가 발생했습니다."
-                
-            res = requests.delete(f"{API_BASE}/chatbot/clear-session?session_id={b64_encoding_id}")
-            return res.json().get("reply", "")
-        except Exception as e:
-            print(f"[chatbot_session_clear ERROR] {e}")
-            return "죄송합니다. 서버 응답에 문제가 있습니다."
+    try:
+        b64_encoding_id = _encode_session_id(session_id)
+        if not b64_encoding_id:
+            return "죄송합니다. 세션 ID 처리에 문제가 발생했습니다."
+            
+        return clear_session_request(b64_encoding_id)
+    except Exception as e:
+        print(f"[chatbot_session_clear ERROR] {e}")
+        return "죄송합니다. 서버 응답에 문제가 있습니다."
 
 ### TTS 
 def get_tts_audio(text: str) -> bytes:
     """텍스트를 음성으로 변환하여 음성 바이너리(wav) 반환"""
     try:
-        res = requests.post(f"{API_BASE}/tts", json={"text": text})
+        res = api_client.post("/tts", "tts", json={"text": text})
         if res.status_code == 200:
             return res.content  # .wav 바이트
         else:
@@ -195,11 +408,28 @@ def get_tts_audio(text: str) -> bytes:
         print(f"[get_tts_audio ERROR] {e}")
         return b""
     
+### 메뉴 (ETag 캐시)
+_menu_cache = {"etag": None, "menus": []}
+
+def get_menus_if_changed(etag: str = None) -> tuple:
+    """etag 이후 메뉴가 바뀌었으면 (True, 메뉴 목록, 새 ETag), 그대로면(304) (False, None, etag)"""
+    headers = {"If-None-Match": etag} if etag else {}
+    res = api_client.get("/menu/", "menu", headers=headers)
+    if res.status_code == 304:
+        return False, None, etag
+    res.raise_for_status()
+    data = res.json()
+    menus = data["menu"] if isinstance(data, dict) else data
+    return True, menus, res.headers.get("ETag")
+
 ### 메뉴 전체 불러오기
 def get_all_menus() -> list:
+    """메뉴 목록 - 바뀌지 않았으면 서버가 304만 보내고 캐시된 목록을 반환"""
     try:
-        res = requests.get(f"{API_BASE}/menu/")
-        return res.json()
+        changed, menus, etag = get_menus_if_changed(_menu_cache["etag"])
+        if changed:
+            _menu_cache.update(etag=etag, menus=menus)
+        return _menu_cache["menus"]
     except Exception as e:
         print(f"[get_all_menus ERROR] {e}")
-        return []
\ No newline at end of file
+        return _menu_cache["menus"]
\ No newline at end of file
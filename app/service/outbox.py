@@ -0,0 +1,186 @@
+"""
+서버 전송 outbox
+
+사용자 등록, 챗봇 세션 저장/삭제, 주문 업로드를 먼저 로컬 SQLite(DB_PATH)의 outbox
+테이블에 기록하고 백그라운드 스레드가 서버로 보낸다. 네트워크가 끊기거나 앱이 종료돼도
+요청이 사라지지 않고, 다음 실행 때 이어서 전송된다.
+
+- 같은 idempotency_key는 한 번만 쌓이고, 서버에도 Idempotency-Key 헤더로 전달됨
+- 쌓인 순서(id)대로 전송 - 앞 요청이 일시적으로 실패하면 뒤 요청도 기다림 (저장 → 삭제 순서 보장)
+- 일시적 실패(연결 오류, 5xx, 408/429)는 지수 백오프로 재시도, 그 밖의 4xx는 failed로 남김
+
+UI 스레드(proceed_to_payment/on_leave 등)는 enqueue()로 로컬 DB에 한 줄 쓰고 바로 반환하므로
+서버가 느려도 화면 전환이 멈추지 않는다. 예전 비동기 API 클라이언트(이벤트 루프 스레드 +
+메모리 재시도)는 앱이 종료되면 요청이 사라졌기 때문에 이 outbox로 대체했다.
+"""
+
+import json
+import threading
+import time
+import uuid
+import requests
+from app.config import DB_PATH, OUTBOX_BATCH_SIZE, OUTBOX_RETRY_BACKOFF, OUTBOX_RETRY_BACKOFF_MAX
+from app.core.db_pool import get_pool
+from app.core.schema import ensure_schema
+from app.service.api_client import (
+    _encode_session_id, user_payload, register_user_request, save_session_request,
+    clear_session_request, create_order_request,
+)
+
+STATUS_PENDING = "pending"
+STATUS_FAILED = "failed"
+
+
+def _is_permanent(error):
+    """다시 보내도 성공할 수 없는 오류인지 (요청 자체가 잘못된 4xx)"""
+    if not isinstance(error, requests.HTTPError) or error.response is None:
+        return False
+    status = error.response.status_code
+    return 400 <= status < 500 and status not in (408, 429)
+
+
+class Outbox:
+    """SQLite outbox 테이블 + 백그라운드 전송 스레드"""
+
+    def __init__(self, db_path=DB_PATH, batch_size=OUTBOX_BATCH_SIZE):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.handlers = {}  # kind -> handler(payload, idempotency_key)
+        self.wakeup = threading.Event()
+        self.stopped = threading.Event()
+        self.thread = None
+        self._initialized = False
+
+    @property
+    def pool(self):
+        return get_pool(self.db_path)
+
+    def _initialize(self):
+        """outbox 테이블 준비 (최초 사용 시 한 번, 스키마는 app/core/schema.py)"""
+        if self._initialized:
+            return
+        ensure_schema(self.db_path)
+        self._initialized = True
+
+    def register(self, kind, handler):
+        """kind 요청을 보낼 handler(payload, idempotency_key) 등록 - 실패 시 예외를 던져야 함"""
+        self.handlers[kind] = handler
+
+    def enqueue(self, kind, payload, idempotency_key=None):
+        """요청을 outbox에 기록하고 전송 스레드를 깨움 - 이미 있는 키면 무시하고 False 반환"""
+        self._initialize()
+        idempotency_key = idempotency_key or f"{kind}:{uuid.uuid4().hex}"
+        cursor = self.pool.write(
+            'INSERT OR IGNORE INTO outbox (idempotency_key, kind, payload) VALUES (?, ?, ?)',
+            (idempotency_key, kind, json.dumps(payload, ensure_ascii=False)))
+        added = cursor.rowcount > 0
+        if added:
+            print(f"📮 outbox 추가: {kind} ({idempotency_key})")
+        self.wakeup.set()
+        return added
+
+    def pending_count(self):
+        self._initialize()
+        return self.pool.query_one('SELECT COUNT(*) FROM outbox WHERE status = ?', (STATUS_PENDING,))[0]
+
+    def start(self):
+        """전송 스레드 시작 (이미 실행 중이면 무시)"""
+        if self.thread is not None and self.thread.is_alive():
+            return
+        self._initialize()
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        print(f"📮 outbox 전송 시작 (대기 {self.pending_count()}건)")
+
+    def stop(self, timeout=2.0):
+        self.stopped.set()
+        self.wakeup.set()
+        if self.thread is not None:
+            self.thread.join(timeout)
+            self.thread = None
+
+    def _run(self):
+        while not self.stopped.is_set():
+            try:
+                wait = self.flush()
+            except Exception as e:
+                print(f"❌ outbox 전송 중 오류: {str(e)}")
+                wait = OUTBOX_RETRY_BACKOFF
+            # 새 요청이 들어오거나 다음 재시도 시각이 될 때까지 대기
+            self.wakeup.wait(wait)
+            self.wakeup.clear()
+
+    def flush(self):
+        """대기 중인 요청을 순서대로 전송하고, 다음 전송까지 기다릴 시간(초) 반환 (없으면 None)"""
+        while not self.stopped.is_set():
+            rows = self.pool.query(
+                'SELECT id, idempotency_key, kind, payload, attempts, next_attempt_at FROM outbox '
+                'WHERE status = ? ORDER BY id LIMIT ?', (STATUS_PENDING, self.batch_size))
+            if not rows:
+                return None
+
+            for row_id, key, kind, payload, attempts, next_attempt_at in rows:
+                now = time.time()
+                if next_attempt_at > now:
+                    # 앞 요청이 재시도 대기 중이면 뒤 요청도 보내지 않음
+                    return next_attempt_at - now
+                if not self._send(row_id, key, kind, json.loads(payload), attempts):
+                    # 일시적 실패 - 다음 루프에서 이 요청의 재시도 시각까지 대기
+                    break
+
+    def _send(self, row_id, key, kind, payload, attempts):
+        """요청 하나 전송 - 다음 요청으로 넘어가도 되면 True"""
+        handler = self.handlers.get(kind)
+        try:
+            if handler is None:
+                raise ValueError(f"등록되지 않은 outbox 종류: {kind}")
+            handler(payload, key)
+        except Exception as e:
+            attempts += 1
+            if _is_permanent(e) or handler is None:
+                print(f"❌ outbox 전송 실패 (재시도 안 함): {kind} ({key}) - {e}")
+                self.pool.write('UPDATE outbox SET status = ?, attempts = ?, last_error = ? WHERE id = ?',
+                                (STATUS_FAILED, attempts, str(e), row_id))
+                return True
+            delay = min(OUTBOX_RETRY_BACKOFF * (2 ** (attempts - 1)), OUTBOX_RETRY_BACKOFF_MAX)
+            print(f"⚠️ outbox 전송 실패, {delay:.1f}초 후 재시도 ({attempts}회): {kind} - {e}")
+            self.pool.write('UPDATE outbox SET attempts = ?, next_attempt_at = ?, last_error = ? WHERE id = ?',
+                            (attempts, time.time() + delay, str(e), row_id))
+            return False
+
+        self.pool.write('DELETE FROM outbox WHERE id = ?', (row_id,))
+        print(f"✅ outbox 전송 완료: {kind} ({key})")
+        return True
+
+
+# 프로세스 전체 공유 인스턴스
+outbox = Outbox()
+outbox.register("register_user", lambda payload, key: register_user_request(payload, key))
+outbox.register("session_save", lambda payload, key: save_session_request(payload["session_id"], key))
+outbox.register("session_clear", lambda payload, key: clear_session_request(payload["session_id"], key))
+outbox.register("order", lambda payload, key: create_order_request(payload, key))
+
+
+### 신규 사용자 등록
+def enqueue_register_user(name, phone, face_encoding, local_user_id=None):
+    """서버 사용자 등록 요청을 outbox에 기록 (로컬 user_id가 있으면 그 기준으로 중복 제거)"""
+    key = f"register_user:{local_user_id}" if local_user_id is not None else None
+    return outbox.enqueue("register_user", user_payload(name, phone, face_encoding), key)
+
+### 챗봇 세션 저장
+def enqueue_session_save(session_id, visit_id):
+    """세션 저장 요청 - 키는 방문(visit_id)마다 달라서 같은 고객의 다음 방문 요청이 묻히지 않음"""
+    b64_encoding_id = _encode_session_id(session_id)
+    return outbox.enqueue("session_save", {"session_id": b64_encoding_id}, f"session_save:{visit_id}")
+
+### 챗봇 세션 클리어
+def enqueue_session_clear(session_id, visit_id):
+    """세션 삭제 요청 - 먼저 쌓인 저장 요청이 전송된 뒤에 보냄"""
+    b64_encoding_id = _encode_session_id(session_id)
+    return outbox.enqueue("session_clear", {"session_id": b64_encoding_id}, f"session_clear:{visit_id}")
+
+### 주문 업로드
+def enqueue_order(order):
+    """주문 정보(JSON 직렬화 가능한 dict)를 outbox에 기록"""
+    return outbox.enqueue("order", order)
@@ -1,11 +1,13 @@
 import base64
-import sounddevice as sd
 import soundfile as sf
 import io
+import numpy as np
+from app.core.audio_output import AudioClip, audio_output
 
 def play_audio_base64(audio_base64_str):
     audio_bytes = base64.b64decode(audio_base64_str)
     with sf.SoundFile(io.BytesIO(audio_bytes)) as f:
-        data = f.read(dtype='float32')
-        sd.play(data, f.samplerate)
-        sd.wait()
+        data = f.read(dtype='int16', always_2d=True)
+        # 앱 전체가 공유하는 출력 스트림으로 재생 (장치를 새로 열지 않음)
+        clip = AudioClip(data.mean(axis=1).astype(np.int16), f.samplerate)
+        audio_output.play(clip).wait()
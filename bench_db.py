@@ -0,0 +1,140 @@
+"""
+DB 접근 벤치마크 - 호출마다 sqlite3.connect 하는 방식과 연결 풀(db_pool) 비교
+
+사용법:
+    python bench_db.py --users 1000 --repeat 2000
+    python bench_db.py --db faces.db --menu-db data/Comfile_Coffee_DB.db
+
+--db를 주지 않으면 임시 DB에 가상 사용자/메뉴를 만들어 측정.
+--db/--menu-db로 준 실제 DB는 임시 폴더에 복사해서 측정 (풀이 WAL로 바꾸므로 원본은 열지 않음)
+"""
+
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+import numpy as np
+from app.core.db_pool import DatabasePool
+from app.core.face_encoding import encode_face
+
+MATCH_SQL = "SELECT user_id, name, face_encoding FROM users WHERE face_encoding IS NOT NULL"
+MENU_SQL = "SELECT menu_name, price, image FROM menus WHERE menu_name = ?"
+INSERT_SQL = "INSERT INTO users (face_encoding, name, phone) VALUES (?, ?, NULL)"
+
+
+def create_synthetic_db(path, users, menus=30):
+    """벤치마크용 가상 사용자/메뉴 DB 생성"""
+    rng = np.random.default_rng(0)
+    conn = sqlite3.connect(path)
+    conn.execute("""CREATE TABLE users (user_id INTEGER PRIMARY KEY AUTOINCREMENT, face_encoding BLOB,
+                    name TEXT, phone TEXT, created_at DATETIME DEFAULT CURRENT_TIMESTAMP)""")
+    conn.execute("""CREATE TABLE menus (menu_id INTEGER PRIMARY KEY AUTOINCREMENT, menu_name TEXT NOT NULL,
+                    category TEXT NOT NULL, info TEXT, price REAL DEFAULT 3000, image TEXT)""")
+    conn.execute("CREATE INDEX idx_menus_menu_name ON menus (menu_name)")
+    conn.executemany(INSERT_SQL, [(encode_face(rng.normal(0.0, 0.09, 128)), f"user{i}") for i in range(users)])
+    conn.executemany("INSERT INTO menus (menu_name, category, price, image) VALUES (?, ?, ?, ?)",
+                     [(f"menu{i}", "커피", 1500 + i * 100, f"menu{i}.png") for i in range(menus)])
+    conn.commit()
+    conn.close()
+
+
+def copy_db(path, tmp_dir, name):
+    """실제 DB를 임시 폴더에 복사 (SQLite 백업 API - WAL에 남은 내용까지 포함)"""
+    copy_path = os.path.join(tmp_dir, name)
+    source = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    target = sqlite3.connect(copy_path)
+    try:
+        source.backup(target)
+    finally:
+        source.close()
+        target.close()
+    return copy_path
+
+
+def per_call_query(db_path, sql, params=()):
+    """기존 방식 - 호출마다 연결을 열고 닫음"""
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+
+def per_call_write(db_path, sql, params=()):
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute(sql, params)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def measure(fn, repeat):
+    """호출당 지연 시간 (평균ms, p95ms)"""
+    latencies = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        fn(i)
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies = np.array(latencies)
+    return latencies.mean(), np.percentile(latencies, 95)
+
+
+def report(name, per_call, pooled):
+    print(f"{name:<8} per-call 평균 {per_call[0]:7.3f}ms p95 {per_call[1]:7.3f}ms | "
+          f"pool 평균 {pooled[0]:7.3f}ms p95 {pooled[1]:7.3f}ms | {per_call[0] / pooled[0]:5.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DB 연결 풀 벤치마크")
+    parser.add_argument("--db", help="사용자 DB (faces.db) 경로 - 없으면 임시 DB 생성")
+    parser.add_argument("--menu-db", help="메뉴 DB 경로 (기본: --db와 같음)")
+    parser.add_argument("--users", type=int, default=1000, help="가상 사용자 수")
+    parser.add_argument("--repeat", type=int, default=2000, help="메뉴 조회/쓰기 반복 횟수")
+    parser.add_argument("--match-repeat", type=int, default=200, help="매칭용 전체 인코딩 조회 반복 횟수")
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.TemporaryDirectory()
+    synthetic = args.db is None
+    if synthetic:
+        db_path = os.path.join(tmp_dir.name, "bench.db")
+        create_synthetic_db(db_path, args.users)
+    else:
+        db_path = copy_db(args.db, tmp_dir.name, "users.db")
+    menu_db = copy_db(args.menu_db, tmp_dir.name, "menu.db") if args.menu_db else db_path
+
+    menu_names = [row[0] for row in per_call_query(menu_db, "SELECT menu_name FROM menus")]
+    if not menu_names:
+        print("menus 테이블이 비어 있습니다.")
+        return
+    user_pool = DatabasePool(db_path)
+    menu_pool = user_pool if menu_db == db_path else DatabasePool(menu_db)
+    print(f"사용자 {len(per_call_query(db_path, MATCH_SQL))}명, 메뉴 {len(menu_names)}개")
+
+    # 기존 per-call 방식이 WAL 전환 전 상태에서 측정되지 않도록 풀을 먼저 연결
+    user_pool.connection()
+    menu_pool.connection()
+
+    report("match",
+           measure(lambda i: per_call_query(db_path, MATCH_SQL), args.match_repeat),
+           measure(lambda i: user_pool.query(MATCH_SQL), args.match_repeat))
+    report("menu",
+           measure(lambda i: per_call_query(menu_db, MENU_SQL, (menu_names[i % len(menu_names)],)), args.repeat),
+           measure(lambda i: menu_pool.query(MENU_SQL, (menu_names[i % len(menu_names)],)), args.repeat))
+
+    if synthetic:
+        # 쓰기는 가상 DB에서만 측정
+        blob = encode_face(np.zeros(128))
+        report("write",
+               measure(lambda i: per_call_write(db_path, INSERT_SQL, (blob, f"bench{i}")), args.repeat),
+               measure(lambda i: user_pool.write(INSERT_SQL, (blob, f"bench{i}")), args.repeat))
+
+    user_pool.close()
+    if menu_pool is not user_pool:
+        menu_pool.close()
+    tmp_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
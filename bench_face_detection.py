@@ -0,0 +1,100 @@
+"""
+축소 배율별 얼굴 검출 벤치마크 - 녹화 영상에서 검출 지연 시간과 매칭 정확도 비교
+
+사용법:
+    python bench_face_detection.py clip.mp4 --scales 1.0 0.5 0.35 0.25
+    python bench_face_detection.py clip.mp4 --full-frame   (추적처럼 전체 프레임 사용)
+
+배율 1.0 결과를 기준으로 각 배율의 검출률, 인코딩 거리, 매칭 ID 일치율을 출력
+"""
+
+import argparse
+import time
+import cv2
+import numpy as np
+import face_recognition
+from app.core.face_detection import detect_faces, find_best_match
+
+
+def load_frames(path, step, limit):
+    """영상에서 step 간격으로 프레임 추출"""
+    capture = cv2.VideoCapture(path)
+    frames = []
+    index = 0
+    while len(frames) < limit:
+        ret, frame = capture.read()
+        if not ret:
+            break
+        if index % step == 0:
+            frames.append(frame)
+        index += 1
+    capture.release()
+    return frames
+
+
+def center_crop(frame):
+    """extract_face_embeddings와 같은 가운데 영역"""
+    h, w, _ = frame.shape
+    return frame[h // 4:3 * h // 4, w // 3:2 * w // 3]
+
+
+def run_scale(rgb_frames, scale):
+    """배율 하나에 대해 프레임별 (검출 ms, 가장 큰 얼굴 인코딩, 매칭 ID)"""
+    results = []
+    for rgb in rgb_frames:
+        start = time.perf_counter()
+        locations = detect_faces(rgb, scale=scale)
+        detect_ms = (time.perf_counter() - start) * 1000
+
+        encoding = None
+        match_id = None
+        if locations:
+            largest = max(locations, key=lambda loc: (loc[2] - loc[0]) * (loc[1] - loc[3]))
+            encoding = face_recognition.face_encodings(rgb, [largest])[0]
+            match_id = find_best_match(encoding)[0]
+        results.append((detect_ms, encoding, match_id))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="얼굴 검출 축소 배율 벤치마크")
+    parser.add_argument("clip", help="녹화 영상 경로")
+    parser.add_argument("--scales", type=float, nargs="+", default=[1.0, 0.5, 0.35, 0.25])
+    parser.add_argument("--step", type=int, default=5, help="프레임 샘플링 간격")
+    parser.add_argument("--limit", type=int, default=200, help="최대 프레임 수")
+    parser.add_argument("--full-frame", action="store_true", help="가운데 영역 대신 전체 프레임 사용")
+    args = parser.parse_args()
+
+    frames = load_frames(args.clip, args.step, args.limit)
+    if not args.full_frame:
+        frames = [center_crop(frame) for frame in frames]
+    rgb_frames = [cv2.cvtColor(frame, cv2.COLOR_BGR2RGB) for frame in frames]
+    print(f"프레임 수: {len(rgb_frames)}, 크기: {rgb_frames[0].shape[1]}x{rgb_frames[0].shape[0]}")
+
+    reference = run_scale(rgb_frames, 1.0)
+    ref_detected = [r for r in reference if r[1] is not None]
+
+    print(f"{'배율':>6} {'평균ms':>8} {'p95ms':>8} {'검출률':>8} {'인코딩거리':>10} {'매칭일치':>8}")
+    for scale in args.scales:
+        results = reference if scale == 1.0 else run_scale(rgb_frames, scale)
+        latencies = np.array([r[0] for r in results])
+        detected = sum(1 for r in results if r[1] is not None)
+        detection_rate = detected / max(1, len(ref_detected))
+
+        distances = []
+        agreements = []
+        for (_, ref_encoding, ref_id), (_, encoding, match_id) in zip(reference, results):
+            if ref_encoding is None:
+                continue
+            if encoding is not None:
+                distances.append(np.linalg.norm(ref_encoding - encoding))
+            agreements.append(match_id == ref_id)
+
+        mean_distance = np.mean(distances) if distances else float("nan")
+        agreement = np.mean(agreements) if agreements else float("nan")
+        print(f"{scale:>6.2f} {latencies.mean():>8.1f} {np.percentile(latencies, 95):>8.1f} "
+              f"{detection_rate:>8.2%} {mean_distance:>10.4f} {agreement:>8.2%}")
+
+
+if __name__ == "__main__":
+    main()
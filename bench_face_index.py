@@ -0,0 +1,79 @@
+"""
+얼굴 ANN 인덱스 벤치마크 - 전수 계산 대비 recall / 지연 시간 비교
+
+사용법:
+    python bench_face_index.py --size 100000 --queries 500
+    python bench_face_index.py --db faces.db
+"""
+
+import argparse
+import sqlite3
+import time
+import numpy as np
+from app.core.face_gallery import FaceGallery
+from app.core.face_encoding import decode_face
+
+
+def synthetic_entries(size, seed=0):
+    """face_recognition 인코딩과 비슷한 분포의 가상 사용자 생성"""
+    rng = np.random.default_rng(seed)
+    encodings = rng.normal(0.0, 0.09, (size, 128)).astype(np.float32)
+    return [(i + 1, f"user{i + 1}", encodings[i]) for i in range(size)]
+
+
+def db_entries(db_path):
+    """faces.db의 실제 사용자 인코딩 로드"""
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute("SELECT user_id, name, face_encoding FROM users WHERE face_encoding IS NOT NULL").fetchall()
+    conn.close()
+    return [(user_id, name, decode_face(blob)) for user_id, name, blob in rows]
+
+
+def measure(gallery, queries):
+    """질의별 최고 매칭 ID와 지연 시간(ms)"""
+    results, latencies = [], []
+    for query in queries:
+        start = time.perf_counter()
+        results.append(gallery.match(query)[0])
+        latencies.append((time.perf_counter() - start) * 1000)
+    return results, np.array(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="얼굴 ANN 인덱스 벤치마크")
+    parser.add_argument("--size", type=int, default=100000, help="가상 사용자 수")
+    parser.add_argument("--db", help="가상 데이터 대신 사용할 faces.db 경로")
+    parser.add_argument("--queries", type=int, default=500, help="질의 수")
+    parser.add_argument("--noise", type=float, default=0.02, help="질의에 더할 노이즈 표준편차")
+    parser.add_argument("--top-k", type=int, default=32)
+    parser.add_argument("--nprobe", type=int, default=8)
+    args = parser.parse_args()
+
+    entries = db_entries(args.db) if args.db else synthetic_entries(args.size)
+    rng = np.random.default_rng(1)
+    picks = rng.choice(len(entries), min(args.queries, len(entries)), replace=False)
+    queries = [np.asarray(entries[i][2], dtype=np.float32) + rng.normal(0.0, args.noise, 128).astype(np.float32)
+               for i in picks]
+
+    brute = FaceGallery(None, index_type=None, index_path=None)
+    brute.build(entries)
+
+    start = time.perf_counter()
+    ivf = FaceGallery(None, index_type="ivf", index_min_size=0, index_path=None,
+                      top_k=args.top_k, nprobe=args.nprobe)
+    ivf.build(entries)
+    build_seconds = time.perf_counter() - start
+
+    expected, brute_ms = measure(brute, queries)
+    found, ivf_ms = measure(ivf, queries)
+    recall = np.mean([a == b for a, b in zip(expected, found)])
+
+    print(f"사용자 수: {len(entries)}, 질의 수: {len(queries)}")
+    print(f"IVF 인덱스 구성: {build_seconds:.2f}s (nlist={ivf.index.nlist}, nprobe={args.nprobe}, top_k={args.top_k})")
+    print(f"전수 계산  평균 {brute_ms.mean():.3f}ms  p95 {np.percentile(brute_ms, 95):.3f}ms")
+    print(f"IVF        평균 {ivf_ms.mean():.3f}ms  p95 {np.percentile(ivf_ms, 95):.3f}ms")
+    print(f"recall@1 (전수 계산 대비): {recall:.4f}")
+
+
+if __name__ == "__main__":
+    main()
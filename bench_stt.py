@@ -0,0 +1,145 @@
+"""
+STT 백엔드 벤치마크 - 한국어 주문 음성 폴더에서 WER/CER과 RTF 비교
+
+사용법:
+    python bench_stt.py samples/ --backends whisper faster-whisper whisper-cpp --model-size small
+
+samples/ 안의 각 WAV 파일과 같은 이름의 .txt 파일(정답 문장)을 짝지어 사용
+    samples/아메리카노_두잔.wav
+    samples/아메리카노_두잔.txt
+
+WER: 어절 단위 오류율, CER: 공백 제외 글자 단위 오류율 (한국어는 CER이 더 의미 있음)
+RTF: 추론 시간 / 음성 길이 (1.0보다 작아야 실시간보다 빠름)
+"""
+
+import argparse
+import os
+import re
+import time
+import wave
+import numpy as np
+from app.core.stt_backends import STT_BACKENDS, create_stt_backend
+
+SAMPLE_RATE = 16000
+
+
+def load_wav(path):
+    """WAV 파일을 16kHz mono float32 배열로 읽기"""
+    with wave.open(path, "rb") as wf:
+        channels = wf.getnchannels()
+        sample_width = wf.getsampwidth()
+        rate = wf.getframerate()
+        data = wf.readframes(wf.getnframes())
+
+    if sample_width != 2:
+        raise ValueError(f"16bit PCM WAV만 지원합니다: {path}")
+    audio = np.frombuffer(data, dtype="<i2").astype(np.float32) / 32768.0
+    if channels > 1:
+        audio = audio.reshape(-1, channels).mean(axis=1)
+    if rate != SAMPLE_RATE:
+        # 선형 보간으로 리샘플링
+        duration = len(audio) / rate
+        target = np.linspace(0, duration, int(duration * SAMPLE_RATE), endpoint=False)
+        audio = np.interp(target, np.arange(len(audio)) / rate, audio).astype(np.float32)
+    return audio
+
+
+def load_samples(folder):
+    """(이름, 오디오, 정답 문장) 목록"""
+    samples = []
+    for filename in sorted(os.listdir(folder)):
+        if not filename.lower().endswith(".wav"):
+            continue
+        base = os.path.splitext(filename)[0]
+        reference_path = os.path.join(folder, base + ".txt")
+        if not os.path.exists(reference_path):
+            print(f"⚠️ 정답 파일 없음, 건너뜀: {filename}")
+            continue
+        with open(reference_path, encoding="utf-8") as f:
+            reference = f.read().strip()
+        samples.append((base, load_wav(os.path.join(folder, filename)), reference))
+    return samples
+
+
+def normalize(text):
+    """문장부호 제거 및 공백 정리"""
+    text = re.sub(r"[^\w\s]", " ", text.lower())
+    return " ".join(text.split())
+
+
+def edit_distance(ref, hyp):
+    """Levenshtein 거리 (토큰 목록)"""
+    previous = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        current = [i]
+        for j, h in enumerate(hyp, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (r != h)))
+        previous = current
+    return previous[-1]
+
+
+def run_backend(name, model_size, samples):
+    """백엔드 하나로 전체 샘플 인식 - (로드 시간, WER, CER, RTF, 결과 목록)"""
+    start = time.perf_counter()
+    backend = create_stt_backend(name, model_size)
+    load_time = time.perf_counter() - start
+
+    # 첫 호출의 초기화 비용은 측정에서 제외
+    backend.transcribe(samples[0][1])
+
+    word_errors = word_total = char_errors = char_total = 0
+    audio_time = infer_time = 0.0
+    results = []
+    for base, audio, reference in samples:
+        start = time.perf_counter()
+        hypothesis = backend.transcribe(audio)
+        infer_time += time.perf_counter() - start
+        audio_time += len(audio) / SAMPLE_RATE
+
+        ref, hyp = normalize(reference), normalize(hypothesis)
+        word_errors += edit_distance(ref.split(), hyp.split())
+        word_total += len(ref.split())
+        char_errors += edit_distance(list(ref.replace(" ", "")), list(hyp.replace(" ", "")))
+        char_total += len(ref.replace(" ", ""))
+        results.append((base, reference, hypothesis))
+
+    wer = word_errors / max(1, word_total)
+    cer = char_errors / max(1, char_total)
+    rtf = infer_time / max(1e-9, audio_time)
+    return load_time, wer, cer, rtf, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="STT 백엔드 WER/RTF 벤치마크")
+    parser.add_argument("folder", help="WAV + 정답 .txt 폴더")
+    parser.add_argument("--backends", nargs="+", default=list(STT_BACKENDS), choices=list(STT_BACKENDS))
+    parser.add_argument("--model-size", default=None, help="모델 크기 (기본: config의 STT_MODEL_SIZE)")
+    parser.add_argument("--verbose", action="store_true", help="파일별 인식 결과 출력")
+    args = parser.parse_args()
+
+    samples = load_samples(args.folder)
+    if not samples:
+        print("❌ 평가할 샘플이 없습니다.")
+        return
+    total_audio = sum(len(audio) for _, audio, _ in samples) / SAMPLE_RATE
+    print(f"샘플 수: {len(samples)}, 전체 길이: {total_audio:.1f}초")
+
+    rows = []
+    for name in args.backends:
+        try:
+            load_time, wer, cer, rtf, results = run_backend(name, args.model_size, samples)
+        except ImportError as e:
+            print(f"⚠️ {name} 건너뜀 (패키지 없음: {e})")
+            continue
+        rows.append((name, load_time, wer, cer, rtf))
+        if args.verbose:
+            for base, reference, hypothesis in results:
+                print(f"  [{name}] {base}\n    정답: {reference}\n    인식: {hypothesis}")
+
+    print(f"{'백엔드':<16} {'로드(s)':>8} {'WER':>8} {'CER':>8} {'RTF':>8}")
+    for name, load_time, wer, cer, rtf in rows:
+        print(f"{name:<16} {load_time:>8.1f} {wer:>8.2%} {cer:>8.2%} {rtf:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
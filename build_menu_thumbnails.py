@@ -0,0 +1,62 @@
+"""
+메뉴 썸네일 생성 - 메뉴 DB의 각 메뉴 이미지를 MENU_THUMB_SIZES 크기별 PNG로 저장
+
+사용법:
+    python build_menu_thumbnails.py            (원본보다 오래된 썸네일만 다시 생성)
+    python build_menu_thumbnails.py --force    (모두 다시 생성)
+
+배포 전이나 메뉴 이미지를 바꾼 뒤 실행 (썸네일이 없으면 화면이 처음 그릴 때 필요한 크기만 만듦)
+"""
+
+import argparse
+import os
+import time
+from app.config import MENU_THUMB_SIZES, MENU_THUMB_DIR
+from app.core.menu_catalog import get_menu_catalog
+from app.core.menu_thumbnails import build_thumbnail, thumbnail_path, source_image_path
+
+
+def is_fresh(source, menu_id):
+    """모든 크기의 썸네일이 원본보다 최신인지"""
+    source_mtime = os.path.getmtime(source)
+    for size in MENU_THUMB_SIZES:
+        path = thumbnail_path(menu_id, size)
+        if not os.path.exists(path) or os.path.getmtime(path) < source_mtime:
+            return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="메뉴 썸네일 생성")
+    parser.add_argument("--force", action="store_true", help="최신 썸네일이 있어도 다시 생성")
+    args = parser.parse_args()
+
+    snapshot = get_menu_catalog().snapshot()
+    start = time.time()
+    built = skipped = missing = 0
+    source_bytes = 0
+    thumb_bytes = {size: 0 for size in MENU_THUMB_SIZES}
+
+    for item in snapshot.items:
+        source = source_image_path(item.image or "")
+        if not item.image or not os.path.exists(source):
+            print(f"⚠️ 원본 이미지 없음: {item.menu_id} {item.menu_name} ({item.image})")
+            missing += 1
+            continue
+        if not args.force and is_fresh(source, item.menu_id):
+            skipped += 1
+            continue
+        source_bytes += os.path.getsize(source)
+        for path, size_bytes in build_thumbnail(source, item.menu_id):
+            thumb_bytes[int(os.path.basename(os.path.dirname(path)))] += size_bytes
+        built += 1
+
+    print(f"✅ 썸네일 {built}개 생성, {skipped}개 최신, {missing}개 원본 없음 ({time.time() - start:.1f}초)")
+    if built:
+        print(f"원본 {source_bytes / 1024 / 1024:.1f}MB → " + ", ".join(
+            f"{size}px {total / 1024:.0f}KB (평균 {total / built / 1024:.1f}KB)" for size, total in thumb_bytes.items()))
+    print(f"저장 위치: {MENU_THUMB_DIR}")
+
+
+if __name__ == "__main__":
+    main()
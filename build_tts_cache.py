@@ -0,0 +1,54 @@
+"""
+고정 안내 문구 TTS 미리 합성 - config의 TTS_PROMPTS를 캐시에 저장
+
+사용법:
+    python build_tts_cache.py            (캐시에 없는 문구만 합성)
+    python build_tts_cache.py --force    (모두 다시 합성)
+
+배포 전이나 문구를 바꾼 뒤 실행하면 첫 손님부터 네트워크 없이 바로 재생됨
+"""
+
+import argparse
+import time
+from app.config import TTS_PROMPTS
+from app.core.tts import get_tts_manager
+from app.core.tts_cache import cache_key
+
+
+def main():
+    parser = argparse.ArgumentParser(description="고정 안내 문구 TTS 캐시 생성")
+    parser.add_argument("--force", action="store_true", help="캐시에 있어도 다시 합성")
+    args = parser.parse_args()
+
+    tts_manager = get_tts_manager()
+    voice, rate, backend = tts_manager._cache_params()
+    print(f"백엔드: {backend}, 목소리: {voice}, 속도: {rate}")
+
+    failed = 0
+    for name, text in TTS_PROMPTS.items():
+        key = cache_key(text, voice, rate, backend)
+        if not args.force and tts_manager.cache.get(key):
+            print(f"✅ {name}: 이미 캐시됨")
+            continue
+
+        start = time.time()
+        if args.force:
+            # 캐시를 거치지 않고 합성한 뒤 덮어쓰기
+            clip = tts_manager._fetch(text)
+            if clip is not None:
+                tts_manager.cache.put(key, clip)
+        else:
+            clip = tts_manager.synthesize(text)
+        if clip is None:
+            print(f"❌ {name}: 합성 실패")
+            failed += 1
+            continue
+        print(f"✅ {name}: {time.time() - start:.1f}초")
+
+    print(f"캐시 크기: {tts_manager.cache.total_bytes / 1024:.0f}KB ({len(tts_manager.cache.entries)}개)")
+    if failed:
+        print(f"⚠️ 합성 실패 {failed}개")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+"""
+users.face_encoding의 pickle BLOB을 버전 헤더 바이너리 포맷으로 변환
+
+사용법:
+    python db_migrate_encodings.py [DB 경로] [--float64]
+"""
+
+import sys
+import numpy as np
+from app.config import DB_PATH
+from app.core.face_encoding import migrate_encodings
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    db_path = args[0] if args else DB_PATH
+    dtype = np.float64 if "--float64" in sys.argv else np.float32
+
+    migrated, failed = migrate_encodings(db_path, dtype)
+    print(f"인코딩 변환 완료: {migrated}건 변환, {failed}건 실패 ({db_path})")
@@ -1,13 +1,11 @@
-import whisper
 import sounddevice as sd
 import numpy as np
-import tempfile
-import scipy.io.wavfile
-import os
+from app.core.stt_backends import get_stt_backend
 
-print("Whisper 모델 로딩 중...", flush=True)
-model = whisper.load_model("small")
-print("Whisper 모델 로드 완료", flush=True)
+print("STT 모델 로딩 중...", flush=True)
+# 백엔드와 모델 크기는 app/config.py의 STT_BACKEND / STT_MODEL_SIZE를 따름
+backend = get_stt_backend()
+print("STT 모델 로드 완료", flush=True)
 
 def record_and_transcribe(duration=4):
     print("STT 함수 진입", flush=True)
@@ -18,12 +16,8 @@ def record_and_transcribe(duration=4):
     sd.wait()
     print("녹음 완료", flush=True)
 
-    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
-        scipy.io.wavfile.write(f.name, sr, recording)
-        print("Whisper 추론 중...", flush=True)
-        result = model.transcribe(f.name, language='ko')
-        # print("Whisper 결과:", result["text"], flush=True)
-        print("Whisper 결과:", result["text"])
-        f.close()
-        os.remove(f.name)
-        return result["text"]
\ No newline at end of file
+    print("STT 추론 중...", flush=True)
+    audio = recording.flatten().astype(np.float32) / 32768.0
+    text = backend.transcribe(audio)
+    print("STT 결과:", text)
+    return text
@@ -0,0 +1,244 @@
+"""
+API 스텁 서버 - 실제 서버 없이 키오스크 통신을 테스트하기 위한 로컬 서버
+
+사용법:
+    python stub_server.py --port 8080
+    python stub_server.py --delay 0.5 --fail-rate 0.3   (지연/503 응답으로 타임아웃과 재시도 확인)
+    python stub_server.py --token-delay 0.1             (스트리밍 응답 토큰 간격)
+
+    KIOSK_API_BASE=http://127.0.0.1:8080 python run.py
+
+HTTP/1.1 keep-alive를 지원하며, 새 TCP 연결이 맺어질 때마다 로그를 남기므로
+클라이언트가 연결을 재사용하는지 확인할 수 있음
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import random
+import threading
+import time
+import wave
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+MENUS = [
+    {"menu_id": 1, "menu_name": "아메리카노", "category": "커피", "price": 1500},
+    {"menu_id": 2, "menu_name": "카페라떼", "category": "커피", "price": 2900},
+    {"menu_id": 3, "menu_name": "딸기스무디", "category": "스무디", "price": 3800},
+]
+
+
+# /chatbot/chat-stream 에서 토큰 단위로 흘려보낼 고정 응답
+CANNED_REPLIES = [
+    "네, 아메리카노 한 잔 담아드렸어요. 따뜻한 걸로 드릴까요? 다른 메뉴도 필요하시면 말씀해 주세요.",
+    "딸기스무디는 오늘 인기 메뉴예요! 사이즈는 기본으로 준비해 드릴게요. 더 필요하신 건 없으신가요?",
+    "주문이 확인되었습니다. 결제 수단을 선택해 주세요.",
+]
+
+
+def split_tokens(text):
+    """LLM 토큰 흉내 - 어절 단위로 나누고 앞 공백을 붙여 둠"""
+    words = text.split(" ")
+    return [words[0]] + [" " + word for word in words[1:]]
+
+
+def silent_wav(seconds=0.5, sample_rate=24000):
+    """TTS 응답용 무음 WAV"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        wf.writeframes(b"\x00\x00" * int(seconds * sample_rate))
+    return buffer.getvalue()
+
+
+class StubState:
+    def __init__(self, delay, fail_rate, token_delay=0.05):
+        self.delay = delay
+        self.fail_rate = fail_rate
+        self.token_delay = token_delay
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.requests = 0
+        self.users = {}
+        self.sessions = {}
+        self.orders = []
+        self.idempotent = {}  # Idempotency-Key -> (status, body)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    state = None
+
+    def setup(self):
+        super().setup()
+        with self.state.lock:
+            self.state.connections += 1
+            print(f"🔌 새 연결 #{self.state.connections} {self.client_address}")
+
+    def log_message(self, format, *args):
+        with self.state.lock:
+            self.state.requests += 1
+            count = self.state.requests
+        print(f"[{count}] {self.command} {self.path} -> {args[1] if len(args) > 1 else ''}")
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length", 0))
+        if not length:
+            return {}
+        return json.loads(self.rfile.read(length).decode("utf-8"))
+
+    def _send(self, status, body, content_type="application/json", extra_headers=None):
+        if not isinstance(body, bytes):
+            body = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (extra_headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_stream(self, tokens, sse):
+        """chunked 전송으로 토큰을 하나씩 흘려보냄 (SSE 또는 JSON lines)"""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream; charset=utf-8" if sse else "application/x-ndjson")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def write_chunk(data):
+            self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+            self.wfile.flush()
+
+        for token in tokens:
+            time.sleep(self.state.token_delay)
+            item = json.dumps({"token": token}, ensure_ascii=False)
+            write_chunk((f"data: {item}\n\n" if sse else f"{item}\n").encode("utf-8"))
+        write_chunk(b"data: [DONE]\n\n" if sse else b'{"done": true}\n')
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _remember(self, key, status, body):
+        """Idempotency-Key가 있으면 응답을 기억해 두고 전송"""
+        if key:
+            self.state.idempotent[key] = (status, body)
+        self._send(status, body)
+
+    def _simulate(self):
+        """지연 및 일시적 장애(503) 흉내 - 장애를 냈으면 True"""
+        if self.state.delay:
+            time.sleep(self.state.delay)
+        if random.random() < self.state.fail_rate:
+            self._read_json()
+            self._send(503, {"detail": "stub: temporarily unavailable"})
+            return True
+        return False
+
+    def do_GET(self):
+        if self._simulate():
+            return
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        if url.path == "/chatbot/initialize-session":
+            session_id = query.get("session_id", [""])[0]
+            self.state.sessions[session_id] = []
+            self._send(200, {"reply": "세션이 초기화되었습니다."})
+        elif url.path.rstrip("/") == "/menu":
+            # 메뉴가 그대로면 304 (클라이언트 ETag 캐시 확인용)
+            body = json.dumps(MENUS, ensure_ascii=False).encode("utf-8")
+            etag = f'"{hashlib.sha1(body).hexdigest()[:16]}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+            else:
+                self._send(200, body, extra_headers={"ETag": etag})
+        else:
+            self._send(404, {"detail": "not found"})
+
+    def do_POST(self):
+        if self._simulate():
+            return
+        url = urlparse(self.path)
+        data = self._read_json()
+        key = self.headers.get("Idempotency-Key")
+        if key and key in self.state.idempotent:
+            # 재전송된 요청 - 처음 응답을 그대로 돌려줌
+            print(f"♻️ 중복 요청 무시: {key}")
+            self._send(*self.state.idempotent[key])
+            return
+        if url.path.rstrip("/") == "/users":
+            with self.state.lock:
+                user_id = len(self.state.users) + 1
+                self.state.users[user_id] = data
+            self._remember(key, 200, {"status": "success", "user_id": user_id})
+        elif url.path.startswith("/users/"):
+            user_id = int(url.path.rsplit("/", 1)[1])
+            self.state.users[user_id] = data
+            self._send(200, {"status": "success", "user_id": user_id})
+        elif url.path == "/chatbot/chat":
+            history = self.state.sessions.setdefault(data.get("session_id", ""), [])
+            history.append(data.get("user_input", ""))
+            reply = f"'{data.get('user_input', '')}' 주문 확인했습니다. 더 필요하신 건 없으신가요?"
+            self._send(200, {"response": reply})
+        elif url.path.rstrip("/") == "/orders":
+            with self.state.lock:
+                self.state.orders.append(data)
+                order_id = len(self.state.orders)
+            self._remember(key, 200, {"status": "success", "order_id": order_id})
+        elif url.path == "/chatbot/chat-stream":
+            history = self.state.sessions.setdefault(data.get("session_id", ""), [])
+            history.append(data.get("user_input", ""))
+            reply = CANNED_REPLIES[(len(history) - 1) % len(CANNED_REPLIES)]
+            sse = "text/event-stream" in self.headers.get("Accept", "")
+            self._send_stream(split_tokens(reply), sse)
+        elif url.path == "/chatbot/save-session":
+            self._send(200, {"reply": "세션이 저장되었습니다."})
+        elif url.path == "/tts":
+            self._send(200, silent_wav(), content_type="audio/wav")
+        else:
+            self._send(404, {"detail": "not found"})
+
+    def do_DELETE(self):
+        if self._simulate():
+            return
+        url = urlparse(self.path)
+        if url.path == "/chatbot/clear-session":
+            session_id = parse_qs(url.query).get("session_id", [""])[0]
+            self.state.sessions.pop(session_id, None)
+            self._send(200, {"reply": "세션이 삭제되었습니다."})
+        else:
+            self._send(404, {"detail": "not found"})
+
+
+def make_server(host="127.0.0.1", port=8080, delay=0.0, fail_rate=0.0, token_delay=0.05):
+    """스텁 서버 생성 (port=0이면 빈 포트 자동 선택)"""
+    handler = type("Handler", (StubHandler,), {"state": StubState(delay, fail_rate, token_delay)})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="키오스크 API 스텁 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--delay", type=float, default=0.0, help="응답 지연 (초)")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="503 응답 비율 (0~1)")
+    parser.add_argument("--token-delay", type=float, default=0.05, help="스트리밍 응답 토큰 간격 (초)")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.delay, args.fail_rate, args.token_delay)
+    print(f"🚀 스텁 서버 시작: http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+얼굴 인코딩 포맷 테스트
+
+사용법:
+    python -m pytest test_face_encoding.py
+    python test_face_encoding.py
+"""
+
+import pickle
+import numpy as np
+from app.core.face_encoding import (
+    encode_face, decode_face, is_encoded_face, is_legacy_pickle, load_legacy_pickle,
+)
+
+
+def _sample(dtype=np.float64, seed=0):
+    return np.random.default_rng(seed).normal(0.0, 0.1, 128).astype(dtype)
+
+
+def test_encode_decode_roundtrip():
+    for dtype in (np.float32, np.float64):
+        encoding = _sample(dtype)
+        blob = encode_face(encoding, dtype)
+        assert is_encoded_face(blob)
+        assert np.array_equal(decode_face(blob), encoding)
+
+
+def test_legacy_pickle_protocols():
+    """protocol 2~5로 저장된 예전 pickle BLOB을 모두 복원"""
+    for dtype in (np.float32, np.float64):
+        encoding = _sample(dtype)
+        for protocol in range(2, 6):
+            blob = pickle.dumps(encoding, protocol=protocol)
+            assert is_legacy_pickle(blob), f"protocol {protocol}"
+            restored = load_legacy_pickle(blob)
+            assert restored.dtype == encoding.dtype
+            assert np.array_equal(restored, encoding), f"protocol {protocol}"
+
+
+def test_raw_bytes_not_pickle():
+    """첫 바이트가 0x80인 헤더 없는 raw 인코딩을 pickle로 오인하지 않음"""
+    checked = 0
+    for seed in range(2000):
+        for dtype in (np.float32, np.float64):
+            encoding = _sample(dtype, seed)
+            blob = encoding.tobytes()
+            if blob[:1] != b"\x80":
+                continue
+            checked += 1
+            assert not is_legacy_pickle(blob)
+            assert np.array_equal(decode_face(blob), encoding)
+    assert checked > 0
+
+
+def test_non_encoding_pickle_rejected():
+    """허용되지 않은 클래스나 얼굴 인코딩이 아닌 pickle은 pickle 포맷으로 보지 않음"""
+    class Payload:
+        def __reduce__(self):
+            return (print, ("실행되면 안 됨",))
+
+    for obj in (Payload(), {"encoding": [0.0] * 128}, np.zeros(64)):
+        blob = pickle.dumps(obj, protocol=4)
+        assert not is_legacy_pickle(blob)
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"✅ {name}")